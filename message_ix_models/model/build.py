@@ -118,15 +118,14 @@ def apply_spec(  # noqa: C901
             log.error(f"  {len(missing)} elements not found: {missing!r}")
             raise ValueError
 
-        # Remove elements and associated parameter values
-        for element in spec["remove"].set[set_name]:
-            strip_par_data(
-                scenario,
-                set_name,
-                element,
-                dry_run=dry_run,
-                dump=None if fast else dump,
-            )
+        # Remove elements and associated parameter values, all at once
+        strip_par_data(
+            scenario,
+            set_name,
+            spec["remove"].set[set_name],
+            dry_run=dry_run,
+            dump=None if fast else dump,
+        )
 
         # Add elements
         add = [] if dry_run else spec["add"].set[set_name]
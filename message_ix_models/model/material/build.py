@@ -1,5 +1,8 @@
 import logging
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from copy import deepcopy
+from functools import partial
+from time import perf_counter
 from typing import Any, Optional
 
 import message_ix
@@ -27,7 +30,11 @@ from message_ix_models.model.material.data_util import (
     modify_demand_and_hist_activity,
     modify_industry_demand,
 )
-from message_ix_models.model.material.util import path_fallback, read_config
+from message_ix_models.model.material.util import (
+    path_fallback,
+    read_config,
+    read_excel,
+)
 from message_ix_models.model.structure import generate_set_elements, get_region_codes
 from message_ix_models.util import (
     add_par_data,
@@ -72,27 +79,225 @@ SPEC_LIST = (
 )
 
 
+def _as_list(value) -> list:
+    """Return `value` as a list, for filters like those of :meth:`.Scenario.par`."""
+    return list(value) if isinstance(value, (list, tuple, set, pd.Index)) else [value]
+
+
+class NotInSnapshot(Exception):
+    """Data or a method that is not available from a :class:`ScenarioSnapshot`."""
+
+
+class ScenarioSnapshot:
+    """Read-only copy of the structure and some data of a :class:`.Scenario`.
+
+    Unlike :class:`.Scenario`, instances can be pickled and used in other processes.
+    They support the methods used by :class:`.ScenarioInfo` and by
+    :data:`DATA_FUNCTIONS` to read `scenario`: :meth:`set`, :meth:`par`, etc. Only
+    the parameters and filters in :attr:`PAR` are copied. Attempts to read other data,
+    or to call other methods, raise :class:`NotInSnapshot`.
+    """
+
+    #: Parameters to copy, with filters. These **must not** include parameters to
+    #: which any of :data:`DATA_FUNCTIONS` add data, since the snapshot is taken before
+    #: any data are added. For instance, :func:`.gen_data_power_sector` reads
+    #: "inv_cost" as added by earlier functions, so this is not included.
+    PAR: dict[str, Optional[dict[str, list[str]]]] = {
+        "bound_activity_up": {"technology": ["GDP", "GDP_PPP", "Population"]},
+        "duration_period": None,
+        "land_output": {"commodity": ["Fertilizer Use|Nitrogen"]},
+        "MERtoPPP": None,
+    }
+
+    def __init__(self, scenario: message_ix.Scenario):
+        # Convert values that may be Java objects with JDBCBackend
+        self.model = str(scenario.model)
+        self.scenario = str(scenario.scenario)
+        self.version = None if scenario.version is None else int(scenario.version)
+        self.firstmodelyear = int(scenario.firstmodelyear)
+
+        self._set = {name: scenario.set(name) for name in scenario.set_list()}
+        self._par_list = scenario.par_list()
+        self._par = {
+            name: (filters or {}, scenario.par(name, filters=filters))
+            for name, filters in self.PAR.items()
+            if name in self._par_list
+        }
+        self._cat = {("year", "firstmodelyear"): scenario.cat("year", "firstmodelyear")}
+        self._yv_ya = scenario.vintage_and_active_years()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)  # Used by pickle, copy, etc.
+        raise NotInSnapshot(f"Scenario.{name}")
+
+    def cat(self, name: str, cat: str):
+        try:
+            return self._cat[(name, cat)].copy()
+        except KeyError:
+            raise NotInSnapshot(f"Scenario.cat({name!r}, {cat!r})") from None
+
+    def has_par(self, name: str) -> bool:
+        return name in self._par_list
+
+    def has_set(self, name: str) -> bool:
+        return name in self._set
+
+    def par(self, name: str, filters: Optional[Mapping] = None, **kwargs):
+        """Return data for parameter `name`, optionally with `filters`.
+
+        `filters` must select a subset of the data stored for `name`.
+        """
+        filters = dict(filters or {}, **kwargs)
+        try:
+            stored, data = self._par[name]
+        except KeyError:
+            raise NotInSnapshot(f"Scenario.par({name!r})") from None
+
+        for dim, values in stored.items():
+            if not set(_as_list(filters.get(dim, values))) <= set(values):
+                raise NotInSnapshot(f"Scenario.par({name!r}, filters={filters!r})")
+
+        for dim, values in filters.items():
+            data = data[data[dim].isin(_as_list(values))]
+
+        return data.copy()
+
+    def par_list(self) -> list[str]:
+        return list(self._par_list)
+
+    def set(self, name: str, filters: Optional[Mapping] = None, **kwargs):
+        data = self._set[name]
+        for dim, values in dict(filters or {}, **kwargs).items():
+            data = data[data[dim].isin(_as_list(values))]
+        return data.copy()
+
+    def set_list(self) -> list[str]:
+        return list(self._set)
+
+    def vintage_and_active_years(self, *args, **kwargs) -> pd.DataFrame:
+        if args or kwargs:
+            raise NotInSnapshot("Scenario.vintage_and_active_years() with arguments")
+        return self._yv_ya.copy()
+
+
 # Try to handle multiple data input functions from different materials
-def add_data(scenario: message_ix.Scenario, dry_run: bool = False) -> None:
-    """Populate `scenario` with MESSAGEix-Materials data."""
-    # Information about `scenario`
-    for func in DATA_FUNCTIONS:
-        # Generate or load the data; add to the Scenario
-        log.info(f"from {func.__name__}()")
-        data = func(scenario)
-        data = {k: v for k, v in data.items() if not v.empty}
+def add_data(
+    scenario: message_ix.Scenario,
+    dry_run: bool = False,
+    *,
+    max_workers: Optional[int] = None,
+) -> None:
+    """Populate `scenario` with MESSAGEix-Materials data.
+
+    Each function in :data:`DATA_FUNCTIONS` is called to generate data, which is added
+    to `scenario` using :func:`.add_par_data`. The time taken by each function is
+    logged.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        If given, the functions are called concurrently in up to this many processes,
+        with a :class:`ScenarioSnapshot` of `scenario` as their argument. The data are
+        added to `scenario` in the main process, in the order of
+        :data:`DATA_FUNCTIONS`. A function that raises :class:`NotInSnapshot` is called
+        again in the main process, with `scenario` itself.
+    """
+    times: dict[str, float] = {}
+
+    if max_workers:
+        results: Iterable = _generate_parallel(scenario, max_workers, times)
+    else:
+        results = (_generate(func, scenario, times) for func in DATA_FUNCTIONS)
+
+    for data in results:
         add_par_data(scenario, data, dry_run=dry_run)
+
+    log.info(
+        "Time per function:\n"
+        + "\n".join(
+            f"  {t:6.1f} s  {name}()"
+            for name, t in sorted(times.items(), key=lambda x: -x[1])
+        )
+    )
     log.info("done")
 
 
+def _generate(
+    func: Callable, scenario: Any, times: Optional[dict[str, float]] = None
+) -> dict[str, pd.DataFrame]:
+    """Call `func` with `scenario`; return non-empty data and store the time taken."""
+    log.info(f"from {func.__name__}()")
+    start = perf_counter()
+    data = {k: v for k, v in func(scenario).items() if not v.empty}
+    if times is not None:
+        times[func.__name__] = perf_counter() - start
+        log.info(f"{func.__name__}() took {times[func.__name__]:.1f} s")
+    return data
+
+
+def _generate_parallel(
+    scenario: message_ix.Scenario, max_workers: int, times: dict[str, float]
+) -> Iterator[dict[str, pd.DataFrame]]:
+    """Call :data:`DATA_FUNCTIONS` in a process pool; yield data in order."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from message_ix_models.workflow import _context_values
+
+    # Values of the current Context that can be passed to the worker processes
+    values = _context_values(Context.get_instance(-1))
+
+    with ProcessPoolExecutor(
+        min(max_workers, len(DATA_FUNCTIONS)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(ScenarioSnapshot(scenario), values),
+    ) as executor:
+        futures = [executor.submit(_generate_worker, f) for f in DATA_FUNCTIONS]
+
+        for func, future in zip(DATA_FUNCTIONS, futures):
+            try:
+                data, times[func.__name__] = future.result()
+            except NotInSnapshot as e:
+                log.info(f"{func.__name__}() requires {e}; call in main process")
+                data = _generate(func, scenario, times)
+            else:
+                log.info(f"{func.__name__}() took {times[func.__name__]:.1f} s")
+            yield data
+
+
+#: :class:`ScenarioSnapshot` used by :func:`_generate_worker`.
+_SNAPSHOT: Optional[ScenarioSnapshot] = None
+
+
+def _init_worker(snapshot: ScenarioSnapshot, context_values: dict) -> None:
+    """Initialize a worker process for :func:`_generate_parallel`."""
+    global _SNAPSHOT
+    _SNAPSHOT = snapshot
+    # NB Context(values) would replace the "core", "model", etc. values with defaults
+    Context(**deepcopy(context_values))
+
+
+def _generate_worker(func: Callable) -> tuple[dict[str, pd.DataFrame], float]:
+    """Call `func` with :data:`_SNAPSHOT` in a worker process."""
+    start = perf_counter()
+    data = _generate(func, _SNAPSHOT)
+    return data, perf_counter() - start
+
+
 def build(
     context: Context,
     scenario: message_ix.Scenario,
     old_calib: bool,
     modify_existing_constraints: bool = True,
     iea_data_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
 ) -> message_ix.Scenario:
-    """Set up materials accounting on `scenario`."""
+    """Set up materials accounting on `scenario`.
+
+    `max_workers` is passed to :func:`add_data`.
+    """
     node_suffix = context.model.regions
 
     if node_suffix != "R12":
@@ -108,9 +313,11 @@ def build(
 
     # Get the specification and apply to the base scenario
     spec = make_spec(node_suffix)
-    apply_spec(scenario, spec, add_data, fast=True)  # dry_run=True
+    apply_spec(
+        scenario, spec, partial(add_data, max_workers=max_workers), fast=True
+    )  # dry_run=True
 
-    water_dict = pd.read_excel(
+    water_dict = read_excel(
         package_data_path("material", "other", "water_tec_pars.xlsx"),
         sheet_name=None,
     )
@@ -18,6 +18,7 @@ from message_ix_models.model.material.data_util import (
 from message_ix_models.model.material.util import (
     excel_to_csv,
     get_all_input_data_dirs,
+    read_excel,
     update_macro_calib_file,
 )
 from message_ix_models.util import (
@@ -60,10 +61,24 @@ def cli(ssp):
     "--update_costs",
     default=False,
 )
+@click.option(
+    "--max-workers",
+    type=int,
+    default=None,
+    help="Generate data in up to N processes",
+)
 @common_params("nodes")
 @click.pass_obj
 def build_scen(
-    context, datafile, iea_data_path, tag, mode, scenario_name, old_calib, update_costs
+    context,
+    datafile,
+    iea_data_path,
+    tag,
+    mode,
+    scenario_name,
+    old_calib,
+    update_costs,
+    max_workers,
 ):
     """Build a scenario.
 
@@ -114,7 +129,11 @@ def build_scen(
                 keep_solution=False,
             )
             scenario = build(
-                context, scenario, old_calib=old_calib, iea_data_path=iea_data_path
+                context,
+                scenario,
+                old_calib=old_calib,
+                iea_data_path=iea_data_path,
+                max_workers=max_workers,
             )
         else:
             scenario = build(
@@ -125,6 +144,7 @@ def build_scen(
                 ),
                 old_calib=old_calib,
                 iea_data_path=iea_data_path,
+                max_workers=max_workers,
             )
         # Set the latest version as default
         scenario.set_as_default()
@@ -476,6 +496,33 @@ def make_xls_input_vc_able(context, files):
     return
 
 
+@cli.command("cache-excel")
+@click.pass_obj
+def cache_excel(context):
+    """Fill the cache of MESSAGEix-Materials Excel input data.
+
+    Every sheet of every .xlsx file under data/material is read once and stored in
+    columnar format; see read_excel(). Reads with non-default arguments are cached on
+    first use.
+    """
+    paths = sorted(
+        p
+        for p in package_data_path("material").rglob("*.xlsx")
+        if not p.name.startswith("~$")
+    )
+    failed = []
+    for path in paths:
+        try:
+            sheets = read_excel(path, sheet_name=None)
+        except Exception as e:  # Including Git LFS pointers, not Excel files
+            log.warning(f"Could not read {path}: {e!r}")
+            failed.append(path)
+        else:
+            log.info(f"{path.name}: {len(sheets)} sheet(s)")
+
+    log.info(f"Cached {len(paths) - len(failed)} of {len(paths)} file(s)")
+
+
 @cli.command("test-calib", hidden=True)
 @click.pass_obj
 def test_calib(context):
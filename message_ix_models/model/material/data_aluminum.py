@@ -15,7 +15,12 @@ from message_ix_models.util import (
 
 from .data_util import read_rel, read_timeseries
 from .material_demand import material_demand_calc
-from .util import combine_df_dictionaries, get_ssp_from_context, read_config
+from .util import (
+    combine_df_dictionaries,
+    get_ssp_from_context,
+    read_config,
+    read_excel,
+)
 
 
 def read_data_aluminum(
@@ -45,7 +50,7 @@ def read_data_aluminum(
     sheet_n = "data_R12" if "R12_CHN" in s_info.N else "data_R11"
 
     # Read the file
-    data_alu = pd.read_excel(
+    data_alu = read_excel(
         package_data_path("material", "aluminum", fname), sheet_name=sheet_n
     )
 
@@ -508,7 +513,7 @@ def gen_mock_demand_aluminum(scenario: message_ix.Scenario) -> pd.DataFrame:
         d = [3, 28, 6, 5, 2.5, 2, 13.6, 3, 4.8, 4.8, 6]
 
     # SSP2 R11 baseline GDP projection
-    gdp_growth = pd.read_excel(
+    gdp_growth = read_excel(
         package_data_path("material", "other", "iamc_db ENGAGE baseline GDP PPP.xlsx"),
         sheet_name=sheet_n,
     )
@@ -7,7 +7,11 @@ from message_ix import make_df
 
 from message_ix_models import ScenarioInfo
 from message_ix_models.model.material.material_demand import material_demand_calc
-from message_ix_models.model.material.util import maybe_remove_water_tec, read_config
+from message_ix_models.model.material.util import (
+    maybe_remove_water_tec,
+    read_config,
+    read_excel,
+)
 from message_ix_models.util import (
     broadcast,
     nodes_ex_world,
@@ -79,7 +83,7 @@ def gen_data(
     # s_info.yv_ya
     nodes = nodes_ex_world(s_info.N)
 
-    df = pd.read_excel(
+    df = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -153,7 +157,7 @@ def gen_data(
         "coal_NH3_ccs",
         "fueloil_NH3_ccs",
     ]
-    cost_conv = pd.read_excel(
+    cost_conv = read_excel(
         package_data_path("material", "ammonia", "cost_conv_nh3.xlsx"),
         sheet_name="Sheet1",
         index_col=0,
@@ -192,7 +196,7 @@ def gen_data_rel(scenario, dry_run=False, add_ccs: bool = True):
     if "R12_GLB" in nodes:
         nodes.pop(nodes.index("R12_GLB"))
 
-    df = pd.read_excel(
+    df = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -271,7 +275,7 @@ def gen_data_ts(
     if "R12_GLB" in nodes:
         nodes.pop(nodes.index("R12_GLB"))
 
-    df = pd.read_excel(
+    df = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -329,7 +333,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
     :file:`CD-Links SSP2 N-fertilizer demand.Global.xlsx`."""
     # Demand scenario [Mt N/year] from GLOBIOM
 
-    N_demand_GLO = pd.read_excel(
+    N_demand_GLO = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -339,7 +343,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
     )
 
     # NH3 feedstock share by region in 2010 (from http://ietd.iipnetwork.org/content/ammonia#benchmarks)
-    feedshare_GLO = pd.read_excel(
+    feedshare_GLO = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -350,7 +354,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
     )
 
     # Read parameters in xlsx
-    te_params = pd.read_excel(
+    te_params = read_excel(
         package_data_path("material", "ammonia", "nh3_fertilizer_demand.xlsx"),
         sheet_name="old_TE_sheet",
         engine="openpyxl",
@@ -394,7 +398,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
     # N_trade_R12 = pd.read_csv(
     #    package_data_path("material", "ammonia", "trade.FAO.R12.csv"), index_col=0
     # )
-    N_trade_R12 = pd.read_excel(
+    N_trade_R12 = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -425,7 +429,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
     #        "material", "ammonia", "NH3_trade_BACI_R12_aggregation.csv"
     #    )
     # )  # , index_col=0)
-    NH3_trade_R12 = pd.read_excel(
+    NH3_trade_R12 = read_excel(
         package_data_path(
             "material",
             "ammonia",
@@ -510,7 +514,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
 def gen_demand() -> dict[str, pd.DataFrame]:
     N_energy = read_demand()["N_feed"]  # updated feed with imports accounted
 
-    demand_fs_org = pd.read_excel(
+    demand_fs_org = read_excel(
         package_data_path("material", "ammonia", "nh3_fertilizer_demand.xlsx"),
         sheet_name="demand_i_feed_R12",
     )
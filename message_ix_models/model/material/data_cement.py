@@ -11,7 +11,11 @@ from message_ix_models.model.material.data_util import (
     read_timeseries,
 )
 from message_ix_models.model.material.material_demand import material_demand_calc
-from message_ix_models.model.material.util import get_ssp_from_context, read_config
+from message_ix_models.model.material.util import (
+    get_ssp_from_context,
+    read_config,
+    read_excel,
+)
 from message_ix_models.util import (
     broadcast,
     nodes_ex_world,
@@ -77,7 +81,7 @@ def gen_mock_demand_cement(scenario: message_ix.Scenario) -> pd.DataFrame:
         ]
 
     # SSP2 R11 baseline GDP projection
-    gdp_growth = pd.read_excel(
+    gdp_growth = read_excel(
         package_data_path("material", "other", "iamc_db ENGAGE baseline GDP PPP.xlsx"),
         sheet_name=sheet_n,
     )
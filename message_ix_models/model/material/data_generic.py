@@ -12,14 +12,14 @@ from message_ix_models.util import (
 )
 
 from .data_util import read_timeseries
-from .util import read_config
+from .util import read_config, read_excel
 
 
 def read_data_generic(scenario: Scenario) -> (pd.DataFrame, pd.DataFrame):
     """Read and clean data from :file:`generic_furnace_boiler_techno_economic.xlsx`."""
 
     # Read the file
-    data_generic = pd.read_excel(
+    data_generic = read_excel(
         message_ix_models.util.package_data_path(
             "material", "other", "generic_furnace_boiler_techno_economic.xlsx"
         ),
@@ -7,7 +7,7 @@ from message_ix import make_df
 
 import message_ix_models.util
 from message_ix_models.model.material.material_demand import material_demand_calc
-from message_ix_models.model.material.util import read_config
+from message_ix_models.model.material.util import read_config, read_excel
 from message_ix_models.util import broadcast, same_node
 
 if TYPE_CHECKING:
@@ -39,7 +39,7 @@ def gen_data_methanol(scenario: "Scenario") -> dict[str, pd.DataFrame]:
     scenario: .Scenario
     """
     context = read_config()
-    df_pars = pd.read_excel(
+    df_pars = read_excel(
         message_ix_models.util.package_data_path(
             "material", "methanol", "methanol_sensitivity_pars.xlsx"
         ),
@@ -48,7 +48,7 @@ def gen_data_methanol(scenario: "Scenario") -> dict[str, pd.DataFrame]:
     )
     pars = df_pars.set_index("par").to_dict()["value"]
     if pars["mtbe_scenario"] == "phase-out":
-        pars_dict = pd.read_excel(
+        pars_dict = read_excel(
             message_ix_models.util.package_data_path(
                 "material", "methanol", "methanol_techno_economic.xlsx"
             ),
@@ -56,7 +56,7 @@ def gen_data_methanol(scenario: "Scenario") -> dict[str, pd.DataFrame]:
             dtype=object,
         )
     else:
-        pars_dict = pd.read_excel(
+        pars_dict = read_excel(
             message_ix_models.util.package_data_path(
                 "material", "methanol", "methanol_techno_economic_high_demand.xlsx"
             ),
@@ -8,7 +8,11 @@ from message_ix import make_df
 from message_ix_models import ScenarioInfo
 from message_ix_models.model.material.data_util import read_timeseries
 from message_ix_models.model.material.material_demand import material_demand_calc
-from message_ix_models.model.material.util import get_ssp_from_context, read_config
+from message_ix_models.model.material.util import (
+    get_ssp_from_context,
+    read_config,
+    read_excel,
+)
 from message_ix_models.util import (
     broadcast,
     nodes_ex_world,
@@ -46,7 +50,7 @@ def read_data_petrochemicals(scenario: message_ix.Scenario) -> pd.DataFrame:
         sheet_n = "data_R11"
 
     # Read the file
-    data_petro = pd.read_excel(
+    data_petro = read_excel(
         package_data_path("material", "petrochemicals", fname), sheet_name=sheet_n
     )
     # Clean the data
@@ -3,6 +3,7 @@ from collections import defaultdict
 import message_ix
 import pandas as pd
 
+from message_ix_models.model.material.util import read_excel
 from message_ix_models.util import package_data_path
 
 
@@ -15,7 +16,7 @@ def read_material_intensities(
 
     # read LCA data from ADVANCE LCA tool
     data_path_lca = data_path + "/NTNU_LCA_coefficients.xlsx"
-    data_lca = pd.read_excel(data_path_lca, sheet_name="environmentalImpacts")
+    data_lca = read_excel(data_path_lca, sheet_name="environmentalImpacts")
 
     # For hydropower material intensity use "medium" from Kalt et al., 2021.
     # Unit: t/MW
@@ -82,13 +83,13 @@ def read_material_intensities(
 
     # read technology, region and commodity mappings
     data_path_tec_map = data_path + "/MESSAGE_global_model_technologies.xlsx"
-    technology_mapping = pd.read_excel(data_path_tec_map, sheet_name="technology")
+    technology_mapping = read_excel(data_path_tec_map, sheet_name="technology")
 
     data_path_reg_map = data_path + "/LCA_region_mapping.xlsx"
-    region_mapping = pd.read_excel(data_path_reg_map, sheet_name="region")
+    region_mapping = read_excel(data_path_reg_map, sheet_name="region")
 
     data_path_com_map = data_path + "/LCA_commodity_mapping.xlsx"
-    commodity_mapping = pd.read_excel(data_path_com_map, sheet_name="commodity")
+    commodity_mapping = read_excel(data_path_com_map, sheet_name="commodity")
 
     ####################################################################
     # process data
@@ -18,6 +18,7 @@ from message_ix_models.model.material.util import (
     get_ssp_from_context,
     maybe_remove_water_tec,
     read_config,
+    read_excel,
     remove_from_list_if_exists,
 )
 from message_ix_models.util import (
@@ -85,7 +86,7 @@ def gen_mock_demand_steel(scenario: message_ix.Scenario) -> pd.DataFrame:
         # MEA change from 39 to 9 to make it feasible (coal supply bound)
 
     # SSP2 R11 baseline GDP projection
-    gdp_growth = pd.read_excel(
+    gdp_growth = read_excel(
         package_data_path("material", "other", "iamc_db ENGAGE baseline GDP PPP.xlsx"),
         sheet_name=sheet_n,
     )
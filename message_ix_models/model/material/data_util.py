@@ -12,6 +12,7 @@ from message_ix import make_df
 
 from message_ix_models import ScenarioInfo
 from message_ix_models.model.material.util import (
+    read_excel,
     remove_from_list_if_exists,
 )
 from message_ix_models.model.structure import get_region_codes
@@ -48,7 +49,7 @@ def load_GDP_COVID() -> pd.DataFrame:
 
     f_name = "iamc_db ENGAGE baseline GDP PPP.xlsx"
 
-    gdp_ssp2 = pd.read_excel(
+    gdp_ssp2 = read_excel(
         package_data_path("material", "other", f_name), sheet_name="data_R12"
     )
     gdp_ssp2 = gdp_ssp2[gdp_ssp2["Scenario"] == "baseline"]
@@ -163,7 +164,7 @@ def modify_demand_and_hist_activity(scen: message_ix.Scenario) -> None:
         region_name_CPA = "CPA"
         region_name_CHN = ""
 
-    df = pd.read_excel(
+    df = read_excel(
         package_data_path("material", "other", fname), sheet_name=sheet_n, usecols="A:F"
     )
 
@@ -487,7 +488,7 @@ def modify_demand_and_hist_activity_debug(
         region_name_CHN = ""
 
     path = package_data_path("material", "other", fname)
-    df = pd.read_excel(path, sheet_name=sheet_n, usecols="A:F")
+    df = read_excel(path, sheet_name=sheet_n, usecols="A:F")
 
     # Filter the necessary variables
     df = df[
@@ -1243,7 +1244,7 @@ def add_emission_accounting(scen: message_ix.Scenario) -> None:
     )
     # Note: Emission for CO2 MtC/ACT.
     relation_activity = emission_factors.assign(
-        relation=lambda x: (x["emission"] + "_Emission")
+        relation=lambda x: x["emission"] + "_Emission"
     )
     relation_activity["node_rel"] = relation_activity["node_loc"]
     relation_activity.drop(["year_vtg", "emission"], axis=1, inplace=True)
@@ -1908,7 +1909,7 @@ def read_sector_data(
         sheet_n = sectname + "_R11"
 
     # data_df = data_steel_china.append(data_cement_china, ignore_index=True)
-    data_df = pd.read_excel(
+    data_df = read_excel(
         package_data_path("material", sectname, file),
         sheet_name=sheet_n,
     )
@@ -2041,7 +2042,7 @@ def read_timeseries(
         sheet_n = "timeseries_R11"
 
     # Read the file
-    df = pd.read_excel(
+    df = read_excel(
         package_data_path("material", material, filename), sheet_name=sheet_n
     )
 
@@ -2099,7 +2100,7 @@ def read_rel(
         sheet_n = "relations_R11"
 
     # Read the file
-    data_rel = pd.read_excel(
+    data_rel = read_excel(
         package_data_path("material", material, filename),
         sheet_name=sheet_n,
     )
@@ -1,6 +1,8 @@
 import logging
+from collections.abc import Callable, Iterable
+from hashlib import blake2b
 from pathlib import Path
-from typing import Literal, Union
+from typing import Any, Literal, TypedDict, Union
 
 import message_ix
 import numpy as np
@@ -12,6 +14,7 @@ from scipy.optimize import curve_fit
 import message_ix_models.util
 from message_ix_models import Context, ScenarioInfo
 from message_ix_models.model.material.data_util import get_ssp_soc_eco_data
+from message_ix_models.model.material.util import read_excel
 from message_ix_models.util import package_data_path
 
 file_gdp = "/iamc_db ENGAGE baseline GDP PPP.xlsx"
@@ -57,6 +60,10 @@ mode_modifiers_dict = {
 log = logging.getLogger(__name__)
 
 
+#: Regression parameters from :func:`fit_demand_params`.
+_PARAMS: dict[tuple[str, str, str], np.ndarray] = {}
+
+
 def steel_function(x: Union[pd.DataFrame, float], a: float, b: float, m: float):
     gdp_pcap, del_t = x
     return a * np.exp(b / gdp_pcap) * (1 - m) ** del_t
@@ -67,7 +74,21 @@ def cement_function(x: Union[pd.DataFrame, float], a: float, b: float):
     return a * np.exp(b / gdp_pcap)
 
 
-fitting_dict = {
+class FitInfo(TypedDict):
+    """Regression function and settings for one material in :data:`fitting_dict`."""
+
+    #: Function of (`x_data`, \*parameters) fitted to per-capita consumption.
+    function: Callable[..., Any]
+    #: Initial guess for the parameters.
+    initial_guess: list[float]
+    #: Names of columns of historical data used as the first argument of `function`.
+    x_data: list[str]
+    #: Parameters of :func:`gompertz` for convergence to the regression.
+    phi: float
+    mu: float
+
+
+fitting_dict: dict[str, FitInfo] = {
     "steel": {
         "function": steel_function,
         "initial_guess": [600, -10000, 0],
@@ -101,7 +122,7 @@ def gompertz(
 def read_timer_pop(
     datapath: Union[str, Path], material: Literal["cement", "steel", "aluminum"]
 ):
-    df_population = pd.read_excel(
+    df_population = read_excel(
         f"{datapath}/{material_data[material]['dir']}{material_data[material]['file']}",
         sheet_name="Timer_POP",
         skiprows=[0, 1, 2, 30],
@@ -120,7 +141,7 @@ def read_timer_gdp(
     datapath: Union[str, Path], material: Literal["cement", "steel", "aluminum"]
 ):
     # Read GDP per capita data
-    df_gdp = pd.read_excel(
+    df_gdp = read_excel(
         f"{datapath}/{material_data[material]['dir']}{material_data[material]['file']}",
         sheet_name="Timer_GDPCAP",
         skiprows=[0, 1, 2, 30],
@@ -136,35 +157,22 @@ def read_timer_gdp(
 
 
 def project_demand(df: pd.DataFrame, phi: float, mu: float):
-    df_demand = df.groupby("region", group_keys=False)[df.columns].apply(
-        lambda group: group.assign(
-            demand_pcap_base=group["demand.tot.base"].iloc[0]
-            * giga
-            / group["pop.mil"].iloc[0]
-            / mega
-        )
-    )
-    df_demand = df_demand.groupby("region", group_keys=False)[df_demand.columns].apply(
-        lambda group: group.assign(
-            gap_base=group["demand_pcap_base"].iloc[0] - group["demand_pcap0"].iloc[0]
-        )
-    )
-    df_demand = df_demand.groupby("region", group_keys=False)[df_demand.columns].apply(
-        lambda group: group.assign(
-            demand_pcap=group["demand_pcap0"]
-            + group["gap_base"] * gompertz(phi, mu, y=group["year"])
-        )
-    )
-    df_demand = (
-        df_demand.groupby("region", group_keys=False)[df_demand.columns]
-        .apply(
-            lambda group: group.assign(
-                demand_tot=group["demand_pcap"] * group["pop.mil"] * mega / giga
-            )
-        )
-        .reset_index(drop=True)
+    df_demand = df.dropna(subset=["region"])
+
+    # Base values: first row for each region, even if it contains NaN, aligned to rows
+    cols = ["demand.tot.base", "pop.mil", "demand_pcap0"]
+    first = df_demand.groupby("region").head(1).set_index("region")[cols]
+    first = first.loc[df_demand["region"]].set_axis(df_demand.index)
+
+    df_demand = df_demand.assign(
+        demand_pcap_base=first["demand.tot.base"] * giga / first["pop.mil"] / mega,
+        gap_base=lambda x: x["demand_pcap_base"] - first["demand_pcap0"],
+        demand_pcap=lambda x: (
+            x["demand_pcap0"] + x["gap_base"] * gompertz(phi, mu, y=x["year"])
+        ),
+        demand_tot=lambda x: x["demand_pcap"] * x["pop.mil"] * mega / giga,
     )
-    return df_demand[["region", "year", "demand_tot"]]
+    return df_demand[["region", "year", "demand_tot"]].reset_index(drop=True)
 
 
 def read_base_demand(filepath: Union[str, Path]):
@@ -196,7 +204,7 @@ def read_hist_mat_demand(material: Literal["cement", "steel", "aluminum"]):
 
     if material == "aluminum":
         df_raw_cons = (
-            pd.read_excel(
+            read_excel(
                 f"{datapath}/{material_data[material]['dir']}{material_data[material]['file']}",
                 sheet_name="final_table",
                 nrows=378,
@@ -214,7 +222,7 @@ def read_hist_mat_demand(material: Literal["cement", "steel", "aluminum"]):
             .query("cons_pcap > 0")
         )
     elif material == "steel":
-        df_raw_cons = pd.read_excel(
+        df_raw_cons = read_excel(
             f"{datapath}/{material_data[material]['dir']}{material_data[material]['file']}",
             sheet_name="Consumption regions",
             nrows=26,
@@ -247,7 +255,7 @@ def read_hist_mat_demand(material: Literal["cement", "steel", "aluminum"]):
             .query("cons_pcap > 0")
         )
     elif material == "cement":
-        df_raw_cons = pd.read_excel(
+        df_raw_cons = read_excel(
             f"{datapath}/{material_data[material]['dir']}{material_data[material]['file']}",
             sheet_name="Regions",
             skiprows=122,
@@ -314,6 +322,60 @@ def read_gdp_ppp_from_scen(scen: message_ix.Scenario) -> pd.DataFrame:
     return gdp
 
 
+def fit_demand_params(
+    materials: Iterable[Literal["cement", "steel", "aluminum"]],
+    mode: Literal["low", "normal", "high"] = "normal",
+) -> dict[str, np.ndarray]:
+    """Fit regression parameters for `materials` to historical data.
+
+    For each material, :func:`scipy.optimize.curve_fit` is applied to the data from
+    :func:`read_hist_mat_demand`, using the function and initial guess from
+    :data:`fitting_dict`. The parameters are then multiplied by the modifiers for
+    `mode` in :data:`mode_modifiers_dict`.
+
+    Results are stored in memory, keyed by the material, a hash of the historical
+    data, and `mode`. Later calls with the same arguments and data do not repeat the
+    fit.
+
+    Returns
+    -------
+    dict
+        Mapping from material name to an array of parameters.
+    """
+    result = {}
+    for material in materials:
+        df_cons = read_hist_mat_demand(material)
+        key = (
+            material,
+            blake2b(
+                pd.util.hash_pandas_object(df_cons, index=False).to_numpy().tobytes()
+            ).hexdigest(),
+            mode,
+        )
+
+        if key not in _PARAMS:
+            x_data = tuple(df_cons[col] for col in fitting_dict[material]["x_data"])
+            params_opt = curve_fit(
+                fitting_dict[material]["function"],
+                xdata=x_data,
+                ydata=df_cons["cons_pcap"],
+                p0=fitting_dict[material]["initial_guess"],
+            )[0]
+            log.info(f"adjust regression parameters according to mode: {mode}")
+            log.info(f"before adjustment: {params_opt}")
+            for idx, multiplier in enumerate(
+                mode_modifiers_dict[mode][material].values()
+            ):
+                params_opt[idx] *= multiplier
+            log.info(f"after adjustment: {params_opt}")
+            _PARAMS[key] = params_opt
+
+        # Return a copy so the stored parameters cannot be modified
+        result[material] = _PARAMS[key].copy()
+
+    return result
+
+
 def derive_demand(
     material: Literal["cement", "steel", "aluminum"],
     scen: message_ix.Scenario,
@@ -346,7 +408,7 @@ def derive_demand(
             "Scenario does not provide GDP projections. Reading default"
             "timeseries instead"
         )
-        df_gdp = pd.read_excel(f"{datapath}/other{file_gdp}", sheet_name="data_R12")
+        df_gdp = read_excel(f"{datapath}/other{file_gdp}", sheet_name="data_R12")
         df_gdp = (
             df_gdp[df_gdp["Scenario"] == "baseline"]
             .loc[:, ["Region", *[i for i in df_gdp.columns if isinstance(i, int)]]]
@@ -363,34 +425,17 @@ def derive_demand(
         f"{datapath}/{material_data[material]['dir']}/demand_{material}.yaml"
     )
 
-    # get historical data (material consumption, pop, gdp)
-    df_cons = read_hist_mat_demand(material)
-    x_data = tuple(pd.Series(df_cons[col]) for col in fitting_dict[material]["x_data"])
-
-    # run regression on historical data
-    params_opt = curve_fit(
-        fitting_dict[material]["function"],
-        xdata=x_data,
-        ydata=df_cons["cons_pcap"],
-        p0=fitting_dict[material]["initial_guess"],
-    )[0]
+    # run regression on historical data; adjust parameters according to mode
     mode = ssp_mode_map[ssp]
-    log.info(f"adjust regression parameters according to mode: {mode}")
-    log.info(f"before adjustment: {params_opt}")
-    for idx, multiplier in enumerate(mode_modifiers_dict[mode][material].values()):
-        params_opt[idx] *= multiplier
-    log.info(f"after adjustment: {params_opt}")
+    params_opt = fit_demand_params([material], mode)[material]
 
     # prepare df for applying regression model and project demand
     df_all = pd.merge(df_pop, df_base_demand.drop(columns=["year"]), how="left")
     df_all = pd.merge(df_all, df_gdp[["region", "year", "gdp_ppp"]], how="inner")
     df_all["del_t"] = df_all["year"] - 2010
     df_all["gdp_pcap"] = df_all["gdp_ppp"] * giga / df_all["pop.mil"] / mega
-    df_all["demand_pcap0"] = df_all.apply(
-        lambda row: fitting_dict[material]["function"](
-            tuple(row[i] for i in fitting_dict[material]["x_data"]), *params_opt
-        ),
-        axis=1,
+    df_all["demand_pcap0"] = fitting_dict[material]["function"](
+        tuple(df_all[col] for col in fitting_dict[material]["x_data"]), *params_opt
     )
     df_all = df_all.rename({"value": "demand.tot.base"}, axis=1)
 
@@ -469,7 +514,7 @@ def gen_demand_petro(
             .sort_index()
         )
     else:
-        df_gdp = pd.read_excel(
+        df_gdp = read_excel(
             f"{message_ix_models.util.package_data_path('material')}/other{file_gdp}",
             sheet_name="data_R12",
         )
@@ -1,16 +1,28 @@
+import json
+import logging
 import os
+import pickle
+from collections.abc import Callable
+from functools import partial
+from hashlib import blake2b
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 from typing import Any, Union
 
 import message_ix
 import openpyxl as pxl
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather
 import yaml
 from scipy.optimize import curve_fit
 
 from message_ix_models import Context
+from message_ix_models.util import cache as _cache
 from message_ix_models.util import load_package_data, package_data_path
 
+log = logging.getLogger(__name__)
+
 # Configuration files
 METADATA = [
     # ("material", "config"),
@@ -51,6 +63,157 @@ def read_config() -> Context:
     return context
 
 
+#: Digests of Excel files already hashed by :func:`read_excel`, keyed by path, size
+#: and modification time.
+_DIGEST: dict[tuple, str] = {}
+
+
+def read_excel(
+    io, sheet_name: Union[str, int, list, None] = 0, **kwargs
+) -> Union[pd.DataFrame, dict]:
+    """Read an Excel file, using a columnar cache of the parsed contents.
+
+    Like :func:`pandas.read_excel`, which is called on the first read of each
+    combination of file contents, `sheet_name` and `kwargs`. The result is stored
+    uncompressed in Arrow IPC (Feather) format in the ``material-excel`` subdirectory
+    of :attr:`.Config.cache_path`. Later reads memory-map this file instead of parsing
+    the workbook. The cache key includes a hash of the file contents, so modified
+    files are parsed again.
+
+    Data that cannot be represented in Arrow, for instance columns of mixed type, are
+    cached using :mod:`pickle`. The cache is bypassed entirely if :data:`.SKIP_CACHE`
+    is :any:`True`, if `io` is not a path, or if `kwargs` contain callables.
+
+    Use :program:`mix-models material-ix cache-excel` to fill the cache for all files
+    under :file:`data/material`.
+    """
+    if (
+        _cache.SKIP_CACHE
+        or not isinstance(io, (str, os.PathLike))
+        or any(map(callable, kwargs.values()))
+    ):
+        return pd.read_excel(io, sheet_name=sheet_name, **kwargs)
+
+    path = Path(io)
+    digest = _file_digest(path)
+
+    if sheet_name is None:
+        names = _sheet_names(path, digest)
+    elif isinstance(sheet_name, list):
+        names = sheet_name
+    else:
+        return _read_sheet(path, digest, sheet_name, kwargs)
+
+    return {name: _read_sheet(path, digest, name, kwargs) for name in names}
+
+
+def _file_digest(path: Path) -> str:
+    """Return a hash of the contents of the file at `path`."""
+    stat = path.stat()
+    key = (path.resolve(), stat.st_size, stat.st_mtime_ns)
+    if key not in _DIGEST:
+        h = blake2b(digest_size=10)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(2**20), b""):
+                h.update(block)
+        _DIGEST[key] = h.hexdigest()
+    return _DIGEST[key]
+
+
+def _cache_path(path: Path, digest: str, suffix: str) -> Path:
+    return Context.get_instance(-1).get_cache_path(
+        "material-excel", f"{path.stem}-{digest}-{suffix}"
+    )
+
+
+def _sheet_names(path: Path, digest: str) -> list[str]:
+    """Return the names of all sheets in the workbook at `path`."""
+    cache_path = _cache_path(path, digest, "sheets.json")
+    try:
+        return json.loads(cache_path.read_text())
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        _discard(cache_path, e)
+
+    with pd.ExcelFile(path) as xf:
+        result = list(map(str, xf.sheet_names))
+    _replace(cache_path, lambda tmp: tmp.write_text(json.dumps(result)))
+    return result
+
+
+def _read_sheet(path: Path, digest: str, sheet_name, kwargs: dict) -> pd.DataFrame:
+    """Read a single sheet of `path`, from the cache if possible."""
+    key = blake2b(
+        repr((sheet_name, sorted(kwargs.items()), pd.__version__)).encode(),
+        digest_size=10,
+    ).hexdigest()
+    base = _cache_path(path, digest, key)
+
+    try:
+        table = pyarrow.feather.read_table(base.with_suffix(".arrow"), memory_map=True)
+        df = table.to_pandas()
+        df.columns = pickle.loads(table.schema.metadata[b"columns"])
+        return df
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _discard(base.with_suffix(".arrow"), e)
+
+    try:
+        return pd.read_pickle(base.with_suffix(".pkl"))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _discard(base.with_suffix(".pkl"), e)
+
+    df = pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+    _write_sheet(df, base)
+    return df
+
+
+def _write_sheet(df: pd.DataFrame, base: Path) -> None:
+    """Write `df` to the cache at `base`, with a suffix indicating the format."""
+    try:
+        # Arrow requires unique, str column names; store the original labels
+        columns = list(map(str, range(df.shape[1])))
+        table = pa.Table.from_pandas(df.set_axis(columns, axis=1))
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        log.debug(f"Cache {base.name} with pickle: {e!r}")
+        _replace(base.with_suffix(".pkl"), df.to_pickle)
+    else:
+        table = table.replace_schema_metadata(
+            table.schema.metadata | {b"columns": pickle.dumps(df.columns)}
+        )
+        _replace(
+            base.with_suffix(".arrow"),
+            partial(pyarrow.feather.write_feather, table, compression="uncompressed"),
+        )
+
+
+def _replace(path: Path, write: Callable[[Path], Any]) -> None:
+    """Call `write` with a unique temporary path, then rename the result to `path`.
+
+    Concurrent readers never see a partial file, and concurrent writers—for instance
+    other processes caching the same workbook—do not interfere with each other.
+    """
+    with NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _discard(path: Path, exc: Exception) -> None:
+    """Delete a cache file at `path` that could not be read."""
+    log.warning(f"Discard unreadable cache file {path}: {exc!r}")
+    path.unlink(missing_ok=True)
+
+
 def prepare_xlsx_for_explorer(filepath: str) -> None:
     """
     Post-processing helper to make reporting files compliant for
@@ -154,7 +317,7 @@ def excel_to_csv(material_dir: str, fname: str) -> None:
     fname : str
         file name of xlsx file
     """
-    xlsx_dict = pd.read_excel(
+    xlsx_dict = read_excel(
         package_data_path("material", material_dir, fname), sheet_name=None
     )
     if not os.path.isdir(package_data_path("material", "version control")):
@@ -1,8 +1,11 @@
 """Prepare base models from snapshot data."""
 
 import logging
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from time import perf_counter
+from typing import Any, Optional
 
 import pandas as pd
 from message_ix import Scenario
@@ -77,28 +80,97 @@ def unpack(path: Path) -> Path:
     return base
 
 
-def read_excel(scenario: Scenario, path: Path) -> None:
-    """Similar to :meth:`.Scenario.read_excel`, but using :func:`unpack`."""
+def read_excel(
+    scenario: Scenario,
+    path: Path,
+    *,
+    max_workers: Optional[int] = None,
+    parquet: bool = False,
+) -> None:
+    """Similar to :meth:`.Scenario.read_excel`, but using :func:`unpack`.
+
+    Parameter data files are read and parsed by up to `max_workers` threads, using
+    :func:`pandas.read_csv` with the "pyarrow" engine and explicit dtypes. At most 2 ×
+    `max_workers` parameters are held in memory at once. Data are added to `scenario`
+    in order of parameter name, so the order of calls to the backend does not depend
+    on which files are parsed first. The time to read and to add each parameter is
+    logged.
+
+    Parameters
+    ----------
+    parquet : bool, optional
+        If :any:`True`, store the parsed data for each parameter in a Parquet file next
+        to the corresponding :file:`.csv.gz` file, and read from this on later calls.
+        Delete the Parquet files, or the whole directory, to force re-parsing.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from os import cpu_count
+
     base = unpack(path)
 
     scenario.read_excel(path=base.joinpath("sets.xlsx"))
 
     parameters = set(scenario.par_list())
 
-    with scenario.transact(f"Read snapshot data from {path}"):
-        for p in base.glob("*.csv.gz"):
-            name = p.name.split(".")[0]
-
-            if name not in parameters:
-                continue  # Variable or equation data: don't read
-
-            data = pd.read_csv(p)
-
-            # Correct units
-            if name == "inv_cost":
-                data.replace({"unit": {"USD_2005/t ": "USD_2005/t"}}, inplace=True)
-
-            scenario.add_par(name, data)
+    # Files with data for parameters, in a fixed order; and dtypes for each
+    paths = sorted(
+        p for p in base.glob("*.csv.gz") if p.name.split(".")[0] in parameters
+    )
+    dtypes = [_dtype(scenario, p.name.split(".")[0]) for p in paths]
+
+    max_workers = max_workers or min(8, cpu_count() or 1)
+
+    def add(future: "Future[tuple[str, pd.DataFrame, float]]") -> None:
+        name, data, t_read = future.result()
+        t0 = perf_counter()
+        scenario.add_par(name, data)
+        log.info(
+            f"{name}: {len(data)} rows; read {t_read:.2f} s, "
+            f"add_par {perf_counter() - t0:.2f} s"
+        )
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        with scenario.transact(f"Read snapshot data from {path}"):
+            futures: deque[Future] = deque()
+            for p, dtype in zip(paths, dtypes):
+                futures.append(executor.submit(_read_par, p, dtype, parquet))
+                # Limit the number of parameters in memory
+                if len(futures) >= 2 * max_workers:
+                    add(futures.popleft())
+
+            while futures:
+                add(futures.popleft())
+
+
+def _dtype(scenario: Scenario, name: str) -> dict[str, Any]:
+    """Return dtypes for :func:`pandas.read_csv` of data for parameter `name`."""
+    result: dict[str, Any] = {"value": float, "unit": str}
+    for idx_set, idx_name in zip(scenario.idx_sets(name), scenario.idx_names(name)):
+        result[idx_name] = int if idx_set == "year" else str
+    return result
+
+
+def _read_par(
+    path: Path, dtype: dict[str, Any], parquet: bool
+) -> tuple[str, pd.DataFrame, float]:
+    """Read data for one parameter from `path`, for :func:`read_excel`."""
+    t0 = perf_counter()
+    name = path.name.split(".")[0]
+    pq_path = path.with_name(f"{name}.parquet")
+
+    if parquet and pq_path.exists() and pq_path.stat().st_mtime > path.stat().st_mtime:
+        return name, pd.read_parquet(pq_path), perf_counter() - t0
+
+    data = pd.read_csv(path, engine="pyarrow", dtype=dtype)
+
+    # Correct units
+    if name == "inv_cost":
+        data = data.replace({"unit": {"USD_2005/t ": "USD_2005/t"}})
+
+    if parquet:
+        data.to_parquet(pq_path, index=False)
+
+    return name, data, perf_counter() - t0
 
 
 @minimum_version("message_ix 3.5")
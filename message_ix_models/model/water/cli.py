@@ -320,3 +320,76 @@ def report_cli(context: "Context", output_model, sdgs, water=False):
         from message_ix_models.model.water.report import report_full
 
         report_full(sc, reg, sdgs)
+
+
+@cli.command("hydro-agg")
+@click.argument("input_dir", type=click.Path(exists=True, file_okay=False))
+@click.argument("output_dir", type=click.Path(file_okay=False))
+@click.option("--area", required=True, help="Raster of grid cell areas.")
+@click.option(
+    "--basins", required=True, help="Raster of 1-based basin numbers on the same grid."
+)
+@click.option("--model", "models", multiple=True, help="Climate model(s).")
+@click.option("--scenario", "scenarios", multiple=True, help="Climate scenario(s).")
+@click.option(
+    "--variable",
+    "variables",
+    multiple=True,
+    default=["qtot", "qr"],
+    show_default=True,
+    help="Hydrological variable(s).",
+)
+@click.option(
+    "--data",
+    type=click.Choice(["future", "historical"]),
+    default="future",
+    show_default=True,
+)
+@click.option("--annual", is_flag=True, help="Aggregate to 5-year means.")
+@click.option("--time-chunk", default=120, show_default=True, help="Time steps/task.")
+@click.option("--workers", type=int, help="Number of dask workers.")
+@click.option("--memory-limit", default="4GiB", show_default=True, help="Per worker.")
+@click.pass_obj
+def hydro_agg_cli(
+    context: "Context",
+    input_dir,
+    output_dir,
+    area,
+    basins,
+    models,
+    scenarios,
+    variables,
+    data,
+    annual,
+    time_chunk,
+    workers,
+    memory_limit,
+):
+    """Aggregate gridded hydrological data in INPUT_DIR to basins.
+
+    One CSV file per climate model, scenario, and variable is written to OUTPUT_DIR.
+    Existing files are skipped. The number of basins is that of the basin
+    delineation for --regions.
+    """
+    from pathlib import Path
+
+    from .data.pre_processing import hydro_agg_raster as har
+    from .utils import read_basin_delineation
+
+    config = har.Config(
+        input_dir=Path(input_dir),
+        output_dir=Path(output_dir),
+        area=Path(area),
+        basins=Path(basins),
+        n_basins=len(read_basin_delineation(context)),
+        models=list(models or har.CLIMATE_MODELS),
+        scenarios=list(scenarios or har.SCENARIOS),
+        variables=list(variables),
+        data=data,
+        monthly=not annual,
+        time_chunk=time_chunk,
+        n_workers=workers,
+        memory_limit=memory_limit,
+    )
+    paths = har.aggregate(config)
+    log.info(f"Wrote {len(paths)} file(s) to {config.output_dir}")
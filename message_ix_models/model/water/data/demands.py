@@ -9,6 +9,11 @@ import pandas as pd
 import xarray as xr
 from message_ix import make_df
 
+from message_ix_models.model.water.utils import (
+    read_basin_delineation,
+    read_data_csv,
+    read_hydrology,
+)
 from message_ix_models.util import broadcast, minimum_version, package_data_path
 
 if TYPE_CHECKING:
@@ -19,62 +24,40 @@ def get_basin_sizes(
     basin: pd.DataFrame, node: str
 ) -> Sequence[Union[pd.Series, Literal[0]]]:
     """Returns the sizes of developing and developed basins for a given node"""
-    temp = basin[basin["BCU_name"] == node]
-    print(temp)
-    sizes = temp.pivot_table(index=["STATUS"], aggfunc="size")
-    print(sizes)
-    # sizes_### = sizes["###"] if "###" in sizes.index else 0
-    sizes_dev = sizes["DEV"] if "DEV" in sizes.index else 0
-    sizes_ind = sizes["IND"] if "IND" in sizes.index else 0
+    sizes = _basin_sizes(basin)
+    if node not in sizes.index:
+        return 0, 0
     return_tuple: tuple[Union[pd.Series, Literal[0]], Union[pd.Series, Literal[0]]] = (
-        sizes_dev,
-        sizes_ind,
+        sizes.at[node, "DEV"],
+        sizes.at[node, "IND"],
     )  # type: ignore # Somehow, mypy is unable to recognize the proper type without forcing it
     return return_tuple
 
 
-def set_target_rate(df: pd.DataFrame, node: str, year: int, target: float) -> None:
-    """Sets the target value for a given node and year"""
-    indices = df[df["node"] == node][df[df["node"] == node]["year"] == year].index
-    for index in indices:
-        if (
-            df[df["node"] == node][df[df["node"] == node]["year"] == year].at[
-                index, "value"
-            ]
-            < target
-        ):
-            df.at[index, "value"] = target
-
+def _basin_sizes(basin: pd.DataFrame) -> pd.DataFrame:
+    """Return the number of developing and developed countries in every basin.
 
-def set_target_rate_developed(df: pd.DataFrame, node: str, target: float) -> None:
-    """Sets target rate for a developed basin"""
-    set_target_rate(df, node, 2030, target)
+    The result is indexed by "BCU_name", with columns "DEV" and "IND".
+    """
+    return (
+        pd.crosstab(basin["BCU_name"], basin["STATUS"])
+        .reindex(columns=["DEV", "IND"], fill_value=0)
+        .rename_axis(columns=None)
+    )
 
 
-def set_target_rate_developing(df: pd.DataFrame, node: str, target: float) -> None:
-    """Sets target rate for a developing basin"""
-    for i in df.index:
-        if df.at[i, "node"] == node and df.at[i, "year"] == 2030:
-            value_2030 = df.at[i, "value"]
-            break
+def _merge_basin_sizes(df: pd.DataFrame, basin: pd.DataFrame) -> pd.DataFrame:
+    """Return "DEV" and "IND" counts from :func:`_basin_sizes` for each row in `df`.
 
-    set_target_rate(
-        df,
-        node,
-        2035,
-        (value_2030 + target) / 2,
+    Nodes that do not appear in `basin` have counts of zero. The result has the same
+    index as `df`.
+    """
+    return (
+        df[["node"]]
+        .merge(_basin_sizes(basin), how="left", left_on="node", right_index=True)
+        .fillna({"DEV": 0, "IND": 0})
+        .set_axis(df.index)
     )
-    set_target_rate(df, node, 2040, target)
-
-
-def set_target_rates(df: pd.DataFrame, basin: pd.DataFrame, val: float) -> None:
-    """Sets target rates for all nodes in a given basin"""
-    for node in df.node.unique():
-        dev_size, ind_size = get_basin_sizes(basin, node)
-        if dev_size >= ind_size:
-            set_target_rate_developed(df, node, val)
-        else:
-            set_target_rate_developing(df, node, val)
 
 
 def target_rate(df: pd.DataFrame, basin: pd.DataFrame, val: float) -> pd.DataFrame:
@@ -91,11 +74,27 @@ def target_rate(df: pd.DataFrame, basin: pd.DataFrame, val: float) -> pd.DataFra
     2040 and 2035 target is the average of
     2030 original rate and 2040 target.
 
+    Existing values that are higher than the target are not changed.
+
     Returns
     -------
         df (pandas.DataFrame): Data frame with updated value column.
     """
-    set_target_rates(df, basin, val)
+    sizes = _merge_basin_sizes(df, basin)
+    # NB nodes with as many or more "DEV" than "IND" entries receive the 2030 target
+    target_2030 = sizes["DEV"] >= sizes["IND"]
+
+    # Original 2030 value for each node: the first occurrence in `df`
+    value_2030 = df["node"].map(
+        df[df["year"] == 2030].drop_duplicates("node").set_index("node")["value"]
+    )
+
+    target = pd.Series(np.nan, index=df.index)
+    target = target.mask(target_2030 & (df["year"] == 2030), val)
+    target = target.mask(~target_2030 & (df["year"] == 2035), (value_2030 + val) / 2)
+    target = target.mask(~target_2030 & (df["year"] == 2040), val)
+
+    df["value"] = df["value"].mask(df["value"] < target, target)
     return df
 
 
@@ -109,55 +108,18 @@ def target_rate_trt(df: pd.DataFrame, basin: pd.DataFrame) -> pd.DataFrame:
     -------
     data : pandas.DataFrame
     """
+    sizes = _merge_basin_sizes(df, basin)
+    # First year in which the target applies: 2040 if "DEV" entries are at least as
+    # many as "IND" entries; otherwise 2030
+    developing = (sizes["DEV"] >= sizes["IND"]) & (sizes["DEV"] > 0)
+    first_year = np.where(developing, 2040, 2030)
 
-    value = []
-    for i in df.node.unique():
-        temp = basin[basin["BCU_name"] == i]
-
-        sizes = temp.pivot_table(index=["STATUS"], aggfunc="size")
-
-        if len(sizes) > 1:
-            if sizes["DEV"] > sizes["IND"] or sizes["DEV"] == sizes["IND"]:
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-            else:
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-        else:
-            if sizes.index[0] == "DEV":
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2040].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-            else:
-                for j in df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].index:
-                    temp = df[df["node"] == i][df[df["node"] == i]["year"] >= 2030].at[
-                        j, "value"
-                    ]
-                    temp = temp + (1 - temp) / 2
-                    value.append([j, np.float64(temp)])
-
-    valuetest = pd.DataFrame(data=value, columns=["Index", "Value"])
-
-    for i in range(len(valuetest["Index"])):
-        df.at[valuetest["Index"][i], "Value"] = valuetest["Value"][i]
-
-    real_value = df["Value"].combine_first(df["value"])
-
-    df.drop(["value", "Value"], axis=1, inplace=True)
-
-    df["value"] = real_value
-    return df
+    value = df["value"].mask(
+        df["year"] >= first_year, df["value"] + (1 - df["value"]) / 2
+    )
+
+    # The "value" column is last in the result
+    return df.drop(columns="value").assign(value=value)
 
 
 @minimum_version("message_ix 3.7")
@@ -305,9 +267,7 @@ def add_sectoral_demands(context: "Context") -> dict[str, pd.DataFrame]:
         if context.SDG == "SDG":
             # reading basin mapping to countries
             FILE2 = f"basins_country_{context.regions}.csv"
-            PATH = package_data_path("water", "delineation", FILE2)
-
-            df_basin = pd.read_csv(PATH)
+            df_basin = read_data_csv("delineation", FILE2)
 
             # Applying 80% sanitation rate for rural sanitation
             rural_treatment_rate_df = rural_treatment_rate_df_sdg = target_rate(
@@ -765,112 +725,32 @@ def read_water_availability(context: "Context") -> Sequence[pd.DataFrame]:
     # Reference to the water configuration
     info = context["water build info"]
     # reading sample for assiging basins
-    PATH = package_data_path(
-        "water", "delineation", f"basins_by_region_simpl_{context.regions}.csv"
-    )
-    df_x = pd.read_csv(PATH)
+    df_x = read_basin_delineation(context)
 
-    if "year" in context.time:
-        # path for reading basin delineation file
-        PATH = package_data_path(
-            "water", "delineation", f"basins_by_region_simpl_{context.regions}.csv"
-        )
-        df_x = pd.read_csv(PATH)
-        # Adding freshwater supply constraints
+    def _read(variable: str) -> pd.DataFrame:
         # Reading data, the data is spatially and temprally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"qtot_5y_{context.RCP}_{context.REL}_{context.regions}.csv",
-        )
-        # Read rcp 2.6 data
-        df_sw = pd.read_csv(path1)
-        df_sw.drop(["Unnamed: 0"], axis=1, inplace=True)
-
-        df_sw.index = df_x["BCU_name"].index
-        df_sw = df_sw.stack().reset_index()
-        df_sw.columns = pd.Index(["Region", "years", "value"])
-        df_sw.fillna(0, inplace=True)
-        df_sw.reset_index(drop=True, inplace=True)
-        df_sw["year"] = pd.DatetimeIndex(df_sw["years"]).year
-        df_sw["time"] = "year"
-        df_sw["Region"] = df_sw["Region"].map(df_x["BCU_name"])
-        df_sw2210 = df_sw[df_sw["year"] == 2100].copy()
-        df_sw2210["year"] = 2110
-        df_sw = pd.concat([df_sw, df_sw2210])
-        df_sw = df_sw[df_sw["year"].isin(info.Y)]
-
-        # Adding groundwater supply constraints
-        # Reading data, the data is spatially and temprally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"qr_5y_{context.RCP}_{context.REL}_{context.regions}.csv",
+        df = read_hydrology(context, variable)
+        df.index = df_x["BCU_name"].index
+        df = df.stack().reset_index()
+        df.columns = pd.Index(["Region", "years", "value"])
+        if "year" not in context.time:
+            df.sort_values(["Region", "years", "value"], inplace=True)
+        df.fillna(0, inplace=True)
+        df.reset_index(drop=True, inplace=True)
+        df["year"] = pd.DatetimeIndex(df["years"]).year
+        df["time"] = (
+            "year" if "year" in context.time else pd.DatetimeIndex(df["years"]).month
         )
+        df["Region"] = df["Region"].map(df_x["BCU_name"])
+        df2210 = df[df["year"] == 2100].copy()
+        df2210["year"] = 2110
+        df = pd.concat([df, df2210])
+        return df[df["year"].isin(info.Y)]
 
-        # Read groundwater data
-        df_gw = pd.read_csv(path1)
-        df_gw.drop(["Unnamed: 0"], axis=1, inplace=True)
-        df_gw.index = df_x["BCU_name"].index
-        df_gw = df_gw.stack().reset_index()
-        df_gw.columns = pd.Index(["Region", "years", "value"])
-        df_gw.fillna(0, inplace=True)
-        df_gw.reset_index(drop=True, inplace=True)
-        df_gw["year"] = pd.DatetimeIndex(df_gw["years"]).year
-        df_gw["time"] = "year"
-        df_gw["Region"] = df_gw["Region"].map(df_x["BCU_name"])
-        df_gw2210 = df_gw[df_gw["year"] == 2100].copy()
-        df_gw2210["year"] = 2110
-        df_gw = pd.concat([df_gw, df_gw2210])
-        df_gw = df_gw[df_gw["year"].isin(info.Y)]
-
-    else:
-        # Adding freshwater supply constraints
-        # Reading data, the data is spatially and temprally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"qtot_5y_m_{context.RCP}_{context.REL}_{context.regions}.csv",
-        )
-        df_sw = pd.read_csv(path1)
-        df_sw.drop(["Unnamed: 0"], axis=1, inplace=True)
-
-        df_sw.index = df_x["BCU_name"].index
-        df_sw = df_sw.stack().reset_index()
-        df_sw.columns = pd.Index(["Region", "years", "value"])
-        df_sw.sort_values(["Region", "years", "value"], inplace=True)
-        df_sw.fillna(0, inplace=True)
-        df_sw.reset_index(drop=True, inplace=True)
-        df_sw["year"] = pd.DatetimeIndex(df_sw["years"]).year
-        df_sw["time"] = pd.DatetimeIndex(df_sw["years"]).month
-        df_sw["Region"] = df_sw["Region"].map(df_x["BCU_name"])
-        df_sw2210 = df_sw[df_sw["year"] == 2100].copy()
-        df_sw2210["year"] = 2110
-        df_sw = pd.concat([df_sw, df_sw2210])
-        df_sw = df_sw[df_sw["year"].isin(info.Y)]
-
-        # Reading data, the data is spatially and temporally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"qr_5y_m_{context.RCP}_{context.REL}_{context.regions}.csv",
-        )
-        df_gw = pd.read_csv(path1)
-        df_gw.drop(["Unnamed: 0"], axis=1, inplace=True)
-
-        df_gw.index = df_x["BCU_name"].index
-        df_gw = df_gw.stack().reset_index()
-        df_gw.columns = pd.Index(["Region", "years", "value"])
-        df_gw.sort_values(["Region", "years", "value"], inplace=True)
-        df_gw.fillna(0, inplace=True)
-        df_gw.reset_index(drop=True, inplace=True)
-        df_gw["year"] = pd.DatetimeIndex(df_gw["years"]).year
-        df_gw["time"] = pd.DatetimeIndex(df_gw["years"]).month
-        df_gw["Region"] = df_gw["Region"].map(df_x["BCU_name"])
-        df_gw2210 = df_gw[df_gw["year"] == 2100].copy()
-        df_gw2210["year"] = 2110
-        df_gw = pd.concat([df_gw, df_gw2210])
-        df_gw = df_gw[df_gw["year"].isin(info.Y)]
+    # Adding freshwater supply constraints
+    df_sw = _read("qtot")
+    # Adding groundwater supply constraints
+    df_gw = _read("qr")
 
     return df_sw, df_gw
 
@@ -8,7 +8,12 @@ import pandas as pd
 from message_ix import make_df
 
 from message_ix_models import Context
-from message_ix_models.model.water.utils import map_yv_ya_lt
+from message_ix_models.model.water.utils import (
+    broadcast_yv_ya,
+    map_yv_ya_lt,
+    read_basin_delineation,
+    read_data_csv,
+)
 from message_ix_models.util import (
     broadcast,
     make_matched_dfs,
@@ -27,117 +32,37 @@ def start_creating_input_dataframe(
     first_year: int,
     sub_time,
 ) -> pd.DataFrame:
-    """Creates an input pd.DataFrame and adds some data to it."""
-    inp_df = pd.DataFrame([])
-    # Input Dataframe for non elec commodities
-    for index, rows in df_non_elec.iterrows():
-        inp_df = pd.concat(
-            [
-                inp_df,
-                (
-                    make_df(
-                        "input",
-                        technology=rows["tec"],
-                        value=rows["value_mid"],
-                        unit="-",
-                        level=rows["inlvl"],
-                        commodity=rows["incmd"],
-                        mode="M1",
-                        node_loc=df_node["node"],
-                    )
-                    .pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        time=sub_time,
-                    )
-                    .pipe(same_node)
-                    .pipe(same_time)
-                ),
-            ]
-        )
-    if sdg != "baseline":
-        for index, rows in df_dist.iterrows():
-            return pd.concat(
-                [
-                    inp_df,
-                    (
-                        make_df(
-                            "input",
-                            technology=rows["tec"],
-                            value=rows["value_high"],
-                            unit="-",
-                            level=rows["inlvl"],
-                            commodity=rows["incmd"],
-                            mode="Mf",
-                        )
-                        .pipe(
-                            broadcast,
-                            map_yv_ya_lt(
-                                year_wat, rows["technical_lifetime_mid"], first_year
-                            ),
-                            node_loc=df_node["node"],
-                            time=sub_time,
-                        )
-                        .pipe(same_node)
-                        .pipe(same_time)
-                    ),
-                ]
-            )
-    else:
-        for index, rows in df_dist.iterrows():
-            inp_df = pd.concat(
-                [
-                    inp_df,
-                    (
-                        make_df(
-                            "input",
-                            technology=rows["tec"],
-                            value=rows["value_mid"],
-                            unit="-",
-                            level=rows["inlvl"],
-                            commodity=rows["incmd"],
-                            mode="M1",
-                        )
-                        .pipe(
-                            broadcast,
-                            map_yv_ya_lt(
-                                year_wat, rows["technical_lifetime_mid"], first_year
-                            ),
-                            node_loc=df_node["node"],
-                            time=sub_time,
-                        )
-                        .pipe(same_node)
-                        .pipe(same_time)
-                    ),
-                ]
+    """Creates an input pd.DataFrame and adds some data to it.
+
+    Data for all technologies in each of `df_non_elec` and `df_dist` are constructed
+    at once. Distribution technologies in `df_dist` have input in mode "Mf"; if `sdg`
+    is "baseline", also in mode "M1".
+    """
+
+    def _input(df: pd.DataFrame, value: str, mode: str) -> pd.DataFrame:
+        return (
+            make_df(
+                "input",
+                technology=df["tec"],
+                value=df[value],
+                unit="-",
+                level=df["inlvl"],
+                commodity=df["incmd"],
+                mode=mode,
             )
+            .pipe(broadcast_yv_ya, df["technical_lifetime_mid"], year_wat, first_year)
+            .pipe(broadcast, node_loc=df_node["node"], time=sub_time)
+            .pipe(same_node)
+            .pipe(same_time)
+        )
 
-    return pd.concat(
-        [
-            inp_df,
-            (
-                make_df(
-                    "input",
-                    technology=rows["tec"],
-                    value=rows["value_high"],
-                    unit="-",
-                    level=rows["inlvl"],
-                    commodity=rows["incmd"],
-                    mode="Mf",
-                )
-                .pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["technical_lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                    time=sub_time,
-                )
-                .pipe(same_node)
-                .pipe(same_time)
-            ),
-        ]
-    )
+    # Input Dataframe for non elec commodities
+    dfs = [_input(df_non_elec, "value_mid", "M1")]
+    if sdg == "baseline":
+        dfs.append(_input(df_dist, "value_mid", "M1"))
+    dfs.append(_input(df_dist, "value_high", "Mf"))
+
+    return pd.concat(dfs)
 
 
 def add_infrastructure_techs(context: "Context") -> dict[str, pd.DataFrame]:
@@ -170,10 +95,7 @@ def add_infrastructure_techs(context: "Context") -> dict[str, pd.DataFrame]:
     first_year = scen.firstmodelyear
 
     # reading basin_delineation
-    FILE2 = f"basins_by_region_simpl_{context.regions}.csv"
-    PATH = package_data_path("water", "delineation", FILE2)
-
-    df_node = pd.read_csv(PATH)
+    df_node = read_basin_delineation(context)
     # Assigning proper nomenclature
     df_node["node"] = "B" + df_node["BCU_name"].astype(str)
     df_node["mode"] = "M" + df_node["BCU_name"].astype(str)
@@ -231,131 +153,44 @@ def add_infrastructure_techs(context: "Context") -> dict[str, pd.DataFrame]:
     df_out_dist = df_out[df_out["tec"].isin(techs)]
     df_out = df_out[~df_out["tec"].isin(techs)]
 
-    out_df = pd.DataFrame([])
-    for index, rows in df_out.iterrows():
-        out_df = pd.concat(
-            [
-                out_df,
-                (
-                    make_df(
-                        "output",
-                        technology=rows["tec"],
-                        value=rows["out_value_mid"],
-                        unit="-",
-                        level=rows["outlvl"],
-                        commodity=rows["outcmd"],
-                        mode="M1",
-                    )
-                    .pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        node_loc=df_node["node"],
-                        time=sub_time,
-                    )
-                    .pipe(same_node)
-                    .pipe(same_time)
-                ),
-            ]
+    def _output(df: pd.DataFrame, mode: str) -> pd.DataFrame:
+        return (
+            make_df(
+                "output",
+                technology=df["tec"],
+                value=df["out_value_mid"],
+                unit="-",
+                level=df["outlvl"],
+                commodity=df["outcmd"],
+                mode=mode,
+            )
+            .pipe(broadcast_yv_ya, df["technical_lifetime_mid"], year_wat, first_year)
+            .pipe(broadcast, node_loc=df_node["node"], time=sub_time)
+            .pipe(same_node)
+            .pipe(same_time)
         )
 
-    if context.SDG != "baseline":
-        out_df = pd.concat(
-            [
-                out_df,
-                make_df(
-                    "output",
-                    technology=df_out_dist["tec"],
-                    value=df_out_dist["out_value_mid"],
-                    unit="-",
-                    level=df_out_dist["outlvl"],
-                    commodity=df_out_dist["outcmd"],
-                    mode="Mf",
-                )
-                .pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["technical_lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                    time=sub_time,
-                )
-                .pipe(same_node)
-                .pipe(same_time),
-            ]
-        )
-    else:
-        out_df = pd.concat(
-            [
-                out_df,
-                make_df(
-                    "output",
-                    technology=df_out_dist["tec"],
-                    value=df_out_dist["out_value_mid"],
-                    unit="-",
-                    level=df_out_dist["outlvl"],
-                    commodity=df_out_dist["outcmd"],
-                    mode="M1",
-                )
-                .pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["technical_lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                    time=sub_time,
-                )
-                .pipe(same_node)
-                .pipe(same_time),
-            ]
-        )
-        out_df = pd.concat(
-            [
-                out_df,
-                make_df(
-                    "output",
-                    technology=df_out_dist["tec"],
-                    value=df_out_dist["out_value_mid"],
-                    unit="-",
-                    level=df_out_dist["outlvl"],
-                    commodity=df_out_dist["outcmd"],
-                    mode="Mf",
-                )
-                .pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["technical_lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                    time=sub_time,
-                )
-                .pipe(same_node)
-                .pipe(same_time),
-            ]
-        )
+    out_dfs = [_output(df_out, "M1")]
+    if context.SDG == "baseline":
+        out_dfs.append(_output(df_out_dist, "M1"))
+    out_dfs.append(_output(df_out_dist, "Mf"))
 
-    results["output"] = out_df
+    results["output"] = pd.concat(out_dfs)
 
     # Filtering df for capacity factors
     df_cap = df.dropna(subset=["capacity_factor_mid"])
-    cap_df = pd.DataFrame([])
     # Adding capacity factor dataframe
-    for index, rows in df_cap.iterrows():
-        cap_df = pd.concat(
-            [
-                cap_df,
-                make_df(
-                    "capacity_factor",
-                    technology=rows["tec"],
-                    value=rows["capacity_factor_mid"],
-                    unit="%",
-                )
-                .pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["technical_lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                    time=sub_time,
-                )
-                .pipe(same_node),
-            ]
+    results["capacity_factor"] = (
+        make_df(
+            "capacity_factor",
+            technology=df_cap["tec"],
+            value=df_cap["capacity_factor_mid"],
+            unit="%",
         )
-
-    results["capacity_factor"] = cap_df
+        .pipe(broadcast_yv_ya, df_cap["technical_lifetime_mid"], year_wat, first_year)
+        .pipe(broadcast, node_loc=df_node["node"], time=sub_time)
+        .pipe(same_node)
+    )
 
     # Filtering df for capacity factors
     df_tl = df.dropna(subset=["technical_lifetime_mid"])
@@ -389,147 +224,43 @@ def add_infrastructure_techs(context: "Context") -> dict[str, pd.DataFrame]:
     inv_cost = inv_cost[~inv_cost["technology"].isin(techs)]
     results["inv_cost"] = inv_cost
 
-    # Fixed costs
-    # Prepare data frame for fix_cost
-    fix_cost = pd.DataFrame([])
-    var_cost = pd.DataFrame([])
-
-    for index, rows in df_inv.iterrows():
-        fix_cost = pd.concat(
-            [
-                fix_cost,
-                make_df(
-                    "fix_cost",
-                    technology=df_inv["tec"],
-                    value=df_inv["fix_cost_mid"],
-                    unit="USD/km3",
-                ).pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["technical_lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                ),
-            ]
-        )
-
-        fix_cost = fix_cost[~fix_cost["technology"].isin(techs)]
-
-        results["fix_cost"] = fix_cost
-
     df_var = df_inv[~df_inv["tec"].isin(techs)]
     df_var_dist = df_inv[df_inv["tec"].isin(techs)]
 
-    df_var = df_inv[~df_inv["tec"].isin(techs)]
-    df_var_dist = df_inv[df_inv["tec"].isin(techs)]
-
-    if context.SDG != "baseline":
-        for index, rows in df_var.iterrows():
-            # Variable cost
-            var_cost = pd.concat(
-                [
-                    var_cost,
-                    make_df(
-                        "var_cost",
-                        technology=rows["tec"],
-                        value=rows["var_cost_mid"],
-                        unit="USD/km3",
-                        mode="M1",
-                    ).pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        node_loc=df_node["node"],
-                        time=sub_time,
-                    ),
-                ]
-            )
+    # Fixed costs
+    # Prepare data frame for fix_cost
+    results["fix_cost"] = (
+        make_df(
+            "fix_cost",
+            technology=df_var["tec"],
+            value=df_var["fix_cost_mid"],
+            unit="USD/km3",
+        )
+        .pipe(broadcast_yv_ya, df_var["technical_lifetime_mid"], year_wat, first_year)
+        .pipe(broadcast, node_loc=df_node["node"])
+    )
 
-        # Variable cost for distribution technologies
-        for index, rows in df_var_dist.iterrows():
-            var_cost = pd.concat(
-                [
-                    var_cost,
-                    make_df(
-                        "var_cost",
-                        technology=rows["tec"],
-                        value=rows["var_cost_high"],
-                        unit="USD/km3",
-                        mode="Mf",
-                    ).pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        node_loc=df_node["node"],
-                        time=sub_time,
-                    ),
-                ]
-            )
-        results["var_cost"] = var_cost
-    else:
-        # Variable cost
-        for index, rows in df_var.iterrows():
-            var_cost = pd.concat(
-                [
-                    var_cost,
-                    make_df(
-                        "var_cost",
-                        technology=rows["tec"],
-                        value=df_var["var_cost_mid"],
-                        unit="USD/km3",
-                        mode="M1",
-                    ).pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        node_loc=df_node["node"],
-                        time=sub_time,
-                    ),
-                ]
+    # Variable cost
+    def _var_cost(df: pd.DataFrame, value: str, mode: str) -> pd.DataFrame:
+        return (
+            make_df(
+                "var_cost",
+                technology=df["tec"],
+                value=df[value],
+                unit="USD/km3",
+                mode=mode,
             )
+            .pipe(broadcast_yv_ya, df["technical_lifetime_mid"], year_wat, first_year)
+            .pipe(broadcast, node_loc=df_node["node"], time=sub_time)
+        )
 
-        for index, rows in df_var_dist.iterrows():
-            var_cost = pd.concat(
-                [
-                    var_cost,
-                    make_df(
-                        "var_cost",
-                        technology=rows["tec"],
-                        value=rows["var_cost_mid"],
-                        unit="USD/km3",
-                        mode="M1",
-                    ).pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        node_loc=df_node["node"],
-                        time=sub_time,
-                    ),
-                ]
-            )
+    var_dfs = [_var_cost(df_var, "var_cost_mid", "M1")]
+    # Variable cost for distribution technologies
+    if context.SDG == "baseline":
+        var_dfs.append(_var_cost(df_var_dist, "var_cost_mid", "M1"))
+    var_dfs.append(_var_cost(df_var_dist, "var_cost_high", "Mf"))
 
-            var_cost = pd.concat(
-                [
-                    var_cost,
-                    make_df(
-                        "var_cost",
-                        technology=rows["tec"],
-                        value=rows["var_cost_high"],
-                        unit="USD/km3",
-                        mode="Mf",
-                    ).pipe(
-                        broadcast,
-                        map_yv_ya_lt(
-                            year_wat, rows["technical_lifetime_mid"], first_year
-                        ),
-                        node_loc=df_node["node"],
-                        time=sub_time,
-                    ),
-                ]
-            )
-        results["var_cost"] = var_cost
+    results["var_cost"] = pd.concat(var_dfs)
 
     return results
 
@@ -545,98 +276,35 @@ def prepare_input_dataframe(
 ) -> defaultdict[Any, list]:
     result_dc = defaultdict(list)
 
-    for _, rows in df_elec.iterrows():
-        if rows["tec"] in techs:
-            if context.SDG != "baseline":
-                inp = make_df(
-                    "input",
-                    technology=rows["tec"],
-                    value=rows["value_high"],
-                    unit="-",
-                    level="final",
-                    commodity="electr",
-                    mode="Mf",
-                    time_origin="year",
-                    node_loc=df_node["node"],
-                    node_origin=df_node["region"],
-                ).pipe(
-                    broadcast,
-                    map_yv_ya_lt(
-                        year_wat,
-                        # 1 because elec commodities don't have technical lifetime
-                        1,
-                        first_year,
-                    ),
-                    time=sub_time,
-                )
-
-                result_dc["input"].append(inp)
-            else:
-                inp = make_df(
-                    "input",
-                    technology=rows["tec"],
-                    value=rows["value_high"],
-                    unit="-",
-                    level="final",
-                    commodity="electr",
-                    mode="Mf",
-                    time_origin="year",
-                    node_loc=df_node["node"],
-                    node_origin=df_node["region"],
-                ).pipe(
-                    broadcast,
-                    map_yv_ya_lt(
-                        year_wat,
-                        # 1 because elec commodities don't have technical lifetime
-                        1,
-                        first_year,
-                    ),
-                    time=sub_time,
-                )
-
-                inp = pd.concat(
-                    [
-                        inp,
-                        make_df(
-                            "input",
-                            technology=rows["tec"],
-                            value=rows["value_mid"],
-                            unit="-",
-                            level="final",
-                            commodity="electr",
-                            mode="M1",
-                            time_origin="year",
-                            node_loc=df_node["node"],
-                            node_origin=df_node["region"],
-                        ).pipe(
-                            broadcast,
-                            # 1 because elec commodities don't have technical lifetime
-                            map_yv_ya_lt(year_wat, 1, first_year),
-                            time=sub_time,
-                        ),
-                    ]
-                )
+    # Matched labels for node_loc and node_origin
+    nodes = df_node[["node", "region"]].set_axis(["node_loc", "node_origin"], axis=1)
 
-                result_dc["input"].append(inp)
-        else:
-            inp = make_df(
+    def _input(df: pd.DataFrame, value: str, mode: str) -> pd.DataFrame:
+        return (
+            make_df(
                 "input",
-                technology=rows["tec"],
-                value=rows["value_mid"],
+                technology=df["tec"],
+                value=df[value],
                 unit="-",
                 level="final",
                 commodity="electr",
-                mode="M1",
+                mode=mode,
                 time_origin="year",
-                node_loc=df_node["node"],
-                node_origin=df_node["region"],
-            ).pipe(
-                broadcast,
-                map_yv_ya_lt(year_wat, 1, first_year),
-                time=sub_time,
             )
+            # 1 because elec commodities don't have technical lifetime
+            .pipe(broadcast_yv_ya, 1, year_wat, first_year)
+            .pipe(broadcast, nodes, time=sub_time)
+        )
+
+    df_dist = df_elec[df_elec["tec"].isin(techs)]
+
+    result_dc["input"].append(_input(df_dist, "value_high", "Mf"))
+    if context.SDG == "baseline":
+        result_dc["input"].append(_input(df_dist, "value_mid", "M1"))
+    result_dc["input"].append(
+        _input(df_elec[~df_elec["tec"].isin(techs)], "value_mid", "M1")
+    )
 
-            result_dc["input"].append(inp)
     return result_dc
 
 
@@ -674,30 +342,23 @@ def add_desalination(context: "Context") -> dict[str, pd.DataFrame]:
 
     # Reading water distribution mapping from csv
     path = package_data_path("water", "infrastructure", "desalination.xlsx")
-    path2 = package_data_path(
-        "water",
+    # Reading dataframes
+    df_desal = pd.read_excel(path)
+    df_hist = read_data_csv(
         "infrastructure",
         f"historical_capacity_desalination_km3_year_{context.regions}.csv",
     )
-    path3 = package_data_path(
-        "water",
+    df_proj = read_data_csv(
         "infrastructure",
         f"projected_desalination_potential_km3_year_{context.regions}.csv",
     )
-    # Reading dataframes
-    df_desal = pd.read_excel(path)
-    df_hist = pd.read_csv(path2)
-    df_proj = pd.read_csv(path3)
     df_proj = df_proj[df_proj["rcp"] == f"{context.RCP}"]
     df_proj = df_proj[~(df_proj["year"] == 2065) & ~(df_proj["year"] == 2075)]
     df_proj.reset_index(inplace=True, drop=True)
     df_proj = df_proj[df_proj["year"].isin(info.Y)]
 
     # reading basin_delineation
-    FILE2 = f"basins_by_region_simpl_{context.regions}.csv"
-    PATH = package_data_path("water", "delineation", FILE2)
-
-    df_node = pd.read_csv(PATH)
+    df_node = read_basin_delineation(context)
     # Assigning proper nomenclature
     df_node["node"] = "B" + df_node["BCU_name"].astype(str)
     df_node["mode"] = "M" + df_node["BCU_name"].astype(str)
@@ -779,47 +440,31 @@ def add_desalination(context: "Context") -> dict[str, pd.DataFrame]:
 
     results["inv_cost"] = inv_cost
 
-    fix_cost = pd.DataFrame([])
-    var_cost = pd.DataFrame([])
-    for index, rows in df_desal.iterrows():
-        # Fixed costs
-        # Prepare dataframe for fix_cost
-        fix_cost = pd.concat(
-            [
-                fix_cost,
-                make_df(
-                    "fix_cost",
-                    technology=rows["tec"],
-                    value=rows["fix_cost_mid"],
-                    unit="USD/km3",
-                ).pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                ),
-            ]
+    # Fixed costs
+    # Prepare dataframe for fix_cost
+    results["fix_cost"] = (
+        make_df(
+            "fix_cost",
+            technology=df_desal["tec"],
+            value=df_desal["fix_cost_mid"],
+            unit="USD/km3",
         )
+        .pipe(broadcast_yv_ya, df_desal["lifetime_mid"], year_wat, first_year)
+        .pipe(broadcast, node_loc=df_node["node"])
+    )
 
-        results["fix_cost"] = fix_cost
-
-        # Variable cost
-        var_cost = pd.concat(
-            [
-                var_cost,
-                make_df(
-                    "var_cost",
-                    technology=rows["tec"],
-                    value=rows["var_cost_mid"],
-                    unit="USD/km3",
-                    mode="M1",
-                ).pipe(
-                    broadcast,
-                    map_yv_ya_lt(year_wat, rows["lifetime_mid"], first_year),
-                    node_loc=df_node["node"],
-                    time=pd.Series(sub_time),
-                ),
-            ]
+    # Variable cost
+    results["var_cost"] = (
+        make_df(
+            "var_cost",
+            technology=df_desal["tec"],
+            value=df_desal["var_cost_mid"],
+            unit="USD/km3",
+            mode="M1",
         )
+        .pipe(broadcast_yv_ya, df_desal["lifetime_mid"], year_wat, first_year)
+        .pipe(broadcast, node_loc=df_node["node"], time=pd.Series(sub_time))
+    )
 
     # Dummy  Variable cost for salinewater extrqction
     # var_cost = var_cost.append(
@@ -833,8 +478,6 @@ def add_desalination(context: "Context") -> dict[str, pd.DataFrame]:
     # ).pipe(broadcast, year_vtg=year_wat, year_act=year_wat, node_loc=df_node["node"])
     # )
 
-    results["var_cost"] = var_cost
-
     tl = pd.concat(
         [
             tl,
@@ -856,120 +499,67 @@ def add_desalination(context: "Context") -> dict[str, pd.DataFrame]:
     cons_time = make_matched_dfs(tl, construction_time=3)
     results["construction_time"] = cons_time["construction_time"]
 
-    from collections import defaultdict
-
-    result_dc = defaultdict(list)
-
-    for index, rows in df_desal.iterrows():
-        inp = make_df(
-            "input",
-            technology=rows["tec"],
-            value=rows["electricity_input_mid"],
-            unit="-",
-            level="final",
-            commodity="electr",
-            mode="M1",
-            time_origin="year",
-            node_loc=df_node["node"],
-            node_origin=df_node["region"],
-        ).pipe(
-            broadcast,
-            map_yv_ya_lt(year_wat, rows["lifetime_mid"], first_year),
-            time=pd.Series(sub_time),
-        )
-
-        result_dc["input"].append(inp)
-
-    results_new = {par_name: pd.concat(dfs) for par_name, dfs in result_dc.items()}
-
-    inp_df = results_new["input"]
-
+    # Matched labels for node_loc and node_origin
+    nodes = df_node[["node", "region"]].set_axis(["node_loc", "node_origin"], axis=1)
     # Adding input dataframe
     df_heat = df_desal[df_desal["heat_input_mid"] > 0]
 
-    result_dc = defaultdict(list)
-
-    for index, rows in df_heat.iterrows():
-        inp = make_df(
-            "input",
-            technology=rows["tec"],
-            value=rows["heat_input_mid"],
-            unit="-",
-            level="final",
-            commodity="d_heat",
-            mode="M1",
-            time_origin="year",
-            node_loc=df_node["node"],
-            node_origin=df_node["region"],
-        ).pipe(
-            broadcast,
-            map_yv_ya_lt(year_wat, rows["lifetime_mid"], first_year),
-            time=pd.Series(sub_time),
-        )
-
-        result_dc["input"].append(inp)
-
-    results_new = {par_name: pd.concat(dfs) for par_name, dfs in result_dc.items()}
-
-    inp_df = pd.concat([inp_df, results_new["input"]])
-
-    # Adding input dataframe
-    for index, rows in df_desal.iterrows():
-        inp_df = pd.concat(
-            [
-                inp_df,
-                (
-                    make_df(
-                        "input",
-                        technology=rows["tec"],
-                        value=1,
-                        unit="-",
-                        level=rows["inlvl"],
-                        commodity=rows["incmd"],
-                        mode="M1",
-                    )
-                    .pipe(
-                        broadcast,
-                        map_yv_ya_lt(year_wat, rows["lifetime_mid"], first_year),
-                        node_loc=df_node["node"],
-                        time=pd.Series(sub_time),
-                    )
-                    .pipe(same_node)
-                    .pipe(same_time)
-                ),
-            ]
-        )
+    inp_df = pd.concat(
+        [
+            make_df(
+                "input",
+                technology=df["tec"],
+                value=df[value],
+                unit="-",
+                level="final",
+                commodity=commodity,
+                mode="M1",
+                time_origin="year",
+            )
+            .pipe(broadcast_yv_ya, df["lifetime_mid"], year_wat, first_year)
+            .pipe(broadcast, nodes, time=pd.Series(sub_time))
+            for df, value, commodity in (
+                (df_desal, "electricity_input_mid", "electr"),
+                (df_heat, "heat_input_mid", "d_heat"),
+            )
+        ]
+        + [
+            make_df(
+                "input",
+                technology=df_desal["tec"],
+                value=1,
+                unit="-",
+                level=df_desal["inlvl"],
+                commodity=df_desal["incmd"],
+                mode="M1",
+            )
+            .pipe(broadcast_yv_ya, df_desal["lifetime_mid"], year_wat, first_year)
+            .pipe(broadcast, node_loc=df_node["node"], time=pd.Series(sub_time))
+            .pipe(same_node)
+            .pipe(same_time)
+        ]
+    )
 
-        inp_df.dropna(inplace=True)
-
-        results["input"] = inp_df
-
-        out_df = pd.concat(
-            [
-                out_df,
-                (
-                    make_df(
-                        "output",
-                        technology=rows["tec"],
-                        value=1,
-                        unit="-",
-                        level=rows["outlvl"],
-                        commodity=rows["outcmd"],
-                        mode="M1",
-                    )
-                    .pipe(
-                        broadcast,
-                        map_yv_ya_lt(year_wat, rows["lifetime_mid"], first_year),
-                        node_loc=df_node["node"],
-                        time=pd.Series(sub_time),
-                    )
-                    .pipe(same_node)
-                    .pipe(same_time)
-                ),
-            ]
-        )
+    results["input"] = inp_df.dropna()
 
-        results["output"] = out_df
+    results["output"] = pd.concat(
+        [
+            out_df,
+            make_df(
+                "output",
+                technology=df_desal["tec"],
+                value=1,
+                unit="-",
+                level=df_desal["outlvl"],
+                commodity=df_desal["outcmd"],
+                mode="M1",
+            )
+            .pipe(broadcast_yv_ya, df_desal["lifetime_mid"], year_wat, first_year)
+            .pipe(broadcast, node_loc=df_node["node"], time=pd.Series(sub_time))
+            .pipe(same_node)
+            .pipe(same_time),
+        ]
+    )
 
     # putting a lower bound on desalination tecs based on hist capacities
     df_bound = df_hist[df_hist["year"] == 2015]
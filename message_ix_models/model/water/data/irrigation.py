@@ -4,7 +4,8 @@ import pandas as pd
 from message_ix import make_df
 
 from message_ix_models import Context
-from message_ix_models.util import broadcast, package_data_path
+from message_ix_models.model.water.utils import read_basin_delineation
+from message_ix_models.util import broadcast
 
 
 # water & electricity for irrigation
@@ -29,9 +30,7 @@ def add_irr_structure(context: "Context") -> dict[str, pd.DataFrame]:
     results = {}
 
     # reading basin_delineation
-    FILE2 = f"basins_by_region_simpl_{context.regions}.csv"
-    PATH = package_data_path("water", "delineation", FILE2)
-    df_node = pd.read_csv(PATH)
+    df_node = read_basin_delineation(context)
     # Assigning proper nomenclature
     df_node["node"] = "B" + df_node["BCU_name"].astype(str)
     df_node["mode"] = "M" + df_node["BCU_name"].astype(str)
@@ -0,0 +1 @@
+"""Pre-processing of source data for MESSAGEix-Nexus."""
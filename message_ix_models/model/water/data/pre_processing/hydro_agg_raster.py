@@ -1,291 +1,318 @@
-"""
-This script aggregates the global gridded data to any
-scale and also adjust unit conversions. The following
-script specifically aggregates global gridded hydrological
-data onto the basin
- mapping used in the nexus module.
-"""
+"""Aggregate global gridded hydrological data onto the basins of the nexus module.
 
-import glob
+Gridded monthly data from ISIMIP climate models (for instance CWatM output for
+ISIMIP3b) are converted to km³/year, aggregated to the basin-country units (BCU) of
+:func:`.read_basin_delineation`, and optionally to 5-year periods. The results are
+written to one CSV file per climate model, scenario, and variable, with one row per
+basin and one column per date, as expected by :file:`hydro_agg_basin.py`.
 
-#  Import packages
-import os
-from datetime import datetime as dt
+Use :func:`aggregate`, or the :program:`mix-models water-ix hydro-agg` command. The
+hydrological data can be accessed in the watxene P: drive; for access, seek
+permission from Edward Byers (byers@iiasa.ac.at).
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Optional
 
-import dask
 import numpy as np
+import pandas as pd
 import xarray as xr
+from scipy import sparse
 
-start = dt.now()
-
-
-# variable, for detailed symbols, refer to ISIMIP2b documentation
-variables = [
-    "qtot",  # total runoff
-    "dis",  # discharge
-    "qg",  # groundwater runoff
-    "qr",
-]  # groudnwater recharge
-var = "qr"
-
-isimip = "3b"
-
-data = "future"  # else future
-climmodels = ["gfdl-esm2m", "hadgem2-es", "ipsl-cm5a-lr", "miroc5"]
-
-for cl in climmodels:
-    # climate model
-    if isimip == "2b":
-        climmodels = ["gfdl-esm2m", "hadgem2-es", "ipsl-cm5a-lr", "miroc5"]
-        climmodel = "gfdl-esm2m"
-        # climate forcing
-        scenarios = ["rcp26", "rcp60"]
-        scen = "rcp26"
-        wd1 = os.path.join("p:", "ene.model", "NEST", "hydrological_data_agg") + os.sep
-        wd = (
-            os.path.join("p:", "watxene", "ISIMIP", "ISIMIP2b", "output", "LPJmL")
-            + os.sep
-        )
-        wd2 = (
-            os.path.join("p:", "ene.model", "NEST", "hydrology", "processed_nc4")
-            + os.sep
-        )
-    else:
-        climmodels = [
-            "gfdl-esm4",
-            "ipsl-cm6a-lr",
-            "mpi-esm1-2-hr",
-            "mri-esm2-0",
-            "ukesm1-0-ll",
-        ]
-        scenarios = ["ssp126", "ssp370", "ssp585"]
-        scen = "ssp126"
-        wd1 = os.path.join("p:", "ene.model", "NEST", "hydrological_data_agg")
-        wd = (
-            os.path.join(
-                "p:",
-                "watxene",
-                "ISIMIP",
-                "ISIMIP3b",
-                "CWatM_results",
-                f"{cl}",
-                f"{data}",
-            )
-            + os.sep
-        )
-        wd2 = (
-            os.path.join("p:", "ene.model", "NEST", "hydrology", "processed_nc4")
-            + os.sep
-        )
+log = logging.getLogger(__name__)
 
-    # Define if monthly aggregation is required
-    monthlyscale = True
-    # define qauantile for statistical aggregation
-    quant = 0.1
-    # define if multi climate models mean
-    multimodelensemble = True
-    # deinfe lat and long chunk for reducing computational load
-    latchunk = 120
-    lonchunk = 640
-    # Define if use all touched raster
-    all_touched = True
-
-    if var == "dis":
-        # define a spatial method to aggregate
-        spatialmethod = "meansd"
-    else:
-        # define a spatial method to aggregate
-        spatialmethod = "sum"
+#: Variables; for detailed symbols, refer to the ISIMIP documentation.
+VARIABLES = {
+    "qtot": "total runoff",
+    "dis": "discharge",
+    "qg": "groundwater runoff",
+    "qr": "groundwater recharge",
+}
 
-    """
-    The hydrological data can be accessed in watxene p drive. For accessing
-    particular drive, seek permission from Edward Byers (byers@iiasa.ac.at)
-    The files should be copied on to local drive
-    """
+#: Climate models for ISIMIP3b.
+CLIMATE_MODELS = [
+    "gfdl-esm4",
+    "ipsl-cm6a-lr",
+    "mpi-esm1-2-hr",
+    "mri-esm2-0",
+    "ukesm1-0-ll",
+]
 
-    # Open raster area file
-    # The file landareamaskmap0.nc can be found under
-    # P:\ene.model\NEST\delineation\data\delineated_basins_new
-    area = xr.open_dataarray(wd1 + "landareamaskmap0.nc")
+#: Climate forcing scenarios for ISIMIP3b.
+SCENARIOS = ["ssp126", "ssp370", "ssp585"]
 
-    # TO AVOID ERROR WHEN OPENING AND SLICING INPUT DATA - CHECK!
-    dask.config.set({"array.slicing.split-large-chunks": False})
+#: Converts discharge in m³/s into km³/year.
+DIS_FACTOR = 0.031556952
 
-    if data == "historical":
-        hydro_data = wd + f"*{cl}*{var}*monthly*.nc"
-    elif data == "future":
-        hydro_data = wd + f"*{cl}*{scen}*{var}*monthly*.nc"
+#: Converts runoff or recharge in kg/m²/s, times cell area, into km³/year:
+#: 1 kg/m²/s = 86400 mm/day; 86400 mm/day × area (mm²) = 86400 mm³/day =
+#: 86400 × 10⁶ × 3.65e-16 km³/year.
+FLUX_FACTOR = 86400 * 3.65e-16 * 1000000
 
-    files = glob.glob(hydro_data)
-    if var != "qr":
-        # Open hydrological data as a combined dataset
-        da = xr.open_mfdataset(files)
-    else:
-        # Open hydrological data as a combined dataset
-        da = xr.open_mfdataset(files)
 
-        # da.to_netcdf(wd+f'\{var}_memean_{scen}.nc')
+@dataclass
+class Config:
+    """Settings for :func:`aggregate`."""
 
-    if monthlyscale:
-        years = np.arange(2010, 2105, 5)
-    else:
-        years = np.arange(2010, 2105, 5)
-
-    # ds = xr.open_dataset(wd+f'{var}_memean_{scen}.nc')
-    # Resample daily data to monthly by summing daily values
-
-    # if var != "qr"\:
-    #     da = da.resample(time="M").mean()
-    #     # Calculate roolling average of 3 months to make the data consistent
-    #     da = da.rolling(time=3, min_periods=1).mean()
-
-    # da = da.fillna(0)
-
-    # %%
-    if monthlyscale:
-        if var == "dis":
-            # # Converts the discharge  into km3/year
-            da = da * 0.031556952
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # slice is required to reduce the dataset.
-            # da = da.sel(time=slice("2010-01-01", "2050-12-31"))
-
-            da.dis.attrs["unit"] = "km3/year"
-            # chunking reduces computational burden
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # saving the file here and reloading reduces disk space
-            da.to_netcdf(wd2 + f"{var}_monthly__{cl}_{scen}.nc")
-        elif var == "qtot":
-            # da["qtot"] = da.qtot.chunk(
-            #     {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            # )
-            # Filter 5 year interval monthly time step
-            # da = da.sel(time=da.time.dt.year.isin(years))
-            # 1kg/m2/sec = 86400 mm/day
-            # 86400 mm/day X  Area (mm2) = 86400 mm3/day
-            # 86400 mm3/day = 86400 X  1000000 3.65 e-16 km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-
-            # Resample daily data to monthly (by summing daily values)
-            # da = da.resample(time="M").mean()
-
-            # da.rolling(time=12, center=True).construct(
-            #     'tmp').quantile(.1, dim='tmp', skipna=False).dropna(
-            #         'time')
-
-            # da = da.rolling(time=20, min_periods=1).mean()
-            # da["qtot"] = da.qtot.chunk(
-            #     {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            # )
-
-            da.to_netcdf(wd2 + f"{var}_monthly_{cl}_{scen}_{data}.nc")
-        elif var == "qr":
-            # Filter 5 year interval monthly time step
-            # da = da.sel(time=da.time.dt.year.isin(years))
-            # 1kg/m2/sec = 86400 mm/day
-            # 86400 mm/day X  Area (mm2) = 86400 mm3/day
-            # 86400 mm3/day = 86400 X  1000000 3.65 e-16 km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-            da.qr.attrs["unit"] = "km3/year"
-            # da["qr"] = da.qr.chunk(
-            #     {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            # )
-
-            da.to_netcdf(wd2 + f"{var}_monthly_{cl}_{scen}_{data}.nc")
+    #: Directory with the input files, in subdirectories :file:`{model}/{data}/`.
+    input_dir: Path
+
+    #: Directory for the output files.
+    output_dir: Path
+
+    #: Raster of cell areas, for instance :file:`landareamaskmap0.nc`.
+    area: Path
+
+    #: Raster with the same grid as the input data, in which each cell contains the
+    #: 1-based row number of its basin in :func:`.read_basin_delineation`, or 0 or
+    #: NaN for cells outside any basin.
+    basins: Path
+
+    #: Number of basins, i.e. rows in the output.
+    n_basins: int
+
+    models: list[str] = field(default_factory=lambda: list(CLIMATE_MODELS))
+    scenarios: list[str] = field(default_factory=lambda: list(SCENARIOS))
+    variables: list[str] = field(default_factory=lambda: ["qtot", "qr"])
 
+    #: "future" or "historical". Historical input files do not depend on the scenario,
+    #: so they are aggregated once, and only the first of :attr:`scenarios` appears in
+    #: the output file names.
+    data: str = "future"
+
+    #: If :any:`True`, keep monthly values; otherwise aggregate to 5-year means.
+    monthly: bool = True
+
+    #: Number of time steps read and aggregated at once. Together with the grid
+    #: size, this bounds the memory used by each task.
+    time_chunk: int = 120
+
+    #: Number of dask workers. If :mod:`dask.distributed` is installed, a local
+    #: cluster with this many single-threaded worker processes is used; otherwise
+    #: the threaded scheduler.
+    n_workers: Optional[int] = None
+
+    #: Memory limit for each worker of the local cluster.
+    memory_limit: str = "4GiB"
+
+    def output_path(self, model: str, scenario: str, variable: str) -> Path:
+        """Path of the output file for one model, scenario, and variable."""
+        freq = "monthly" if self.monthly else "5y"
+        return self.output_dir.joinpath(
+            f"{variable}_{freq}_{model}_{scenario}_{self.data}.csv"
+        )
+
+    def input_files(self, model: str, scenario: str, variable: str) -> list[Path]:
+        """Input files for one model, scenario, and variable."""
+        pattern = (
+            f"*{model}*{variable}*monthly*.nc"
+            if self.data == "historical"
+            else f"*{model}*{scenario}*{variable}*monthly*.nc"
+        )
+        return sorted(self.input_dir.joinpath(model, self.data).glob(pattern))
+
+
+def basin_weights(
+    basins: xr.DataArray, n_basins: int, mean: bool = False
+) -> sparse.csr_matrix:
+    """Return a sparse matrix that aggregates raster cells to basins.
+
+    Parameters
+    ----------
+    basins :
+        Raster with dimensions (lat, lon), containing 1-based basin numbers.
+    mean :
+        If :any:`True`, each row is normalized to sum to 1, so that the matrix
+        computes basin means; otherwise, basin sums.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        with shape (`n_basins`, number of cells). Cells are in the order of
+        :py:`basins.transpose("lat", "lon")`, flattened.
+    """
+    ids = basins.transpose("lat", "lon").fillna(0).values.ravel().astype(int)
+    cells = np.flatnonzero(ids > 0)
+    w = sparse.csr_matrix(
+        (np.ones(len(cells)), (ids[cells] - 1, cells)), shape=(n_basins, ids.size)
+    )
+    if mean:
+        w = sparse.diags(1.0 / np.maximum(w.sum(axis=1).A1, 1)) @ w
+    return w.tocsr()
+
+
+def _apply_weights(
+    block: np.ndarray, weights: sparse.csr_matrix, mean: bool = False
+) -> np.ndarray:
+    """Aggregate one block (time, lat, lon) of data to (time, basin).
+
+    If `mean` is :any:`True`, the result is divided by the weights of the cells that
+    are not NaN, so that these are excluded from the mean.
+    """
+    values = block.reshape(block.shape[0], -1)
+    finite = np.isfinite(values)
+    result = np.asarray(weights @ np.where(finite, values, 0.0).T)
+    if mean:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = result / np.asarray(weights @ finite.T.astype(float))
+    return result.T
+
+
+def aggregate_space(
+    da: xr.DataArray, weights: sparse.csr_matrix, time_chunk: int, mean: bool = False
+) -> xr.DataArray:
+    """Aggregate `da` (time, lat, lon) to (time, basin) using `weights`.
+
+    The computation is lazy and proceeds in blocks of `time_chunk` time steps, each
+    covering the whole grid. Missing values count as zero in sums. If `mean` is
+    :any:`True`—for `weights` from :py:`basin_weights(…, mean=True)`—missing values
+    are excluded from the mean of each basin; it is NaN if all are missing.
+    """
+    import dask.array
+
+    data = da.transpose("time", "lat", "lon").data
+    if not isinstance(data, dask.array.Array):
+        data = dask.array.from_array(data)
+    data = data.rechunk({0: time_chunk, 1: -1, 2: -1})
+
+    result = data.map_blocks(
+        _apply_weights,
+        weights,
+        mean,
+        drop_axis=2,
+        chunks=(data.chunks[0], (weights.shape[0],)),
+        dtype=float,
+    )
+    return xr.DataArray(
+        result, coords={"time": da["time"]}, dims=("time", "basin"), name=da.name
+    )
+
+
+def aggregate_time(da: xr.DataArray, variable: str) -> xr.DataArray:
+    """Aggregate monthly `da` to 5-year means of 20-year rolling annual means.
+
+    Labels are the last day of each 5-year period, offset by 4 years.
+    """
+    da = da.resample(time="YE").mean()
+    da = da.rolling(time=20, min_periods=None if variable == "dis" else 1).mean()
+    da = da.resample(time="5YE").mean()
+    return da.assign_coords(time=da.indexes["time"] + pd.offsets.YearEnd(4))
+
+
+def open_variable(
+    config: Config, model: str, scenario: str, variable: str, area: xr.DataArray
+) -> xr.DataArray:
+    """Open the data for one model, scenario, and variable, converted to km³/year."""
+    files = config.input_files(model, scenario, variable)
+    if not files:
+        raise FileNotFoundError(
+            f"No input for {model}, {scenario}, {variable} in {config.input_dir}"
+        )
+    da = xr.open_mfdataset(
+        files, chunks={"time": config.time_chunk, "lat": -1, "lon": -1}
+    )[variable]
+    if variable == "dis":
+        return da * DIS_FACTOR
     else:
-        if var == "dis":
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # Resample daily data to monthly (by summing daily values)
-            da = da.resample(time="Y").mean()
-
-            da["dis"] = da.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.dis.time)}
-            )
-            # Take 20 year rolling average to make the time scale cosnistent
-            da = da.rolling(time=20).mean()
-
-            # Converts the discharge  into km3/year
-            da = da * 0.031556952
-            da.dis.attrs["unit"] = "km3/year"
-            # Long term Mean annual  discharge
-            davg = da.resample(time="30Y", loffset="4Y").mean()
-            davg["dis"] = davg.dis.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(davg.dis.time)}
-            )
-            davg.to_netcdf(wd2 + f"{var}_90Y_avg_5y__{climmodel}_{scen}_temp_agg.nc")
-
-            # Now resample to an average value for each 5-year block, and
-            # offset by 2 years so that the value is centred to start 2101
-            da = da.resample(time="5Y", loffset="4Y").mean()
-
-            da.to_netcdf(wd2 + f"{var}_5y__{climmodel}_{scen}_temp_agg.nc")
-            # read in saved data again to further process
-            da = xr.open_dataset(wd2 + f"{var}_5y__{climmodel}_{scen}_temp_agg.nc")
-
-        elif var == "qtot":
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-            # Resample daily data to monthly (by summing daily values)
-            da = da.resample(time="Y").mean()
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-            da = da.rolling(time=20, min_periods=1).mean()
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-            # Converts to total runoff per gs into km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-            da.qtot.attrs["unit"] = "km3/year"
-            da["qtot"] = da.qtot.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qtot.time)}
-            )
-
-            # Calculate roolling average of 20 years to make the data consistent
-            # da = da.rolling(time = 20).mean()
-            # Now resample to an average value for each 5-year block
-            da = da.resample(time="5Y", loffset="4Y").mean()
-            da.to_netcdf(wd2 + f"{var}_monthly__{climmodel}_{scen}_temp_agg.nc")
-            # read in saved data again to further process
-            # da = xr.\
-            #    open_dataset( wd2+f'\output\{var}_5y__{climmodel}_{scen}_temp_agg.nc')
-            # da['qtot'] = da.qtot.chunk({'lat': latchunk, 'lon': lonchunk,\
-            #                                    'time': len(da.qtot.time)})
-
-        elif var == "qr":
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-            # Resample daily data to monthly (by summing daily values)
-            da = da.resample(time="Y").mean()
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-            da = da.rolling(time=20, min_periods=1).mean()
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-            # TODO check unit
-            # 1kg/m2/sec = 86400 mm/day
-            # 86400 mm/day X  Area (mm2) = 86400 mm3/day
-            # 86400 mm3/day = 86400 X  1000000 3.65 e-16 km3/year
-            da = da * 86400 * area * 3.65e-16 * 1000000
-            da.qr.attrs["unit"] = "km3/year"
-            da["qr"] = da.qr.chunk(
-                {"lat": latchunk, "lon": lonchunk, "time": len(da.qr.time)}
-            )
-
-            # Calculate roolling average of 20 years to make the data consistent
-            # da = da.rolling(time = 3).mean()
-            # Now resample to an average value for each 5-year block
-            da = da.resample(time="5Y", loffset="4Y").mean()
-
-            da.to_netcdf(wd2 + f"{var}_5y__{climmodel}_{scen}.nc")
+        return da * area * FLUX_FACTOR
+
+
+@contextmanager
+def _client(config: Config) -> Iterator:
+    """Yield a :class:`dask.distributed.Client` for a local cluster, or :any:`None`."""
+    import dask
+
+    if not config.n_workers:
+        yield None
+        return
+
+    try:
+        from dask.distributed import Client, LocalCluster
+    except ImportError:
+        log.info(f"dask.distributed not available; use {config.n_workers} threads")
+        with dask.config.set(scheduler="threads", num_workers=config.n_workers):
+            yield None
+        return
+
+    with LocalCluster(
+        n_workers=config.n_workers,
+        threads_per_worker=1,
+        memory_limit=config.memory_limit,
+    ) as cluster:
+        with Client(cluster) as client:
+            log.info(f"Dashboard: {client.dashboard_link}")
+            yield client
+
+
+def _write(da: xr.DataArray, path: Path) -> None:
+    """Write basin-level results with one row per basin and one column per date."""
+    df = da.to_pandas().T
+    df.columns = pd.DatetimeIndex(df.columns).strftime("%Y-%m-%d")
+    tmp = path.with_suffix(".tmp")
+    df.to_csv(tmp)
+    tmp.replace(path)
+    log.info(f"Wrote {path}")
+
+
+def aggregate(config: Config) -> list[Path]:
+    """Aggregate gridded hydrological data to basins.
+
+    The basin weights are computed once and used for every climate model, scenario,
+    and variable. Each output file is written as soon as its data are computed;
+    files that already exist are skipped, so an interrupted run can be resumed.
+
+    Returns
+    -------
+    list of Path
+        Output files that were written.
+    """
+    area = xr.open_dataarray(config.area)
+    basins = xr.open_dataarray(config.basins)
+    weights = {
+        mean: basin_weights(basins, config.n_basins, mean=mean)
+        for mean in (False, True)
+    }
+
+    # Same input files for every scenario; see Config.data
+    scenarios = (
+        config.scenarios[:1] if config.data == "historical" else config.scenarios
+    )
+
+    # Lazy results for each output file
+    jobs = {}
+    for model, scenario, variable in product(
+        config.models, scenarios, config.variables
+    ):
+        path = config.output_path(model, scenario, variable)
+        if path.exists():
+            log.info(f"Skip existing {path}")
+            continue
+        # Mean discharge; total runoff and recharge
+        mean = variable == "dis"
+        da = aggregate_space(
+            open_variable(config, model, scenario, variable, area),
+            weights[mean],
+            config.time_chunk,
+            mean,
+        )
+        jobs[path] = da if config.monthly else aggregate_time(da, variable)
+
+    config.output_dir.mkdir(parents=True, exist_ok=True)
+
+    with _client(config) as client:
+        if client is None:
+            for path, da in jobs.items():
+                _write(da.compute(), path)
+        else:
+            from dask.distributed import as_completed
+
+            futures = dict(zip(client.compute(list(jobs.values())), jobs))
+            for future, da in as_completed(futures, with_results=True):
+                _write(da, futures[future])
+
+    return list(jobs)
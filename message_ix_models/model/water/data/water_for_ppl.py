@@ -10,6 +10,7 @@ from message_ix import make_df
 
 from message_ix_models import Context
 from message_ix_models.model.water.data.water_supply import map_basin_region_wat
+from message_ix_models.model.water.utils import read_basin_delineation, read_data_csv
 from message_ix_models.util import (
     broadcast,
     make_matched_dfs,
@@ -21,44 +22,53 @@ from message_ix_models.util import (
 log = logging.getLogger(__name__)
 
 
-def missing_tech(x: pd.Series) -> pd.Series:
+#: Input values for parent technologies that have no input data. Keys are matched, in
+#: this order, as substrings of technology names.
+MISSING_TECH = {
+    "geo_hpl": 1 / 0.850,
+    "geo_ppl": 1 / 0.385,
+    "gas_hpl": 1 / 0.3,
+    "foil_hpl": 1 / 0.25,
+    "nuc_hc": 1 / 0.326,
+    "nuc_lc": 1 / 0.326,
+    "solar_th_ppl": 1 / 0.385,
+    "csp_sm1_res": 1 / 0.385,
+    "csp_sm3_res": 1 / 0.385,
+}
+
+#: Years from which historical (2015) input of cooling technologies is filled, in order
+#: of preference, where a parent technology has no input for 2015.
+HIST_YEARS = [2020, 2010, 2030, 2050, 2000, 2080, 1990]
+
+
+def missing_tech(df: pd.DataFrame) -> pd.DataFrame:
     """Assign values to missing data.
-    It goes through the input data frame and extract the technologies which
-    don't have input values and then assign manual  values to those technologies
-    along with assigning them an arbitrary level i.e dummy supply
+
+    For technologies in `df` matching any key of :data:`MISSING_TECH`, the "value" is
+    replaced with the corresponding value (or kept, if it is below 1 but larger), and
+    the level "cooling" is replaced with an arbitrary level, "dummy_supply".
+
+    Returns
+    -------
+    pandas.DataFrame
+        with columns "value" and "level", and the same index as `df`.
     """
-    data_dic = {
-        "geo_hpl": 1 / 0.850,
-        "geo_ppl": 1 / 0.385,
-        "gas_hpl": 1 / 0.3,
-        "foil_hpl": 1 / 0.25,
-        "nuc_hc": 1 / 0.326,
-        "nuc_lc": 1 / 0.326,
-        "solar_th_ppl": 1 / 0.385,
-        "csp_sm1_res": 1 / 0.385,
-        "csp_sm3_res": 1 / 0.385,
-    }
-
-    if pd.notna(x["technology"]):
-        # Find a matching key in `data_dic` using substring matching
-        matched_key = next((key for key in data_dic if key in x["technology"]), None)
-
-        if matched_key:
-            value = data_dic[matched_key]
-            if x["value"] < 1:
-                value = max(x["value"], value)
-            # for backwards compatibility
-            return (
-                pd.Series({"value": value, "level": "dummy_supply"})
-                if x["level"] == "cooling"
-                else pd.Series({"value": value, "level": x["level"]})
-            )
+    # Value for the first matching key; reverse order so earlier keys take precedence
+    fill = pd.Series(np.nan, index=df.index)
+    for key, value in reversed(MISSING_TECH.items()):
+        match = df["technology"].str.contains(key, regex=False, na=False)
+        fill = fill.mask(match, value)
+    matched = fill.notna()
+
+    value = df["value"].astype(float)
+    value = value.where(~matched, fill.where(~(value < 1), np.maximum(value, fill)))
+    # for backwards compatibility
+    level = df["level"].mask(matched & (df["level"] == "cooling"), "dummy_supply")
 
-    # Return the original values if no match is found
-    return pd.Series({"value": x["value"], "level": x["level"]})
+    return pd.DataFrame({"value": value, "level": level})
 
 
-def cooling_fr(x: pd.Series) -> float:
+def cooling_fr(df: pd.DataFrame) -> pd.Series:
     """Calculate cooling fraction
 
     Returns
@@ -73,63 +83,108 @@ def cooling_fr(x: pd.Series) -> float:
         where:
             h_fg (flue gasses losses) = 0.1 (10% assumed losses)
     """
-    try:
-        if "hpl" in x["parent_tech"]:
-            return x["value"] - 1
-        else:
-            return x["value"] - (x["value"] * 0.1) - 1
-    except KeyError:
-        return x["value"] - (x["value"] * 0.1) - 1
+    hpl = (
+        df["parent_tech"].str.contains("hpl", regex=False, na=False)
+        if "parent_tech" in df.columns
+        else False
+    )
+    value = df["value"]
+    return pd.Series(
+        np.where(hpl, value - 1, value - (value * 0.1) - 1), index=df.index
+    )
 
 
 def shares(
-    x: pd.Series,
+    cost: pd.DataFrame,
     context: "Context",
     search_cols_cooling_fraction: list,
     hold_df: pd.DataFrame,
     search_cols: list,
-) -> pd.Series:
+) -> pd.DataFrame:
     """Process share and cooling fraction.
 
     Returns
     -------
     Product of value of shares of cooling technology types of regions with
-    corresponding cooling fraction
+    corresponding cooling fraction. The first cooling fraction in `hold_df` for each
+    node and technology is used, or 0 if there is none.
     """
-    for col in search_cols_cooling_fraction:
-        col2 = context.map_ISO_c[col] if context.type_reg == "country" else col
-
-        # Filter the cooling fraction
-        cooling_fraction = hold_df[
-            (hold_df["node_loc"] == col2)
-            & (hold_df["technology_name"] == x["technology"])
-        ]["cooling_fraction"]
-
-        # Log unmatched rows
-        if cooling_fraction.empty:
-            log.info(
-                f"No cooling_fraction found for node_loc: {col2}, "
-                f"technology: {x['technology']}"
-            )
-            cooling_fraction = pd.Series([0])
-
-        # Ensure the Series is not empty before accessing its first element
-        # # Default to 0 if cooling_fraction is empty
-        x[col] = (
-            x[col] * cooling_fraction.iloc[0]
-            if not cooling_fraction.empty
-            else x[col] * 0
+    nodes = [
+        context.map_ISO_c[col] if context.type_reg == "country" else col
+        for col in search_cols_cooling_fraction
+    ]
+
+    # Cooling fractions with dimensions (technology, node)
+    first = hold_df.drop_duplicates(["technology_name", "node_loc"]).set_index(
+        ["technology_name", "node_loc"]
+    )["cooling_fraction"]
+    found = (
+        pd.Series(True, index=first.index)
+        .unstack(fill_value=False)
+        .reindex(index=cost["technology"], columns=nodes, fill_value=False)
+    )
+    cooling_fraction = (
+        first.unstack().reindex(index=cost["technology"], columns=nodes).where(found, 0)
+    )
+
+    # Log unmatched combinations
+    if not found.all(axis=None):
+        missing = found.stack()[lambda s: ~s].index.tolist()
+        log.info(
+            f"No cooling_fraction found for {len(missing)} (technology, node_loc); "
+            f"use 0 for: {missing}"
         )
 
-    # Construct the output
-    results = []
-    for i in x:
-        if isinstance(i, str):
-            results.append(i)
-        else:
-            results.append(float(i) if not isinstance(i, pd.Series) else i.iloc[0])
+    result = cost[search_cols].copy()
+    result[search_cols_cooling_fraction] = (
+        cost[search_cols_cooling_fraction].astype(float).to_numpy()
+        * cooling_fraction.to_numpy()
+    )
+    return result
+
 
-    return pd.Series(results, index=search_cols)
+def hist_input_cool(input_cool: pd.DataFrame) -> pd.DataFrame:
+    """Return data from `input_cool` to use for the historical year 2015.
+
+    For each combination of parent technology and node without data for
+    year_vtg = year_act = 2015, data for the first of :data:`HIST_YEARS` that has any
+    are used instead.
+    """
+    key = ["parent_tech", "node_loc"]
+    same = input_cool["year_act"] == input_cool["year_vtg"]
+    result = input_cool[same & (input_cool["year_act"] == 2015)]
+
+    # Candidates for combinations that are missing from `result`
+    missing = (
+        input_cool[key]
+        .merge(result[key].drop_duplicates(), how="left", indicator=True)["_merge"]
+        .eq("left_only")
+        .to_numpy()
+    )
+    rank = input_cool["year_act"].map({y: i for i, y in enumerate(HIST_YEARS)})
+    fill = input_cool.assign(_rank=rank)[missing & same & rank.notna()]
+    # Use only the most preferred year for each combination
+    fill = fill[
+        fill["_rank"] == fill.groupby(key, dropna=False)["_rank"].transform("min")
+    ]
+    fill = (
+        fill.sort_values("_rank", kind="stable")
+        .drop(columns="_rank")
+        .assign(year_act=2015, year_vtg=2015)
+    )
+    result = pd.concat([result, fill], ignore_index=True)
+
+    # Final check if there are still missing combinations
+    still_missing = set(zip(input_cool["parent_tech"], input_cool["node_loc"])) - set(
+        zip(result["parent_tech"], result["node_loc"])
+    )
+    if still_missing:
+        log.warning(
+            f"Warning: Some combinations are still missing even after trying all "
+            f"years: {still_missing}"
+        )
+
+    return result
 
 
 def apply_act_cap_multiplier(
@@ -191,7 +246,6 @@ def apply_act_cap_multiplier(
     )
 
     if missing_values.any():
-        print("diobo")
         log.warning(
             f"Missing or empty values found in {param_name}.head(1):\n"
             f"{df[missing_values].head(1)}"
@@ -307,28 +361,18 @@ def _compose_capacity_factor(inp: pd.DataFrame, context: "Context") -> pd.DataFr
         )
         df_impact = pd.read_excel(path, sheet_name=f"{context.regions}_{context.RCP}")
 
-        for n in df_impact["node"]:
-            conditions = [
-                df["technology"].str.contains("fresh")
-                & (df["year_act"] >= 2025)
-                & (df["year_act"] < 2050)
-                & (df["node_loc"] == n),
-                df["technology"].str.contains("fresh")
-                & (df["year_act"] >= 2050)
-                & (df["year_act"] < 2070)
-                & (df["node_loc"] == n),
-                df["technology"].str.contains("fresh")
-                & (df["year_act"] >= 2070)
-                & (df["node_loc"] == n),
-            ]
-
-            choices = [
-                df_impact[(df_impact["node"] == n)]["2025s"],
-                df_impact[(df_impact["node"] == n)]["2050s"],
-                df_impact[(df_impact["node"] == n)]["2070s"],
-            ]
-
-            df["value"] = np.select(conditions, choices, default=df["value"])
+        impact = df_impact.set_index("node")
+        df["value"] = df["value"].astype(float)
+        fresh = df["technology"].str.contains("fresh") & df["node_loc"].isin(
+            impact.index
+        )
+        for col, (start, end) in {
+            "2025s": (2025, 2050),
+            "2050s": (2050, 2070),
+            "2070s": (2070, np.inf),
+        }.items():
+            mask = fresh & (df["year_act"] >= start) & (df["year_act"] < end)
+            df.loc[mask, "value"] = df.loc[mask, "node_loc"].map(impact[col])
 
     return df
 
@@ -376,10 +420,7 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
     sub_time = context.time
 
     # reading basin_delineation
-    FILE2 = f"basins_by_region_simpl_{context.regions}.csv"
-    PATH = package_data_path("water", "delineation", FILE2)
-
-    df_node = pd.read_csv(PATH)
+    df_node = read_basin_delineation(context)
     # Assigning proper nomenclature
     df_node["node"] = "B" + df_node["BCU_name"].astype(str)
     df_node["mode"] = "M" + df_node["BCU_name"].astype(str)
@@ -391,16 +432,11 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
 
     node_region = df_node["region"].unique()
     # reading ppl cooling tech dataframe
-    path = package_data_path("water", "ppl_cooling_tech", FILE)
-    df = pd.read_csv(path)
+    df = read_data_csv("ppl_cooling_tech", FILE)
     cooling_df = df.loc[df["technology_group"] == "cooling"].copy()
     # Separate a column for parent technologies of respective cooling
     # techs
-    cooling_df["parent_tech"] = (
-        cooling_df["technology_name"]
-        .apply(lambda x: pd.Series(str(x).split("__")))
-        .drop(columns=1)
-    )
+    cooling_df["parent_tech"] = cooling_df["technology_name"].str.split("__").str[0]
 
     scen = context.get_scenario()
 
@@ -417,7 +453,7 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
     # merge ref_input and ref_output
     ref_input = pd.concat([ref_input, ref_output])
 
-    ref_input[["value", "level"]] = ref_input.apply(missing_tech, axis=1)
+    ref_input[["value", "level"]] = missing_tech(ref_input).to_numpy()
 
     # Combines the input df of parent_tech with water withdrawal data
     input_cool = (
@@ -449,7 +485,7 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
         input_cool["node_origin"] == f"{context.regions}_GLB", "node_origin"
     ] = input_cool["node_loc"]
 
-    input_cool["cooling_fraction"] = input_cool.apply(cooling_fr, axis=1)
+    input_cool["cooling_fraction"] = cooling_fr(input_cool)
 
     # Converting water withdrawal units to MCM/GWa
     # this refers to activity per cooling requirement (heat)
@@ -613,33 +649,32 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
     )
     df_sw["time_dest"] = df_sw["time_dest"].astype(str)
     if context.nexus_set == "nexus":
-        for nn in icmse_df.node_loc.unique():
-            # input cooling fresh basin
-            icfb_df = icmse_df[icmse_df["node_loc"] == nn]
-            bs = list(df_node[df_node["region"] == nn]["node"])
-
-            out_t = (
-                make_df(
-                    "output",
-                    node_loc=icfb_df["node_loc"],
-                    technology=icfb_df["technology_name"],
-                    year_vtg=icfb_df["year_vtg"],
-                    year_act=icfb_df["year_act"],
-                    mode=icfb_df["mode"],
-                    # node_origin=icmse_df["node_origin"],
-                    commodity="surfacewater_basin",
-                    level="water_avail_basin",
-                    time="year",
-                    value=icfb_df["value_return"],
-                    unit="MCM/GWa",
-                )
-                .pipe(broadcast, node_dest=bs, time_dest=sub_time)
-                .merge(df_sw, how="left")
+        # Input cooling fresh, for each basin of the respective region
+        out_t = (
+            make_df(
+                "output",
+                node_loc=icmse_df["node_loc"],
+                technology=icmse_df["technology_name"],
+                year_vtg=icmse_df["year_vtg"],
+                year_act=icmse_df["year_act"],
+                mode=icmse_df["mode"],
+                commodity="surfacewater_basin",
+                level="water_avail_basin",
+                time="year",
+                value=icmse_df["value_return"],
+                unit="MCM/GWa",
+            )
+            .drop(columns="node_dest")
+            .merge(
+                df_node[["region", "node"]].set_axis(["node_loc", "node_dest"], axis=1),
+                on="node_loc",
             )
-            # multiply by basin water availability share
-            out_t["value"] = out_t["value"] * out_t["share"]
-            out_t.drop(columns={"share"}, inplace=True)
-            out = pd.concat([out, out_t])
+            .pipe(broadcast, time_dest=sub_time)
+            .merge(df_sw, how="left")
+        )
+        # multiply by basin water availability share
+        out_t["value"] = out_t["value"] * out_t["share"]
+        out = pd.concat([out, out_t[out.columns]])
 
         out = out.dropna(subset=["value"])
         out.reset_index(drop=True, inplace=True)
@@ -647,8 +682,7 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
     results["output"] = out
 
     # costs and historical parameters
-    path1 = package_data_path("water", "ppl_cooling_tech", FILE1)
-    cost = pd.read_csv(path1)
+    cost = read_data_csv("ppl_cooling_tech", FILE1)
     # Combine technology name to get full cooling tech names
     cost["technology"] = cost["utype"] + "__" + cost["cooling"]
     cost["share"] = cost["utype"] + "_" + cost["cooling"]
@@ -704,58 +738,8 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
     # append share_calib and (share_fut only to add constraints on ot_saline)
     results["share_commodity_up"] = pd.concat([share_calib])
 
-    # Filtering out 2015 data to use for historical values
-    input_cool_2015 = input_cool[
-        (input_cool["year_act"] == 2015) & (input_cool["year_vtg"] == 2015)
-    ]
-    # set of parent_tech and node_loc for input_cool
-    input_cool_set = set(zip(input_cool["parent_tech"], input_cool["node_loc"]))
-    year_list = [2020, 2010, 2030, 2050, 2000, 2080, 1990]
-
-    for year in year_list:
-        log.debug(f"cool_tech() for year '{year}'")
-        # Identify missing combinations in the current aggregate
-        input_cool_2015_set = set(
-            zip(input_cool_2015["parent_tech"], input_cool_2015["node_loc"])
-        )
-        missing_combinations = input_cool_set - input_cool_2015_set
-
-        if not missing_combinations:
-            break  # Stop if no missing combinations remain
-
-        # Extract missing rows from input_cool with the current year
-        missing_rows = input_cool[
-            (input_cool["year_act"] == year)
-            & (input_cool["year_vtg"] == year)
-            & input_cool.apply(
-                lambda row: (row["parent_tech"], row["node_loc"])
-                in missing_combinations,
-                axis=1,
-            )
-        ]
-
-        if not missing_rows.empty:
-            # Modify year columns to 2015
-            missing_rows = missing_rows.copy()
-            missing_rows["year_act"] = 2015
-            missing_rows["year_vtg"] = 2015
-
-            # Append to the aggregated dataset
-            input_cool_2015 = pd.concat(
-                [input_cool_2015, missing_rows], ignore_index=True
-            )
-
-    # Final check if there are still missing combinations
-    input_cool_2015_set = set(
-        zip(input_cool_2015["parent_tech"], input_cool_2015["node_loc"])
-    )
-    still_missing = input_cool_set - input_cool_2015_set
-
-    if still_missing:
-        log.warning(
-            f"Warning: Some combinations are still missing even after trying all "
-            f"years: {still_missing}"
-        )
+    # Data to use for historical values
+    input_cool_2015 = hist_input_cool(input_cool)
 
     # Filter out columns that contain 'mix' in column name
     # Rename column names to match with the previous df
@@ -772,9 +756,8 @@ def cool_tech(context: "Context") -> dict[str, pd.DataFrame]:
         col for col in search_cols if col not in ["technology", "utype"]
     ]
     # multiplication factor with cooling factor and shares
-    hold_cost = cost[search_cols].apply(
-        shares,
-        axis=1,
+    hold_cost = shares(
+        cost,
         context=context,
         search_cols_cooling_fraction=search_cols_cooling_fraction,
         hold_df=hold_df,
@@ -996,17 +979,12 @@ def non_cooling_tec(context: "Context") -> dict[str, pd.DataFrame]:
     results = {}
 
     FILE = "tech_water_performance_ssp_msg.csv"
-    path = package_data_path("water", "ppl_cooling_tech", FILE)
-    df = pd.read_csv(path)
+    df = read_data_csv("ppl_cooling_tech", FILE)
     cooling_df = df.copy()
     cooling_df = cooling_df.loc[cooling_df["technology_group"] == "cooling"]
     # Separate a column for parent technologies of respective cooling
     # techs
-    cooling_df["parent_tech"] = (
-        cooling_df["technology_name"]
-        .apply(lambda x: pd.Series(str(x).split("__")))
-        .drop(columns=1)
-    )
+    cooling_df["parent_tech"] = cooling_df["technology_name"].str.split("__").str[0]
     non_cool_df = df[
         (df["technology_group"] != "cooling")
         & (df["water_supply_type"] == "freshwater_supply")
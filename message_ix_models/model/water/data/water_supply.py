@@ -6,11 +6,15 @@ from message_ix import Scenario, make_df
 
 from message_ix_models import Context
 from message_ix_models.model.water.data.demands import read_water_availability
-from message_ix_models.model.water.utils import map_yv_ya_lt
+from message_ix_models.model.water.utils import (
+    map_yv_ya_lt,
+    read_basin_delineation,
+    read_data_csv,
+    read_hydrology,
+)
 from message_ix_models.util import (
     broadcast,
     minimum_version,
-    package_data_path,
     same_node,
     same_time,
 )
@@ -32,92 +36,36 @@ def map_basin_region_wat(context: "Context") -> pd.DataFrame:
         data : pandas.DataFrame
     """
     info = context["water build info"]
+    annual = "year" in context.time
 
-    if "year" in context.time:
-        PATH = package_data_path(
-            "water", "delineation", f"basins_by_region_simpl_{context.regions}.csv"
-        )
-        df_x = pd.read_csv(PATH)
-        # Adding freshwater supply constraints
-        # Reading data, the data is spatially and temprally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"qtot_5y_{context.RCP}_{context.REL}_{context.regions}.csv",
-        )
-
-        df_sw = pd.read_csv(path1)
-        df_sw.drop(["Unnamed: 0"], axis=1, inplace=True)
-
-        # Reading data, the data is spatially and temporally aggregated from GHMs
-        df_sw["BCU_name"] = df_x["BCU_name"]
-        df_sw["MSGREG"] = (
-            context.map_ISO_c[context.regions]
-            if context.type_reg == "country"
-            else f"{context.regions}_" + df_sw["BCU_name"].str.split("|").str[-1]
-        )
-
-        df_sw = df_sw.set_index(["MSGREG", "BCU_name"])
-
-        # Calculating ratio of water availability in basin by region
-        df_sw = df_sw.groupby(["MSGREG"]).apply(lambda x: x / x.sum())
-        df_sw.reset_index(level=0, drop=True, inplace=True)
-        df_sw.reset_index(inplace=True)
-        df_sw["Region"] = "B" + df_sw["BCU_name"].astype(str)
-        df_sw["Mode"] = df_sw["Region"].replace(regex=["^B"], value="M")
-        df_sw.drop(columns=["BCU_name"], inplace=True)
-        df_sw.set_index(["MSGREG", "Region", "Mode"], inplace=True)
-        df_sw = df_sw.stack().reset_index(level=0).reset_index()
-        df_sw.columns = pd.Index(["region", "mode", "date", "MSGREG", "share"])
-        df_sw.sort_values(["region", "date", "MSGREG", "share"], inplace=True)
-        df_sw["year"] = pd.DatetimeIndex(df_sw["date"]).year
-        df_sw["time"] = "year"
-        df_sw = df_sw[df_sw["year"].isin(info.Y)]
-        df_sw.reset_index(drop=True, inplace=True)
-
-    else:
-        # add water return flows for cooling tecs
-        # Use share of basin availability to distribute the return flow from
-        path3 = package_data_path(
-            "water",
-            "availability",
-            f"qtot_5y_m_{context.RCP}_{context.REL}_{context.regions}.csv",
-        )
-        df_sw = pd.read_csv(path3)
-
-        # reading sample for assiging basins
-        PATH = package_data_path(
-            "water", "delineation", f"basins_by_region_simpl_{context.regions}.csv"
-        )
-        df_x = pd.read_csv(PATH)
-
-        # Reading data, the data is spatially and temporally aggregated from GHMs
-        df_sw["BCU_name"] = df_x["BCU_name"]
+    # Reading data, the data is spatially and temporally aggregated from GHMs
+    df_sw = read_hydrology(context, "qtot")
 
-        df_sw["MSGREG"] = (
-            context.map_ISO_c[context.regions]
-            if context.type_reg == "country"
-            else f"{context.regions}_" + df_sw["BCU_name"].str.split("|").str[-1]
-        )
+    # Basin for each row
+    df_sw["BCU_name"] = read_basin_delineation(context)["BCU_name"]
+    df_sw["MSGREG"] = (
+        context.map_ISO_c[context.regions]
+        if context.type_reg == "country"
+        else f"{context.regions}_" + df_sw["BCU_name"].str.split("|").str[-1]
+    )
 
-        df_sw = df_sw.set_index(["MSGREG", "BCU_name"])
-        df_sw.drop(columns="Unnamed: 0", inplace=True)
-
-        # Calculating ratio of water availability in basin by region
-        df_sw = df_sw.groupby(["MSGREG"]).apply(lambda x: x / x.sum())
-        df_sw.reset_index(level=0, drop=True, inplace=True)
-        df_sw.reset_index(inplace=True)
-        df_sw["Region"] = "B" + df_sw["BCU_name"].astype(str)
-        df_sw["Mode"] = df_sw["Region"].replace(regex=["^B"], value="M")
-        df_sw.drop(columns=["BCU_name"], inplace=True)
-        df_sw.set_index(["MSGREG", "Region", "Mode"], inplace=True)
-        df_sw = df_sw.stack().reset_index(level=0).reset_index()
-        df_sw.columns = pd.Index(["node", "mode", "date", "MSGREG", "share"])
-        df_sw.sort_values(["node", "date", "MSGREG", "share"], inplace=True)
-        df_sw["year"] = pd.DatetimeIndex(df_sw["date"]).year
-        df_sw["time"] = pd.DatetimeIndex(df_sw["date"]).month
-        df_sw = df_sw[df_sw["year"].isin(info.Y)]
-        df_sw.reset_index(drop=True, inplace=True)
+    df_sw = df_sw.set_index(["MSGREG", "BCU_name"])
+
+    # Calculating ratio of water availability in basin by region
+    df_sw = df_sw / df_sw.groupby(level="MSGREG").transform("sum")
+    df_sw.reset_index(inplace=True)
+    df_sw["Region"] = "B" + df_sw["BCU_name"].astype(str)
+    df_sw["Mode"] = df_sw["Region"].replace(regex=["^B"], value="M")
+    df_sw.drop(columns=["BCU_name"], inplace=True)
+    df_sw.set_index(["MSGREG", "Region", "Mode"], inplace=True)
+    df_sw = df_sw.stack().reset_index(level=0).reset_index()
+    node = "region" if annual else "node"
+    df_sw.columns = pd.Index([node, "mode", "date", "MSGREG", "share"])
+    df_sw.sort_values([node, "date", "MSGREG", "share"], inplace=True)
+    df_sw["year"] = pd.DatetimeIndex(df_sw["date"]).year
+    df_sw["time"] = "year" if annual else pd.DatetimeIndex(df_sw["date"]).month
+    df_sw = df_sw[df_sw["year"].isin(info.Y)]
+    df_sw.reset_index(drop=True, inplace=True)
 
     return df_sw
 
@@ -161,10 +109,7 @@ def add_water_supply(context: "Context") -> dict[str, pd.DataFrame]:
     print(" year_wat = ", year_wat)
 
     # reading basin_delineation
-    FILE = f"basins_by_region_simpl_{context.regions}.csv"
-    PATH = package_data_path("water", "delineation", FILE)
-
-    df_node = pd.read_csv(PATH)
+    df_node = read_basin_delineation(context)
     # Assigning proper nomenclature
     df_node["node"] = "B" + df_node["BCU_name"].astype(str)
     df_node["mode"] = "M" + df_node["BCU_name"].astype(str)
@@ -179,8 +124,7 @@ def add_water_supply(context: "Context") -> dict[str, pd.DataFrame]:
 
     # reading groundwater energy intensity data
     FILE1 = f"gw_energy_intensity_depth_{context.regions}.csv"
-    PATH1 = package_data_path("water", "availability", FILE1)
-    df_gwt = pd.read_csv(PATH1)
+    df_gwt = read_data_csv("availability", FILE1)
     df_gwt["region"] = (
         context.map_ISO_c[context.regions]
         if context.type_reg == "country"
@@ -189,8 +133,7 @@ def add_water_supply(context: "Context") -> dict[str, pd.DataFrame]:
 
     # reading groundwater energy intensity data
     FILE2 = f"historical_new_cap_gw_sw_km3_year_{context.regions}.csv"
-    PATH2 = package_data_path("water", "availability", FILE2)
-    df_hist = pd.read_csv(PATH2)
+    df_hist = read_data_csv("availability", FILE2)
     df_hist["BCU_name"] = "B" + df_hist["BCU_name"].astype(str)
 
     if context.nexus_set == "cooling":
@@ -790,10 +733,7 @@ def add_e_flow(context: "Context") -> dict[str, pd.DataFrame]:
     df_sw, df_gw = read_water_availability(context)
 
     # reading sample for assiging basins
-    PATH = package_data_path(
-        "water", "delineation", f"basins_by_region_simpl_{context.regions}.csv"
-    )
-    df_x = pd.read_csv(PATH)
+    df_x = read_basin_delineation(context)
 
     dmd_df = make_df(
         "demand",
@@ -810,13 +750,7 @@ def add_e_flow(context: "Context") -> dict[str, pd.DataFrame]:
 
     if "year" in context.time:
         # Reading data, the data is spatially and temporally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"e-flow_{context.RCP}_{context.regions}.csv",
-        )
-        df_env = pd.read_csv(path1)
-        df_env.drop(["Unnamed: 0"], axis=1, inplace=True)
+        df_env = read_hydrology(context, "e-flow")
         df_env.index = df_x["BCU_name"].index
         df_env = df_env.stack().reset_index()
         df_env.columns = pd.Index(["Region", "years", "value"])
@@ -832,13 +766,7 @@ def add_e_flow(context: "Context") -> dict[str, pd.DataFrame]:
         df_env = df_env[df_env["year"].isin(info.Y)]
     else:
         # Reading data, the data is spatially and temporally aggregated from GHMs
-        path1 = package_data_path(
-            "water",
-            "availability",
-            f"e-flow_5y_m_{context.RCP}_{context.regions}.csv",
-        )
-        df_env = pd.read_csv(path1)
-        df_env.drop(["Unnamed: 0"], axis=1, inplace=True)
+        df_env = read_hydrology(context, "e-flow")
         # new_cols = pd.to_datetime(df_env.columns, format="%Y/%m/%d")
         # df_env.columns = new_cols
         df_env.index = df_x["BCU_name"].index
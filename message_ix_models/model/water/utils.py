@@ -11,7 +11,7 @@ from sdmx.model.v21 import Code
 
 from message_ix_models import Context
 from message_ix_models.model.structure import get_codes
-from message_ix_models.util import load_package_data
+from message_ix_models.util import load_package_data, package_data_path
 
 log = logging.getLogger(__name__)
 
@@ -56,6 +56,67 @@ def read_config(context: Optional[Context] = None):
     return context
 
 
+@lru_cache(maxsize=None)
+def _read_csv(*parts: str, hydrology: bool = False) -> pd.DataFrame:
+    """Read a CSV file from :file:`data/water/`; see :func:`read_data_csv`."""
+    df = pd.read_csv(package_data_path("water", *parts))
+    if hydrology:
+        # Drop the unnamed index column; store values as float64
+        df = df.drop(columns="Unnamed: 0").astype(np.float64)
+    return df
+
+
+def read_data_csv(*parts: str) -> pd.DataFrame:
+    """Read a CSV file from :file:`data/water/`.
+
+    Each file is parsed once per process; later calls with the same `parts` return a
+    copy of the stored contents, which the caller may modify.
+    """
+    return _read_csv(*parts).copy()
+
+
+def read_basin_delineation(context: Context) -> pd.DataFrame:
+    """Read :file:`delineation/basins_by_region_simpl_{regions}.csv` for `context`.
+
+    Like :func:`read_data_csv`, the file is only parsed once per value of
+    :py:`context.regions`.
+    """
+    return read_data_csv("delineation", f"basins_by_region_simpl_{context.regions}.csv")
+
+
+def read_hydrology(context: Context, variable: str) -> pd.DataFrame:
+    """Read basin-level hydrology data for `variable`.
+
+    The file is selected using :py:`context.regions`, :py:`context.RCP`,
+    :py:`context.REL` (except for "e-flow"), and whether :py:`context.time` contains
+    "year" (annual data) or not (monthly data); it is only parsed once for each
+    combination of these.
+
+    Parameters
+    ----------
+    variable : str
+        "qtot" (surface water runoff), "qr" (groundwater recharge), or "e-flow"
+        (environmental flows).
+
+    Returns
+    -------
+    pandas.DataFrame
+        with one row per basin, in the same order as :func:`read_basin_delineation`,
+        and one float64 column per date.
+    """
+    if "year" in context.time:
+        if variable == "e-flow":
+            name = f"e-flow_{context.RCP}_{context.regions}.csv"
+        else:
+            name = f"{variable}_5y_{context.RCP}_{context.REL}_{context.regions}.csv"
+    elif variable == "e-flow":
+        name = f"e-flow_5y_m_{context.RCP}_{context.regions}.csv"
+    else:
+        name = f"{variable}_5y_m_{context.RCP}_{context.REL}_{context.regions}.csv"
+
+    return _read_csv("availability", name, hydrology=True).copy()
+
+
 @lru_cache()
 def map_add_on(rtype=Code):
     """Map addon & type_addon in ``sets.yaml``."""
@@ -165,3 +226,53 @@ def map_yv_ya_lt(
     return df.loc[(ya <= df.year_act) & (df.year_act - df.year_vtg <= lt)].reset_index(
         drop=True
     )
+
+
+def broadcast_yv_ya(
+    df: pd.DataFrame, lifetime, periods: tuple[int, ...], ya: Optional[int] = None
+) -> pd.DataFrame:
+    """Broadcast `df` over meaningful (vintage year, active year) combinations.
+
+    Each row of `df` is repeated for every row of :func:`map_yv_ya_lt` given `periods`,
+    `ya`, and the respective `lifetime` of that row. Data for many technologies with
+    different lifetimes can thus be constructed with a single call to
+    :func:`~message_ix.util.make_df` instead of one per technology. Like
+    :func:`.broadcast`, this is usable with :meth:`pandas.DataFrame.pipe`.
+
+    Parameters
+    ----------
+    lifetime : int or pandas.Series
+        Lifetime for all rows, or for each row of `df` (aligned by position).
+
+    Returns
+    -------
+    pandas.DataFrame
+        with a new index and filled columns "year_vtg" and "year_act".
+    """
+    lt = pd.Series(np.broadcast_to(np.asarray(lifetime), (len(df),)))
+
+    # Year combinations for each distinct lifetime, stored contiguously
+    codes, uniques = pd.factorize(lt, use_na_sentinel=False)
+    years = [map_yv_ya_lt(periods, lt_, ya) for lt_ in uniques]
+    n = np.array([len(y) for y in years], dtype=int)
+    start = np.cumsum(n) - n
+    all_years = pd.concat(
+        [pd.DataFrame(columns=["year_vtg", "year_act"], dtype=np.int64)] + years,
+        ignore_index=True,
+    )
+
+    # Position in `df` and in `all_years` for each row of the result
+    counts = n[codes]
+    pos = np.repeat(np.arange(len(df)), counts)
+    ypos = start[codes][pos] + (
+        np.arange(counts.sum()) - (np.cumsum(counts) - counts)[pos]
+    )
+
+    return (
+        df.iloc[pos]
+        .reset_index(drop=True)
+        .assign(
+            year_vtg=all_years["year_vtg"].to_numpy()[ypos],
+            year_act=all_years["year_act"].to_numpy()[ypos],
+        )
+    )
@@ -164,7 +164,9 @@ def report(context: Context, *args, **kwargs):
           retrieve the Scenario to be reported.
 
         - :py:`context.report`, which is an instance of :class:`.report.Config`; see
-          there for available configuration settings.
+          there for available configuration settings. With
+          :attr:`.report.Config.since_last`, intermediate results are reused from
+          earlier runs where possible; see :mod:`.report.incremental`.
     """
     from message_ix_models.util.ixmp import discard_on_error
 
@@ -211,9 +213,18 @@ def report(context: Context, *args, **kwargs):
     if context.dry_run:
         return
 
+    if context.report.since_last:
+        from . import incremental
+
+        assert context.core.cache_path
+        usage = incremental.apply(rep, key, context.core.cache_path)
+
     with discard_on_error(rep.graph["scenario"]):
         result = rep.get(key)
 
+    if context.report.since_last:
+        usage.log()
+
     # Display information about the result
     log.info(
         f"File output(s), if any, written under:\n{rep.graph['config']['output_dir']}"
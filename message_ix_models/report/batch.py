@@ -0,0 +1,349 @@
+"""Report many scenarios using one prepared reporting graph.
+
+:func:`prepare_reporter` runs every :attr:`.Config.callback`, handles the
+:mod:`genno` configuration file, and infers keys—all on each call. :func:`report_many`
+does this once, in a :class:`Template`, and then binds the resulting graph to each
+scenario in turn, or in a pool of worker processes. The IAMC-structured results are
+written to a single store; see :func:`write`.
+
+The same graph can be used for scenarios with the same structure: the same lists of
+sets, parameters, equations, and variables, and either all with or all without a
+solution. A separate :class:`Template` is prepared for each different structure. Data
+that callbacks read from the scenario while adding tasks, instead of through tasks that
+depend on the "scenario" key, are those of the first scenario with each structure.
+"""
+
+import logging
+import multiprocessing
+import os
+from collections.abc import Mapping, Sequence
+from contextlib import nullcontext
+from copy import copy, deepcopy
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import Any, Optional
+from urllib.parse import quote
+
+import ixmp
+import pandas as pd
+from dask.core import quote as dask_quote
+from genno.core.graph import Graph
+from ixmp.report.common import RENAME_DIMS
+from message_ix import Reporter, Scenario
+
+from message_ix_models import Context, ScenarioInfo
+from message_ix_models.util._logging import silence_log
+from message_ix_models.util.ixmp import discard_on_error, parse_url
+
+log = logging.getLogger(__name__)
+
+#: Columns used to partition the store written by :func:`write`: the name of the
+#: platform, and the model name, scenario name, and version of each scenario.
+PARTITION = ["platform", "model", "scenario", "version"]
+
+#: Name of the file, in the store written by :func:`report_many`, with the timing
+#: summary.
+SUMMARY_FILE = "_summary.csv"
+
+
+@dataclass
+class Record:
+    """Summary of reporting one scenario with :func:`report_many`."""
+
+    #: URL of the scenario.
+    url: str
+    #: Time, in seconds, to prepare a :class:`Template`; 0 if an existing one was used.
+    prepare: float = 0.0
+    #: Time, in seconds, to bind the template to the scenario.
+    bind: float = 0.0
+    #: Time, in seconds, to compute the reporting key.
+    compute: float = 0.0
+    #: Time, in seconds, to write the result to the store.
+    write: float = 0.0
+    #: Number of rows written.
+    rows: int = 0
+    #: Number of keys reused from earlier runs; see :attr:`.report.Config.since_last`.
+    reused: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.url}: prepare {self.prepare:.1f} s, bind {self.bind:.1f} s, "
+            f"compute {self.compute:.1f} s, write {self.write:.1f} s; {self.rows} rows"
+        ) + (f"; {self.reused} keys reused" if self.reused else "")
+
+
+def structure(scenario: Scenario) -> tuple:
+    """Return the structure of `scenario` that determines its reporting graph."""
+    return (scenario.has_solution(),) + tuple(
+        tuple(sorted(getattr(scenario, f"{ix_type}_list")()))
+        for ix_type in ("set", "par", "equ", "var")
+    )
+
+
+class Template:
+    """A :class:`.Reporter` prepared once, and bound to each of many scenarios.
+
+    Parameters
+    ----------
+    context : .Context
+        Settings for :func:`.prepare_reporter`. This is copied, and not modified.
+    scenario : .Scenario
+        Scenario used to prepare the reporter.
+    """
+
+    def __init__(self, context: Context, scenario: Scenario):
+        from . import prepare_reporter
+
+        # prepare_reporter() modifies context.report.output_dir; bind() does this
+        context = deepcopy(context)
+        self.use_scenario_path = context.report.use_scenario_path
+        context.report.use_scenario_path = False
+        self.output_dir = context.report.output_dir
+
+        self.structure = structure(scenario)
+
+        with (
+            nullcontext()
+            if context.core.verbose
+            else silence_log("genno message_ix_models")
+        ):
+            self.rep, self.key = prepare_reporter(context, scenario=scenario)
+
+    def bind(self, scenario: Scenario, *, check: bool = True) -> Reporter:
+        """Return a copy of the prepared reporter for `scenario`.
+
+        The "scenario" key and the elements of each set are those of `scenario`. The
+        prepared reporter is not modified.
+
+        Raises
+        ------
+        ValueError
+            if `check` is :any:`True` and the :func:`structure` of `scenario` differs
+            from that of the scenario used to prepare the reporter.
+        """
+        if check and structure(scenario) != self.structure:
+            raise ValueError(f"Structure of {scenario.url} differs from template")
+
+        rep = copy(self.rep)
+        rep.graph = Graph()
+        rep.graph.update(self.rep.graph)
+
+        # Same as ixmp.Reporter.from_scenario()
+        rep.graph["scenario"] = scenario
+        for name in scenario.set_list():
+            elements = scenario.set(name)
+            if isinstance(elements, pd.Series):
+                elements = dask_quote(elements.tolist())
+            rep.graph[RENAME_DIMS.get(name, name)] = elements
+
+        # Same as prepare_reporter() with Config.use_scenario_path
+        config = rep.graph["config"] = copy(rep.graph["config"])
+        if self.use_scenario_path and self.output_dir:
+            config["output_dir"] = self.output_dir.joinpath(
+                ScenarioInfo(scenario, empty=True).path
+            )
+            config["output_dir"].mkdir(parents=True, exist_ok=True)
+
+        return rep
+
+
+def write(data: Any, store: Path, scenario: Scenario) -> int:
+    """Write IAMC-structured `data` for `scenario` to `store`.
+
+    `store` is a directory of Parquet files, partitioned by the platform name and the
+    model name, scenario name, and version (:data:`PARTITION`), that can be read with
+    :func:`pandas.read_parquet`. Data from an earlier run for the same scenario are
+    replaced.
+
+    Returns
+    -------
+    int
+        The number of rows written; 0 if `data` is not a :class:`pyam.IamDataFrame` or
+        :class:`pandas.DataFrame`.
+    """
+    from pyam import IamDataFrame
+
+    if isinstance(data, IamDataFrame):
+        df = data.data
+    elif isinstance(data, pd.DataFrame):
+        df = data
+    else:
+        log.warning(f"{type(data)} result for {scenario.url} not written")
+        return 0
+
+    # Same encoding as used by pyarrow for hive partitioning
+    values = dict(
+        platform=scenario.platform.name,
+        model=scenario.model,
+        scenario=scenario.scenario,
+        version=scenario.version,
+    )
+    path = store.joinpath(*[f"{p}={quote(str(values[p]), safe='')}" for p in PARTITION])
+    path.mkdir(parents=True, exist_ok=True)
+
+    # Write to a file with a unique name, so that concurrent writers do not interfere.
+    # Files with names starting with "." are ignored when reading.
+    with NamedTemporaryFile(
+        dir=path, prefix=".data.parquet.", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
+    try:
+        df = df.drop(columns=PARTITION, errors="ignore")
+        df.attrs.clear()  # For instance, units of a Quantity
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path.joinpath("data.parquet"))
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    return len(df)
+
+
+class _Batch:
+    """Templates and platforms used by one process."""
+
+    def __init__(self, context: Context):
+        self.context = context
+        self.templates: dict[tuple, Template] = {}
+        self.platforms: dict[str, ixmp.Platform] = {}
+
+    def report(self, url: str, store: Path) -> Record:
+        """Report the scenario at `url` and write the result to `store`."""
+        record = Record(url)
+
+        platform_info, scenario_info = parse_url(url)
+        name = platform_info["name"]
+        if name not in self.platforms:
+            self.platforms[name] = ixmp.Platform(**platform_info)
+        mp = self.platforms[name]
+        mp.open_db()
+        scenario = Scenario(mp, **scenario_info)
+
+        start = perf_counter()
+        key = structure(scenario)
+        if key not in self.templates:
+            log.info(f"Prepare reporting for {url}")
+            self.templates[key] = Template(self.context, scenario)
+            record.prepare = perf_counter() - start
+        template = self.templates[key]
+
+        start = perf_counter()
+        rep = template.bind(scenario, check=False)
+        if self.context.report.since_last:
+            from .incremental import apply
+
+            assert self.context.core.cache_path
+            usage = apply(rep, template.key, self.context.core.cache_path)
+        record.bind = perf_counter() - start
+
+        with discard_on_error(scenario):
+            result = rep.get(template.key)
+        record.compute = perf_counter() - start - record.bind
+
+        if self.context.report.since_last:
+            usage.log()
+            record.reused = len(usage.reused)
+
+        start = perf_counter()
+        record.rows = write(result, store, scenario)
+        record.write = perf_counter() - start
+
+        # Release the database connection for other processes
+        mp.close_db()
+
+        log.info(str(record))
+        return record
+
+
+# Instance of _Batch in a worker process
+_WORKER: Optional[_Batch] = None
+
+
+def _init_worker(context_values: dict[str, Any]) -> None:
+    global _WORKER
+    _WORKER = _Batch(Context(**deepcopy(context_values)))
+
+
+def _report_in_worker(url: str, store: Path) -> Record:
+    assert _WORKER is not None
+    return _WORKER.report(url, store)
+
+
+def report_many(
+    context: Context,
+    urls: Sequence[str],
+    store: Path,
+    *,
+    max_workers: Optional[int] = None,
+) -> list[Record]:
+    """Report each of the scenarios at `urls`, preparing the reporter once.
+
+    Parameters
+    ----------
+    context : .Context
+        Settings for :func:`.prepare_reporter`, as for :func:`.report`. With
+        :attr:`.report.Config.since_last`, results of earlier runs are reused; see
+        :mod:`.report.incremental`.
+    urls :
+        Scenario URLs like "ixmp://platform/model/scenario#version".
+    store : pathlib.Path
+        Directory for the results; see :func:`write`. A summary with the time taken
+        for each scenario is also written to :data:`SUMMARY_FILE`.
+    max_workers : int, optional
+        If given and greater than 1, report scenarios in a pool of up to this many
+        worker processes. Each process prepares its own :class:`Template`. The
+        scenarios must be stored on platforms that are configured by name and that
+        other processes can access.
+
+    Returns
+    -------
+    list of Record
+        in the same order as `urls`.
+    """
+    store.mkdir(parents=True, exist_ok=True)
+    start = perf_counter()
+
+    if max_workers is None or max_workers <= 1:
+        batch = _Batch(context)
+        records = [batch.report(url, store) for url in urls]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        from message_ix_models.workflow import _context_values
+
+        # Release any database connection so that worker processes can open it
+        context.close_db()
+
+        with ProcessPoolExecutor(
+            min(max_workers, len(urls)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(_context_values(context),),
+        ) as pool:
+            records = list(pool.map(_report_in_worker, urls, [store] * len(urls)))
+
+    pd.DataFrame(
+        [astuple(r) for r in records], columns=[f.name for f in fields(Record)]
+    ).to_csv(store.joinpath(SUMMARY_FILE), index=False)
+
+    log.info(
+        "\n  ".join(
+            [f"Reported {len(records)} scenario(s) in {perf_counter() - start:.1f} s"]
+            + list(map(str, records))
+        )
+    )
+    return records
+
+
+def url_for(platform_info: Mapping, scenario_info: Mapping) -> str:
+    """Return a URL for :func:`report_many`.
+
+    The arguments are like :attr:`.util.config.Config.platform_info` and
+    :attr:`~.util.config.Config.scenario_info`.
+    """
+    version = scenario_info.get("version")
+    return (
+        f"ixmp://{platform_info['name']}/{scenario_info['model']}/"
+        f"{scenario_info['scenario']}"
+    ) + ("" if version is None else f"#{version}")
@@ -42,9 +42,29 @@ def _modules_arg(context, param, value):
     type=click.Path(writable=True, resolve_path=True, path_type=Path),
     help="Write output to PATH instead of console or default locations.",
 )
+@click.option(
+    "--since-last",
+    is_flag=True,
+    help="Reuse results of earlier runs; show keys reused.",
+)
+@click.option(
+    "--store",
+    metavar="PATH",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+    help="Write IAMC output of all scenarios to a Parquet store at PATH.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="With --store, report scenarios in parallel processes.",
+)
 @click.argument("key", default="message::default")
 @click.pass_obj
-def cli(context, config_file, legacy, cli_output, key, **kwargs):
+def cli(
+    context, config_file, legacy, cli_output, since_last, store, workers, key, **kwargs
+):
     """Postprocess results.
 
     KEY defaults to the comprehensive report 'message::default', but may also be the
@@ -56,6 +76,16 @@ def cli(context, config_file, legacy, cli_output, key, **kwargs):
     With --urls-from-file, read multiple Scenario identifiers from FILE, and report each
     one. In this usage, --output-path may only be a directory.
 
+    With --since-last, intermediate results stored by earlier runs are loaded instead of
+    computed, if neither the scenario nor the tasks or input files to compute them have
+    changed. The keys reused are shown.
+
+    With --store, the reporting is prepared once and used for each scenario that has
+    the same structure. The IAMC-structured output of all scenarios is written to a
+    single Parquet store, partitioned by platform, model, scenario, and version, with
+    a summary of the time taken for each scenario. --workers gives a number of
+    processes to use.
+
     If --verbose is given to the top-level CLI, the full description of the steps to
     calculate KEY is printed, as well as the entire result, if any.
     """
@@ -68,7 +98,11 @@ def cli(context, config_file, legacy, cli_output, key, **kwargs):
 
     # Update the reporting configuration from command-line parameters
     context.report = Config(
-        from_file=config_file, key=key, cli_output=cli_output, _legacy=legacy
+        from_file=config_file,
+        key=key,
+        cli_output=cli_output,
+        since_last=since_last,
+        _legacy=legacy,
     )
 
     # Prepare a list of Context objects, each referring to one Scenario.
@@ -90,6 +124,16 @@ def cli(context, config_file, legacy, cli_output, key, **kwargs):
         ctx.scenario_info = dict(si)
         contexts.append(ctx)
 
+    if store:
+        if legacy or cli_output:
+            raise click.UsageError("--store cannot be used with --legacy or --output")
+
+        from .batch import report_many, url_for
+
+        urls = [url_for(ctx.platform_info, ctx.scenario_info) for ctx in contexts]
+        report_many(context, urls, store, max_workers=workers)
+        return
+
     for ctx in contexts:
         mark_time()
         report(ctx)
@@ -83,6 +83,10 @@ class Config(ConfigHelper):
         default_factory=lambda: local_data_path("report")
     )
 
+    #: :data:`True` to reuse intermediate results stored by earlier runs, and store
+    #: those computed, using :func:`.report.incremental.apply`.
+    since_last: bool = False
+
     #: :data:`True` to use an output directory based on the scenario's model name and
     #: name.
     use_scenario_path: bool = True
@@ -0,0 +1,276 @@
+"""Reuse results from earlier reporting runs.
+
+:func:`apply` modifies the graph of a :class:`.Reporter` so that intermediate results
+are stored in the cache directory (:attr:`.util.config.Config.cache_path`) when they
+are computed, and loaded from there on later runs, instead of being computed again.
+Each result is identified by a fingerprint of the task that computes it, and
+recursively of the tasks for all its inputs, including:
+
+- the code of the functions and :mod:`genno` operators called, any values captured
+  by closures or given as default argument values, and the arguments;
+- for a :class:`~message_ix.Scenario`, the name of its platform, its URL—including the
+  version—and whether it has a solution;
+- for a :class:`~pathlib.Path` to a file, a hash of the file contents.
+
+If any of these change, the fingerprint of the affected task and every task that
+depends on it changes, so these are computed again. Tasks with inputs that cannot be
+fingerprinted, for instance arbitrary objects, are always computed.
+
+Only results that are :class:`genno.Quantity` or :mod:`pandas` objects are stored.
+Other tasks, for instance those that write files, are computed on every run. The
+stored files are included in the :program:`mix-models cache` statistics under the name
+"report", and can be removed with :program:`mix-models cache prune`.
+
+Use :program:`mix-models report --since-last`, or set :attr:`.report.Config.since_last`.
+"""
+
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from functools import partial
+from hashlib import blake2b
+from inspect import ismethod
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Optional
+
+import genno
+import pandas as pd
+from genno.caching import Encoder, hash_args, hash_code, hash_contents
+from genno.core.operator import Operator
+
+from message_ix_models.util import cache
+
+if TYPE_CHECKING:
+    from genno.core.graph import Graph
+    from genno.core.key import KeyLike
+    from message_ix import Reporter
+
+log = logging.getLogger(__name__)
+
+#: Types of results that are stored.
+STORE = (genno.Quantity, pd.DataFrame, pd.Series)
+
+
+class _NoFingerprint(Exception):
+    """An input of a task cannot be fingerprinted."""
+
+
+@dataclass
+class Usage:
+    """Keys reused from, or computed and stored to, the cache by one run."""
+
+    reused: list = field(default_factory=list)
+    stored: list = field(default_factory=list)
+
+    def log(self) -> None:
+        """Log the keys reused and stored."""
+        for label, keys in (
+            ("Reused", self.reused),
+            ("Computed and stored", self.stored),
+        ):
+            log.info(
+                "\n  ".join(
+                    [f"{label} {len(keys)} key(s) since last run"]
+                    + sorted(map(str, keys))
+                )
+            )
+
+
+class _Fingerprints:
+    """Compute and store fingerprints of tasks in `graph`."""
+
+    def __init__(self, graph: "Graph"):
+        self.graph = graph
+        self.values: dict[Any, Optional[str]] = {}
+        #: Keys referenced by the task for each key.
+        self.deps: dict[Any, list] = {}
+
+    def __call__(self, key) -> Optional[str]:
+        """Return the fingerprint of the task for `key`, or :any:`None`."""
+        key = self.graph.unsorted_key(key) or key
+        if key in self.values:
+            return self.values[key]
+
+        deps: list = []
+        try:
+            value = hash_args(self._encode_task(self.graph[key], deps))
+        except (_NoFingerprint, TypeError, ValueError):
+            value = None
+            # Ensure all references are collected, so they can be traversed
+            self._refs(self.graph[key], deps)
+
+        self.values[key] = value
+        self.deps[key] = deps
+        return value
+
+    def _ref(self, obj):
+        """Return the key in :attr:`graph` referenced by `obj`, or :any:`None`."""
+        if isinstance(obj, (str, genno.Key)) and obj in self.graph:
+            return self.graph.unsorted_key(obj) or obj
+        return None
+
+    def _refs(self, obj, deps: list) -> None:
+        if (ref := self._ref(obj)) is not None:
+            deps.append(ref)
+        elif isinstance(obj, (list, tuple)):
+            for o in obj:
+                self._refs(o, deps)
+
+    def _encode_task(self, obj, deps: list):
+        """Return a JSON-serializable representation of a task or task argument."""
+        if (ref := self._ref(obj)) is not None:
+            # Reference to another key: use its fingerprint
+            deps.append(ref)
+            if (fp := self(ref)) is None:
+                raise _NoFingerprint(ref)
+            return ["key", fp]
+        elif isinstance(obj, (list, tuple)):
+            # Task or list of arguments, possibly containing references
+            return [type(obj).__name__] + [self._encode_task(o, deps) for o in obj]
+        return _encode(obj)
+
+
+def _encode(obj):
+    """Return a JSON-serializable representation of `obj`."""
+    from message_ix import Scenario
+
+    if isinstance(obj, (list, tuple)):
+        return list(map(_encode, obj))
+    elif isinstance(obj, (set, frozenset)):
+        return sorted(map(_encode, obj), key=repr)
+    elif isinstance(obj, dict):
+        return [[_encode(k), _encode(v)] for k, v in obj.items()]
+    elif isinstance(obj, (str, int, float, bool, type(None), genno.Key)):
+        return obj if not isinstance(obj, genno.Key) else str(obj)
+    elif isinstance(obj, Path):
+        return [str(obj), hash_contents(obj) if obj.is_file() else None]
+    elif isinstance(obj, Scenario):
+        return [obj.platform.name, obj.url, obj.has_solution()]
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        h = blake2b(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        return [list(map(str, getattr(obj, "columns", [obj.name]))), h.hexdigest()]
+    elif callable(obj) or type(obj).__name__ == "literal":
+        return _encode_callable(obj)
+
+    # Anything else that the genno/message_ix_models Encoder can handle
+    return Encoder().default(obj)
+
+
+def _encode_callable(obj):
+    """Return a JSON-serializable representation of a callable `obj`."""
+    if isinstance(obj, partial):
+        return list(map(_encode, (obj.func, obj.args, obj.keywords)))
+    elif isinstance(obj, Operator):
+        return [obj.__name__, _encode(obj.func)]
+    elif ismethod(obj):
+        return [_encode(obj.__func__), _encode(obj.__self__)]
+    elif hasattr(obj, "__code__"):
+        # hash_code() covers only the bytecode and constants, not values captured by a
+        # closure or default argument values. Empty cells raise ValueError.
+        return [
+            f"{obj.__module__}.{obj.__qualname__}",
+            hash_code(obj),
+            _encode([c.cell_contents for c in obj.__closure__ or ()]),
+            _encode(obj.__defaults__),
+            _encode(obj.__kwdefaults__),
+        ]
+    elif type(obj).__name__ == "literal":  # dask.core.literal
+        return ["literal", _encode(obj.data)]
+    elif " at 0x" not in repr(obj):
+        return repr(obj)  # Built-in functions, operator.itemgetter(…), etc.
+    raise _NoFingerprint(obj)
+
+
+def _load(path: Path, recompute):
+    """Load a stored result from `path`.
+
+    If the file cannot be read—for instance, if it is incomplete or was removed—it is
+    deleted, and the result is computed again by calling `recompute`.
+    """
+    try:
+        with open(path, "rb") as f:
+            result = pickle.load(f)
+    except Exception as e:
+        log.warning(f"Discard unreadable stored result {path}: {e!r}")
+        path.unlink(missing_ok=True)
+        return recompute()
+
+    os.utime(path)  # Mark as recently used, for cache.prune()
+    cache.STATS["report"].update({"hit": 1, "bytes read": path.stat().st_size})
+    return result
+
+
+def _store(path: Path, key, usage: Usage, func, *args):
+    """Call `func` with `args`, and store the result at `path`.
+
+    The result is written to a temporary file with a unique name, then renamed, so that
+    concurrent processes storing the same result do not interfere with each other.
+    """
+    result = func(*args)
+    if isinstance(result, STORE):
+        try:
+            with NamedTemporaryFile(
+                dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp = Path(f.name)
+                pickle.dump(result, f)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            log.debug(f"Not stored: {key!s}: {e!r}")
+            tmp.unlink(missing_ok=True)
+        else:
+            os.replace(tmp, path)
+            usage.stored.append(key)
+            cache.STATS["report"].update(
+                {"miss": 1, "bytes written": path.stat().st_size}
+            )
+    return result
+
+
+def apply(rep: "Reporter", key: "KeyLike", cache_path: Path) -> Usage:
+    """Modify `rep` to reuse or store results needed to compute `key`.
+
+    Tasks that `key` depends on and that have results stored in `cache_path` are
+    replaced with tasks that load these results; the tasks for their inputs are not
+    computed. Other tasks are modified to store their results when computed.
+
+    Returns
+    -------
+    Usage
+        with the :attr:`~Usage.reused` keys. The :attr:`~Usage.stored` keys are added
+        when the results are computed.
+    """
+    graph = rep.graph
+    fingerprint = _Fingerprints(graph)
+    usage = Usage()
+
+    # Unmodified copy of the graph, to compute results that cannot be loaded
+    original = genno.Computer()
+    original.graph.update(graph)
+
+    cache_path.mkdir(parents=True, exist_ok=True)
+
+    todo, seen = list(rep.check_keys(key)), set()
+    while todo:
+        k = todo.pop()
+        if k in seen:
+            continue
+        seen.add(k)
+
+        fp, task = fingerprint(k), graph[k]
+        if fp is None or not (isinstance(task, tuple) and callable(task[0])):
+            # Not a task, or cannot be fingerprinted: compute normally
+            todo.extend(fingerprint.deps[k])
+            continue
+
+        # Same name pattern as files written by .util.cache.cached()
+        path = cache_path.joinpath(f"report-{fp}.pickle")
+        if path.exists():
+            graph[k] = (partial(_load, path, partial(original.get, k)),)
+            usage.reused.append(k)
+        else:
+            graph[k] = (partial(_store, path, k, usage, task[0]),) + task[1:]
+            todo.extend(fingerprint.deps[k])
+
+    return usage
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -14,10 +16,41 @@ from message_ix_models.util.compat.message_data.utilities import retrieve_region
 
 from . import postprocess
 from . import pp_utils
+from .state import State
 
 log = logging.getLogger(__name__)
 
 
+def _map(func: Callable, items: Iterable, max_workers: Optional[int]) -> list:
+    """Apply `func` to `items`, in up to `max_workers` threads; keep the order."""
+    if max_workers is None or max_workers <= 1:
+        return list(map(func, items))
+    with ThreadPoolExecutor(max_workers) as pool:
+        return list(pool.map(func, items))
+
+
+def evaluate_tables(
+    run_tables: dict, func_dict: dict, max_workers: Optional[int] = None
+) -> dict:
+    """Evaluate each of `run_tables` using the functions in `func_dict`.
+
+    With `max_workers` greater than 1, tables are evaluated concurrently in a pool of
+    threads. A :class:`.State` must be installed, in which :attr:`.State.pp` uses
+    :class:`.Prefetch`, so that the tables read from a shared snapshot of the scenario
+    data.
+
+    Returns
+    -------
+    dict
+        with the same keys, in the same order, as `run_tables`.
+    """
+
+    def _evaluate(table: dict):
+        return func_dict[table["function"]](**table.get("args", {}))
+
+    return dict(zip(run_tables, _map(_evaluate, run_tables.values(), max_workers)))
+
+
 def report(
     mp,
     scen,
@@ -37,6 +70,8 @@ def report(
     verbose=False,
     *,
     context: Optional[Context] = None,
+    prefetch: bool = True,
+    max_workers: Optional[int] = None,
 ):
     """Main reporting function.
 
@@ -94,7 +129,17 @@ def report(
     context : .Context
         Only the ``dry_run`` setting is respected. If :data:`True`, configuration is
         read, but nothing is done.
+    prefetch : boolean (default: True)
+        Load each set, parameter, and variable from `scen` once, and answer the many
+        filtered queries of the reporting tables from memory. See :class:`.Prefetch`.
+    max_workers : int (default: None)
+        If greater than 1, evaluate reporting tables and convert them to IAMC format
+        in a pool of this many threads; see :func:`evaluate_tables`. Requires
+        `prefetch`. The output is the same as with a single thread.
     """
+    if max_workers is not None and max_workers > 1 and not prefetch:
+        raise ValueError(f"max_workers={max_workers} requires prefetch=True")
+
     nds0 = get_nodes(scen)
     nds = [n for n in nds0 if "|" not in n]
     region_id, reg_ts = retrieve_region_mapping(scen, mp, include_region_id=False)
@@ -180,33 +225,34 @@ def report(
         log.info(f"(DRY RUN) Would write to {out_dir}")
         return
 
-    # --------------------------------
-    # Set global variables in pp_utils
-    # --------------------------------
+    # -----------------------------------------------------
+    # Set the state of this run, for pp_utils and the tables
+    # -----------------------------------------------------
 
     if run_history != "True":
         # Configures reporting tools to retrieve results from optimization (var)
-        pp = postprocess.PostProcess(scen)
-        pp_utils.firstmodelyear = scen.firstmodelyear
+        pp = postprocess.PostProcess(scen, prefetch=prefetch)
+        state = State(pp=pp, mu={}, firstmodelyear=scen.firstmodelyear)
 
-        pp_utils.years = get_optimization_years(scen)
+        state.years = get_optimization_years(scen)
     else:
         # Configures reporting tools to retrieve results from "reference_solution" (par)
-        pp = postprocess.PostProcess(scen, ix=False)
-        pp_utils.years = get_historical_years(scen) + get_optimization_years(scen)
+        pp = postprocess.PostProcess(scen, ix=False, prefetch=prefetch)
+        state = State(pp=pp, mu={})
+        state.years = get_historical_years(scen) + get_optimization_years(scen)
 
     # Passes all model years to reporting tools
-    pp_utils.all_years = scen.set("year").tolist()
-    pp_utils.globalname = "{}_GLB".format(region_id)
+    state.all_years = scen.set("year").tolist()
+    state.globalname = "{}_GLB".format(region_id)
 
     # Provides option to rename model years for output
     regions = {n: (n.split("_")[1] if "GLB" not in n else "World") for n in nds}
-    pp_utils.regions = regions
-    pp_utils.region_id = region_id
-    pp_utils.all_tecs = scen.set("technology")
-    pp_utils.model_nm = model_nm
-    pp_utils.scen_nm = scen_nm
-    pp_utils.verbose = verbose
+    state.regions = regions
+    state.region_id = region_id
+    state.all_tecs = scen.set("technology")
+    state.model_nm = model_nm
+    state.scen_nm = scen_nm
+    state.verbose = verbose
 
     # ----------------------------
     # Read in unit conversion file
@@ -214,8 +260,7 @@ def report(
 
     with open(unit_yaml) as f:
         data = yaml.load(f, Loader=SafeLoader)
-    global mu
-    mu = data["model_units"]
+    mu = state.mu = data["model_units"]
     for i in mu:
         try:
             mu[i] = eval(mu[i])
@@ -237,7 +282,7 @@ def report(
             if fnd == 1:
                 data_cf[u].pop(i)
 
-    pp_utils.unit_conversion = data_cf
+    state.unit_conversion = data_cf
 
     # ------------------------
     # Compile reporting tables
@@ -245,27 +290,21 @@ def report(
 
     # Based on the default config, populate func_dict, which
     # has all the function required for running the reporting.
+    state.run_history = run_history
+    state.urban_perc_data = urban_perc_data
+    if run_history == "True":
+        state.kyoto_hist_data = kyoto_hist_data
+        state.lu_hist_data = lu_hist_data
+
     DEFAULT_table_def = "message_ix_models.report.legacy.default_tables"
     dflt_tbl = __import__(DEFAULT_table_def, fromlist=[None])
-    dflt_tbl.pp = pp
-    dflt_tbl.mu = mu
-    dflt_tbl.run_history = run_history
-    dflt_tbl.urban_perc_data = urban_perc_data
-    if run_history == "True":
-        dflt_tbl.kyoto_hist_data = kyoto_hist_data
-        dflt_tbl.lu_hist_data = lu_hist_data
+    table_modules = [dflt_tbl]
 
     func_dict = dflt_tbl.return_func_dict()
 
     if config["report_config"]["table_def"] != DEFAULT_table_def:
         tmp_tbl = __import__(config["report_config"]["table_def"], fromlist=[None])
-        tmp_tbl.pp = pp
-        tmp_tbl.mu = mu
-        tmp_tbl.run_history = run_history
-        tmp_tbl.urban_perc_data = urban_perc_data
-        if run_history == "True":
-            tmp_tbl.kyoto_hist_data = kyoto_hist_data
-            tmp_tbl.lu_hist_data = lu_hist_data
+        table_modules.append(tmp_tbl)
 
         tmp_func_dict = tmp_tbl.return_func_dict()
 
@@ -275,149 +314,153 @@ def report(
                 func_dict.pop(f)
             func_dict[f] = tmp_func_dict[f]
 
-    # --------------------
-    # Run reporting tables
-    # --------------------
+    # Module-level variables of pp_utils and the table modules are set from `state`
+    # until the output is written
+    with state.install(*table_modules):
+        # --------------------
+        # Run reporting tables
+        # --------------------
 
-    dfs = {}
-    for i in run_tables:
-        if run_tables[i]["active"] is True:
-            print("processing Table:", run_tables[i]["root"])
-            if (
-                "condition" in run_tables[i]
-                and eval(run_tables[i]["condition"]) is True
-            ):
-                continue
-            dfs[i] = (
-                func_dict[run_tables[i]["function"]]()
-                if "args" not in run_tables[i]
-                else func_dict[run_tables[i]["function"]](**run_tables[i]["args"])
-            )
+        selected = {}
+        for i in run_tables:
+            if run_tables[i]["active"] is True:
+                print("processing Table:", run_tables[i]["root"])
+                if (
+                    "condition" in run_tables[i]
+                    and eval(run_tables[i]["condition"]) is True
+                ):
+                    continue
+                selected[i] = run_tables[i]
 
-    # ---------------------------------
-    # Convert dataframes to IAMC-format
-    # ---------------------------------
+        dfs = evaluate_tables(selected, func_dict, max_workers)
 
-    mapping = pd.read_csv(aggr_def)
-    allowed_var = pd.read_csv(var_def)["Variable"].unique().tolist()
-    df = []
+        if prefetch:
+            pp.ds.log_stats()
+
+        # ---------------------------------
+        # Convert dataframes to IAMC-format
+        # ---------------------------------
+
+        mapping = pd.read_csv(aggr_def)
+        allowed_var = pd.read_csv(var_def)["Variable"].unique().tolist()
 
-    if merge_ts:
-        # Retrieve ts
-        ts = scen.timeseries()
-        if merge_hist:
-            ts = ts[ts["year"].isin(get_optimization_years(scen))]
-        # Rename for compatibility
-        ts = ts.rename(
-            columns={
-                "model": "Model",
-                "scenario": "Scenario",
-                "region": "Region",
-                "variable": "Variable",
-                "unit": "Unit",
-            }
-        )
-
-        # Convert synonym region names
-        ts.Region = ts.Region.map(reg_ts)
-
-        iamc_index = ["Model", "Scenario", "Region", "Variable", "Unit"]
-        # Flip from short to long format
-        ts = ts.pivot_table(
-            index=iamc_index, columns="year", values="value"
-        ).reset_index()
-
-    for i in dfs:
         if merge_ts:
-            # Filter out timeseries entries which exist for a certain variable
-            var = config["run_tables"][i]["root"]
-            tmp = ts[ts.Variable.str.find(var) >= 0]
-            tmp.Variable = tmp.Variable.str.replace(f"{var}|".replace("|", r"\|"), "")
-            if not tmp.empty:
-                dfs[i] = (
-                    tmp.set_index(iamc_index)
-                    .combine_first(dfs[i].set_index(iamc_index))
-                    .reset_index()
+            # Retrieve ts
+            ts = scen.timeseries()
+            if merge_hist:
+                ts = ts[ts["year"].isin(get_optimization_years(scen))]
+            # Rename for compatibility
+            ts = ts.rename(
+                columns={
+                    "model": "Model",
+                    "scenario": "Scenario",
+                    "region": "Region",
+                    "variable": "Variable",
+                    "unit": "Unit",
+                }
+            )
+
+            # Convert synonym region names
+            ts.Region = ts.Region.map(reg_ts)
+
+            iamc_index = ["Model", "Scenario", "Region", "Variable", "Unit"]
+            # Flip from short to long format
+            ts = ts.pivot_table(
+                index=iamc_index, columns="year", values="value"
+            ).reset_index()
+
+        args = []
+        for i in dfs:
+            if merge_ts:
+                # Filter out timeseries entries which exist for a certain variable
+                var = config["run_tables"][i]["root"]
+                tmp = ts[ts.Variable.str.find(var) >= 0]
+                tmp.Variable = tmp.Variable.str.replace(
+                    f"{var}|".replace("|", r"\|"), ""
                 )
+                if not tmp.empty:
+                    dfs[i] = (
+                        tmp.set_index(iamc_index)
+                        .combine_first(dfs[i].set_index(iamc_index))
+                        .reset_index()
+                    )
+
+                # Remove newly added timeseries from ts dataframe, to avoid double counting
+                ts = ts[ts.Variable.str.find(var) < 0]
+
+            root = run_tables[i]["root"]
+            args.append((dfs[i], root, mapping, root == "Emissions|HFC"))
+
+        df = _map(lambda a: pp_utils.iamc_it(*a), args, max_workers)
+        df = pd.concat(df, sort=True)
 
-            # Remove newly added timeseries from ts dataframe, to avoid double counting
-            ts = ts[ts.Variable.str.find(var) < 0]
+        # --------------
+        # Process output
+        # --------------
 
-        if run_tables[i]["root"] == "Emissions|HFC":
-            df.append(
-                pp_utils.iamc_it(dfs[i], run_tables[i]["root"], mapping, rm_totals=True)
+        # Ensure that only variables included in the template are included
+        # in the final output
+        df = df.loc[df.Variable.isin(allowed_var)]
+
+        # -------------------------------
+        # Merge with historical TS values
+        # -------------------------------
+
+        if merge_hist:
+            ix_upload = df.reset_index()
+            ix_upload = ix_upload.drop(["index", "Model", "Scenario"], axis=1)
+            ix_upload = ix_upload.rename(
+                columns={
+                    "Region": "region",
+                    "Variable": "variable",
+                    "Unit": "unit",
+                }
             )
+            col_yr = pp_utils.numcols(df)
+            model_year = int(
+                scen.set("cat_year", {"type_year": ["firstmodelyear"]})["year"]
+            )
+            ix_regions = {regions[n]: n for n in regions}
+            ix_upload.region = ix_upload.region.replace(ix_regions)
+            if run_history == "True":
+                cols = ["region", "variable", "unit"] + [int(yr) for yr in col_yr]
+            else:
+                cols = ["region", "variable", "unit"] + [
+                    int(yr) for yr in col_yr if yr >= model_year
+                ]
+            ix_upload = ix_upload[cols]
+            # ix_mp._jobj.unlockRunid(11473)
+            scen.check_out(timeseries_only=True)
+            print("Starting to upload timeseries")
+            print(ix_upload.head())
+            scen.add_timeseries(ix_upload)
+            print("Finished uploading timeseries")
+            scen.commit("Reporting uploaded as timeseries")
+
+            df = scen.timeseries(iamc=True)
+            df = df.rename(
+                columns={
+                    "model": "Model",
+                    "scenario": "Scenario",
+                    "region": "Region",
+                    "variable": "Variable",
+                    "unit": "Unit",
+                }
+            )
+            df["Model"] = model_nm
+            df["Scenario"] = scen_nm
+
+            df.Region = df.Region.map(reg_ts)
+            df = df.set_index(
+                ["Model", "Scenario", "Region", "Variable", "Unit"]
+            ).reset_index()
+            if "subannual" in df.columns:
+                df = df.drop("subannual", axis=1)
+
+        if not out_dir:
+            out_dir = package_data_path("report", "legacy", "reporting_output")
         else:
-            df.append(pp_utils.iamc_it(dfs[i], run_tables[i]["root"], mapping))
-    df = pd.concat(df, sort=True)
-
-    # --------------
-    # Process output
-    # --------------
-
-    # Ensure that only variables included in the template are included
-    # in the final output
-    df = df.loc[df.Variable.isin(allowed_var)]
-
-    # -------------------------------
-    # Merge with historical TS values
-    # -------------------------------
-
-    if merge_hist:
-        ix_upload = df.reset_index()
-        ix_upload = ix_upload.drop(["index", "Model", "Scenario"], axis=1)
-        ix_upload = ix_upload.rename(
-            columns={
-                "Region": "region",
-                "Variable": "variable",
-                "Unit": "unit",
-            }
-        )
-        col_yr = pp_utils.numcols(df)
-        model_year = int(
-            scen.set("cat_year", {"type_year": ["firstmodelyear"]})["year"]
-        )
-        ix_regions = {regions[n]: n for n in regions}
-        ix_upload.region = ix_upload.region.replace(ix_regions)
-        if run_history == "True":
-            cols = ["region", "variable", "unit"] + [int(yr) for yr in col_yr]
-        else:
-            cols = ["region", "variable", "unit"] + [
-                int(yr) for yr in col_yr if yr >= model_year
-            ]
-        ix_upload = ix_upload[cols]
-        # ix_mp._jobj.unlockRunid(11473)
-        scen.check_out(timeseries_only=True)
-        print("Starting to upload timeseries")
-        print(ix_upload.head())
-        scen.add_timeseries(ix_upload)
-        print("Finished uploading timeseries")
-        scen.commit("Reporting uploaded as timeseries")
-
-        df = scen.timeseries(iamc=True)
-        df = df.rename(
-            columns={
-                "model": "Model",
-                "scenario": "Scenario",
-                "region": "Region",
-                "variable": "Variable",
-                "unit": "Unit",
-            }
-        )
-        df["Model"] = model_nm
-        df["Scenario"] = scen_nm
-
-        df.Region = df.Region.map(reg_ts)
-        df = df.set_index(
-            ["Model", "Scenario", "Region", "Variable", "Unit"]
-        ).reset_index()
-        if "subannual" in df.columns:
-            df = df.drop("subannual", axis=1)
-
-    if not out_dir:
-        out_dir = package_data_path("report", "legacy", "reporting_output")
-    else:
-        out_dir = Path(out_dir)
-    if not out_dir.exists():
-        out_dir.mkdir()
-    pp_utils.write_xlsx(df, out_dir)
+            out_dir = Path(out_dir)
+        if not out_dir.exists():
+            out_dir.mkdir()
+        pp_utils.write_xlsx(df, out_dir)
@@ -1,9 +1,21 @@
 from . import pp_utils
+from .prefetch import Prefetch
 
 
 class PostProcess(object):
-    def __init__(self, ds, ix=True):
-        self.ds = ds
+    def __init__(self, ds, ix=True, prefetch=False):
+        """
+        Parameters
+        ----------
+        ds : ixmp.Scenario
+            Scenario from which data are retrieved.
+        ix : bool (optional, default = True)
+            Retrieve results from optimization (variables); otherwise, parameters.
+        prefetch : bool (optional, default = False)
+            Load each set, parameter, or variable once and answer filtered queries
+            from memory; see :class:`.Prefetch`.
+        """
+        self.ds = Prefetch(ds) if prefetch else ds
         self.ix = ix
 
     # Functions which retrieve a single input parameter
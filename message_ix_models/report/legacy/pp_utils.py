@@ -312,9 +312,9 @@ def _convert_units(df, unit_out):
     cols = [c for c in numcols(df) if c != "Vintage"]
     if cols:
         try:
-            df[cols] = df[cols].multiply(
-                df["Unit"].apply(lambda x: unit_conversion[x][unit_out]), axis=0
-            )
+            # Look up one factor for each distinct unit
+            factor = {u: unit_conversion[u][unit_out] for u in df["Unit"].unique()}
+            df[cols] = df[cols].multiply(df["Unit"].map(factor), axis=0)
         except Exception:
             print(
                 f"No unit conversion factor found to convert {df['Unit'].unique()[0]} to {unit_out}"
@@ -663,237 +663,7 @@ def _clean_up_regions(df, units=None):
     # Removes aggregate region 'WORLD'
     df = df[df["Region"] != "World"]
 
-    # for reg in list(regions.keys()):
-    for reg in regions.keys():
-        if reg not in df.Region.unique():
-            if "Technology" in df.columns:
-                for tec in df.Technology.unique():
-                    if "Mode" in df.columns:
-                        if "Vintage" in df.columns:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array(
-                                            [[reg, tec, units, firstmodelyear, "M1"]]
-                                        ),
-                                        columns=[
-                                            "Region",
-                                            "Technology",
-                                            "Unit",
-                                            "Vintage",
-                                            "Mode",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                        else:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units, "M1"]]),
-                                        columns=[
-                                            "Region",
-                                            "Technology",
-                                            "Unit",
-                                            "Mode",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                    elif "Unit" in df.columns:
-                        if "Vintage" in df.columns:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units, firstmodelyear]]),
-                                        columns=[
-                                            "Region",
-                                            "Technology",
-                                            "Unit",
-                                            "Vintage",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                        elif "Grade" in df.columns:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units, "a"]]),
-                                        columns=[
-                                            "Region",
-                                            "Technology",
-                                            "Unit",
-                                            "Grade",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                        else:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units]]),
-                                        columns=["Region", "Technology", "Unit"],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                    else:
-                        df = pd.concat(
-                            [
-                                pd.DataFrame(
-                                    np.array([[reg, tec]]),
-                                    columns=["Region", "Technology"],
-                                ),
-                                df,
-                            ],
-                            sort=True,
-                        )
-
-            elif "Commodity" in df.columns:
-                for tec in df.Commodity.unique():
-                    if "Mode" in df.columns:
-                        if "Vintage" in df.columns:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array(
-                                            [[reg, tec, units, firstmodelyear, "M1"]]
-                                        ),
-                                        columns=[
-                                            "Region",
-                                            "Commodity",
-                                            "Unit",
-                                            "Vintage",
-                                            "Mode",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                        else:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units, "M1"]]),
-                                        columns=["Region", "Commodity", "Unit", "Mode"],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                    else:
-                        if "Vintage" in df.columns:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units, firstmodelyear]]),
-                                        columns=[
-                                            "Region",
-                                            "Commodity",
-                                            "Unit",
-                                            "Vintage",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                        elif "Grade" in df.columns:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units, "a"]]),
-                                        columns=[
-                                            "Region",
-                                            "Commodity",
-                                            "Unit",
-                                            "Grade",
-                                        ],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-                        else:
-                            df = pd.concat(
-                                [
-                                    pd.DataFrame(
-                                        np.array([[reg, tec, units]]),
-                                        columns=["Region", "Commodity", "Unit"],
-                                    ),
-                                    df,
-                                ],
-                                sort=True,
-                            )
-            else:
-                if "Mode" in df.columns:
-                    if "Vintage" in df.columns:
-                        df = pd.concat(
-                            [
-                                pd.DataFrame(
-                                    np.array([[reg, units, firstmodelyear, "M1"]]),
-                                    columns=["Region", "Unit", "Vintage", "Mode"],
-                                ),
-                                df,
-                            ],
-                            sort=True,
-                        )
-                    else:
-                        df = pd.concat(
-                            [
-                                pd.DataFrame(
-                                    np.array([[reg, units, "M1"]]),
-                                    columns=["Region", "Unit", "Mode"],
-                                ),
-                                df,
-                            ],
-                            sort=True,
-                        )
-                else:
-                    if "Vintage" in df.columns:
-                        df = pd.concat(
-                            [
-                                pd.DataFrame(
-                                    np.array([[reg, units, firstmodelyear]]),
-                                    columns=["Region", "Unit", "Vintage"],
-                                ),
-                                df,
-                            ],
-                            sort=True,
-                        )
-                    elif "Grade" in df.columns:
-                        df = pd.concat(
-                            [
-                                pd.DataFrame(
-                                    np.array([[reg, units, "a"]]),
-                                    columns=["Region", "Unit", "Grade"],
-                                ),
-                                df,
-                            ],
-                            sort=True,
-                        )
-                    else:
-                        df = pd.concat(
-                            [
-                                pd.DataFrame(
-                                    np.array([[reg, units]]), columns=["Region", "Unit"]
-                                ),
-                                df,
-                            ],
-                            sort=True,
-                        )
+    df = _add_missing_regions(df, units)
 
     df.Region = df.Region.map(regions)
     if "Vintage" in df.columns:
@@ -902,6 +672,64 @@ def _clean_up_regions(df, units=None):
     return df.sort_index()
 
 
+def _add_missing_regions(df, units):
+    """Adds rows for regions which are missing from the dataframe.
+
+    For each missing region, one row is added for each technology or commodity, or a
+    single row if the dataframe has neither column. The added rows contain `units`,
+    the first model year as "Vintage", "M1" as "Mode", or "a" as "Grade", if the
+    dataframe has these columns; numerical columns are left empty.
+
+    All rows are added at once, in the same order as if each row were prepended to the
+    dataframe in turn.
+
+    Parameters
+    ----------
+    df : dataframe
+    units : string
+
+    Returns
+    -------
+    df : dataframe
+    """
+    cols = df.columns
+    key = next((c for c in ("Technology", "Commodity") if c in cols), None)
+
+    # Other columns of the added rows
+    if "Mode" in cols:
+        other = ["Unit", "Vintage", "Mode"] if "Vintage" in cols else ["Unit", "Mode"]
+    elif key == "Technology" and "Unit" not in cols:
+        other = []
+    elif "Vintage" in cols:
+        other = ["Unit", "Vintage"]
+    elif "Grade" in cols:
+        other = ["Unit", "Grade"]
+    else:
+        other = ["Unit"]
+    values = dict(Unit=units, Vintage=firstmodelyear, Mode="M1", Grade="a")
+    other_values = [values[c] for c in other]
+
+    present = set(df.Region.unique())
+    labels = df[key].unique().tolist() if key else [None]
+
+    rows = []
+    for reg in filter(lambda r: r not in present, regions.keys()):
+        for label in labels:
+            rows.append([reg] + ([label] if key else []) + other_values)
+        # Prepending rows reverses the order of labels seen for the next region
+        labels.reverse()
+
+    if not rows:
+        return df
+
+    added = pd.DataFrame(
+        np.array(rows[::-1]),
+        columns=["Region"] + ([key] if key else []) + other,
+        index=[0] * len(rows),
+    )
+    return pd.concat([added, df], sort=True)
+
+
 def _clean_up_vintage(ds, df, units=None):
     """Checks if a vintage year is found for each region.
 
@@ -958,13 +786,11 @@ def _clean_up_vintage(ds, df, units=None):
     unit = [units]
     if "Mode" in index:
         mode = df.Mode.unique().tolist()
-        idx = pd.MultiIndex.from_tuples(
-            list(itertools.product(reg, tec, unit, mode, all_years)), names=index
+        idx = pd.MultiIndex.from_product(
+            [reg, tec, unit, mode, all_years], names=index
         )
     else:
-        idx = pd.MultiIndex.from_tuples(
-            list(itertools.product(reg, tec, unit, all_years)), names=index
-        )
+        idx = pd.MultiIndex.from_product([reg, tec, unit, all_years], names=index)
     df_fill = pd.DataFrame(0, index=idx, columns=numcols(df)).reset_index()
     df_fill["Vintage"] = df_fill["Vintage"].apply(np.int64)
     df_fill["Vintage"] = df_fill["Vintage"].astype("object")
@@ -1149,12 +975,13 @@ def _drap(df, pivot_col, drop=None, add=None, group=None):
     # An exception has to be made for the column "Vintage" as this is included
     # in the numcols; in some case 'Vintage' will be used for the years and
     # can therefore be in pivot_col
+    num = numcols(df)
     df = df.pivot_table(
         pivot_col[0],
         [
             x
             for x in df.columns
-            if (x not in pivot_col and x not in numcols(df))
+            if (x not in pivot_col and x not in num)
             or (x == "Vintage" and x not in pivot_col)
         ],
         pivot_col[1],
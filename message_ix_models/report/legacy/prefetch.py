@@ -0,0 +1,181 @@
+"""Answer repeated, filtered queries for scenario data from data loaded once.
+
+The functions in :mod:`.pp_utils` query the same few parameters and variables—ACT,
+CAP, EMISS, input, output, etc.—thousands of times, each time with different filters.
+:class:`Prefetch` wraps a :class:`~message_ix.Scenario` so that each item is retrieved
+from the backend once, and filters are applied in memory.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from ixmp.util import as_str_list
+
+log = logging.getLogger(__name__)
+
+#: Columns of parameter or variable data that are not dimensions.
+VALUE_COLUMNS = {"value", "unit", "lvl", "mrg"}
+
+
+class _Item:
+    """All data for one set, parameter, or variable, with its dimensions factorized."""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.codes: dict[str, np.ndarray] = {}
+        self.labels: dict[str, pd.Index] = {}
+        for dim in data.columns:
+            if dim not in VALUE_COLUMNS:
+                self.codes[dim], self.labels[dim] = pd.factorize(data[dim])
+
+    def filter(self, filters: Optional[dict]) -> pd.DataFrame:
+        """Return the subset of data matching `filters`.
+
+        As in :func:`ixmp.util.filtered`, values in `filters` and in the data, for
+        instance :class:`int` years, are compared as :class:`str`.
+        """
+        if not filters:
+            return self.data.copy()
+
+        mask = np.ones(len(self.data), dtype=bool)
+        for dim, values in filters.items():
+            # Labels to keep; the final False applies to missing values, with code -1
+            labels = self.labels[dim].astype(str)
+            keep = np.append(labels.isin(as_str_list(values)), False)
+            mask &= keep[self.codes[dim]]
+
+        if not mask.any():
+            # Like the backend, and message_ix.Scenario, which does not convert the
+            # "year" dimensions of empty data to int
+            return self.data.iloc[:0].astype({dim: str for dim in self.codes})
+        return self.data[mask].reset_index(drop=True)
+
+
+class Prefetch:
+    """Wrap `scenario` to answer filtered queries from data loaded once.
+
+    On the first call to :meth:`par`, :meth:`var`, or :meth:`set` for a given item, all
+    its data are retrieved and stored, and the dimensions are factorized. This and
+    later calls for the same item are answered from the stored data, so the number of
+    backend queries does not depend on the number of filter combinations used. Any
+    other attribute is that of the wrapped `scenario`.
+
+    Instances can be used from several threads. Calls to methods of the wrapped
+    `scenario`, including loading data, are serialized; queries answered from stored
+    data are not.
+
+    The results are the same as those of the corresponding :class:`ixmp.Scenario`
+    methods, except that index sets (for which :meth:`ixmp.Scenario.set` returns a
+    :class:`~pandas.Series`) are not stored; queries for these always go to the backend.
+    """
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self._lock = threading.RLock()
+        self._items: dict[tuple[str, str], Optional[_Item]] = {}
+
+        #: For each (method, item name): the number of queries, and of those sent to
+        #: the backend; the time, in seconds, taken by the backend to answer the first
+        #: query, to load all the data, and to answer the others from memory.
+        self.stats: dict[tuple[str, str], dict] = defaultdict(
+            lambda: dict(queries=0, backend=0, first=0.0, load=0.0, memory=0.0)
+        )
+
+    def __getattr__(self, name):
+        if name in ("scenario", "_lock"):
+            raise AttributeError(name)  # Not yet initialized
+
+        value = getattr(self.scenario, name)
+        if not callable(value):
+            return value
+
+        @wraps(value)
+        def locked(*args, **kwargs):
+            with self._lock:
+                return value(*args, **kwargs)
+
+        return locked
+
+    def par(self, name: str, filters: Optional[dict] = None, **kwargs) -> pd.DataFrame:
+        """Return parameter data; see :meth:`ixmp.Scenario.par`."""
+        return self._get("par", name, filters, kwargs)
+
+    def var(self, name: str, filters: Optional[dict] = None, **kwargs) -> pd.DataFrame:
+        """Return variable data; see :meth:`ixmp.Scenario.var`."""
+        return self._get("var", name, filters, kwargs)
+
+    def set(self, name: str, filters: Optional[dict] = None, **kwargs):
+        """Return set elements; see :meth:`ixmp.Scenario.set`."""
+        return self._get("set", name, filters, kwargs)
+
+    def _get(self, method: str, name: str, filters: Optional[dict], kwargs: dict):
+        func = getattr(self.scenario, method)
+        key = (method, name)
+        if kwargs or self._items.get(key, False) is None:
+            with self._lock:
+                return func(name, filters, **kwargs)  # Not stored; use the backend
+
+        start = perf_counter()
+        item = self._items.get(key)
+        if item is None:
+            with self._lock:
+                if key not in self._items:
+                    return self._load(key, func, filters, start)
+                elif self._items[key] is None:
+                    return func(name, filters)  # Index set, loaded by another thread
+                item = self._items[key]
+
+        result = item.filter(filters)  # type: ignore [union-attr]
+        with self._lock:
+            self.stats[key]["queries"] += 1
+            self.stats[key]["memory"] += perf_counter() - start
+        return result
+
+    def _load(self, key, func, filters: Optional[dict], start: float):
+        """Answer the first query for `key` using the backend, then store all data."""
+        # Also answer the first query using the backend, to estimate the time saved
+        result = func(key[1], filters)
+        first = perf_counter() - start
+        data = result if filters is None else func(key[1])
+
+        if isinstance(data, pd.DataFrame):
+            self._items[key] = _Item(data)
+            self.stats[key].update(
+                queries=1,
+                backend=1 if filters is None else 2,
+                first=first,
+                load=perf_counter() - start - first,
+            )
+        else:
+            self._items[key] = None  # Index set; not stored
+
+        return result
+
+    def log_stats(self) -> None:
+        """Log the number of queries answered and an estimate of the time saved.
+
+        The estimate assumes that each query answered from memory would otherwise have
+        taken as long as the first query for the same item.
+        """
+        queries = backend = 0
+        saved = 0.0
+        for (method, name), s in sorted(self.stats.items()):
+            t = s["first"] + s["load"] + s["memory"]
+            log.debug(
+                f"{method}({name!r}): {s['queries']} queries in {t:.3f} s; "
+                f"first query {s['first']:.3f} s"
+            )
+            queries += s["queries"]
+            backend += s["backend"]
+            saved += s["queries"] * s["first"] - t
+
+        log.info(
+            f"Answered {queries} queries for {len(self.stats)} items with {backend} "
+            f"backend queries; estimated time saved {saved:.1f} s"
+        )
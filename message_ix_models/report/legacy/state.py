@@ -0,0 +1,95 @@
+"""State of one run of the legacy reporting."""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from .postprocess import PostProcess
+
+#: Held while a :class:`State` is installed, so that runs in different threads of the
+#: same process do not see each other's state.
+_LOCK = threading.RLock()
+
+
+@dataclass
+class State:
+    """State of one run of :func:`.iamc_report_hackathon.report`.
+
+    :mod:`.pp_utils` and the modules that define reporting tables, such as
+    :mod:`.default_tables`, read this state from module-level variables of the same
+    names. Use :meth:`install` to set these for the duration of a run.
+
+    The state must not be modified while tables are evaluated, so that tables can be
+    evaluated concurrently in several threads; see :func:`evaluate_tables`.
+    """
+
+    # Read by the table modules
+
+    #: Data retrieval for the scenario.
+    pp: "PostProcess"
+
+    #: Model units and unit conversion expressions.
+    mu: dict
+
+    #: "True" to report historical data ("reference solution").
+    run_history: Any = False
+
+    #: Paths to data files, or :any:`False`.
+    urban_perc_data: Any = None
+    kyoto_hist_data: Any = None
+    lu_hist_data: Any = None
+
+    # Read by pp_utils
+
+    #: Conversion factors between units.
+    unit_conversion: Optional[dict] = None
+
+    #: Years to report, and all years of the scenario.
+    years: Optional[list] = None
+    all_years: Optional[list] = None
+
+    firstmodelyear: Optional[int] = None
+    all_tecs: Any = None
+
+    #: Mapping from model node codes to region names in the output.
+    regions: Optional[dict] = None
+    region_id: Optional[str] = None
+    globalname: Optional[str] = None
+
+    #: Model and scenario names in the output.
+    model_nm: Optional[str] = None
+    scen_nm: Optional[str] = None
+
+    verbose: bool = False
+
+    @contextmanager
+    def install(self, *table_modules: ModuleType) -> Iterator["State"]:
+        """Set the module-level variables of :mod:`.pp_utils` and `table_modules`.
+
+        The previous values are restored on exit.
+        """
+        from . import pp_utils
+
+        names = {f.name for f in fields(self)}
+        table_names = ("pp", "mu", "run_history") + tuple(
+            n for n in names if n.endswith("_data")
+        )
+        targets = [(pp_utils, names.difference(table_names))] + [
+            (m, table_names) for m in table_modules
+        ]
+
+        with _LOCK:
+            saved = [(m, {n: getattr(m, n, None) for n in ns}) for m, ns in targets]
+            try:
+                for module, ns in targets:
+                    for name in ns:
+                        setattr(module, name, getattr(self, name))
+                yield self
+            finally:
+                for module, values in saved:
+                    for name, value in values.items():
+                        setattr(module, name, value)
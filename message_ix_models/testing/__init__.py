@@ -231,6 +231,19 @@ def mix_models_cli(session_context, tmp_env):
     yield CliRunner(cli.main, cli.__name__, env=tmp_env)
 
 
+@pytest.fixture
+def file_platform(tmp_path, test_context):
+    """Name of a platform stored in files, so that other processes can access it."""
+    name = "message-ix-models-file"
+    ixmp_config.add_platform(name, "jdbc", "hsqldb", tmp_path.joinpath("db"))
+    ixmp_config.save()
+    try:
+        yield name
+    finally:
+        ixmp_config.remove_platform(name)
+        ixmp_config.save()
+
+
 # Testing utility functions
 
 
@@ -1,7 +1,14 @@
 import logging
+import pickle
+import re
 
+import pandas as pd
+import pandas.testing as pdt
 import pytest
+from message_ix import make_df
+from message_ix.testing import make_dantzig
 
+from message_ix_models import Context, ScenarioInfo
 from message_ix_models.model.material import build
 from message_ix_models.model.structure import get_codes
 from message_ix_models.testing import bare_res
@@ -56,3 +63,129 @@ def test_build_bare_res(
         # # Use Reporting calculations to check the result
         # result = report.check(scenario)
         # assert result.all(), f"\n{result}"
+
+
+def _data_a(scenario) -> dict:
+    """Generate data using only the structure of `scenario`."""
+    info = ScenarioInfo(scenario)
+    return dict(
+        inv_cost=make_df(
+            "inv_cost",
+            node_loc=info.N[1],
+            technology="canning_plant",
+            year_vtg=info.y0,
+            value=10.0,
+            unit="USD/case",
+        ),
+        var_cost=make_df(
+            "var_cost",
+            node_loc=info.N[1],
+            technology="canning_plant",
+            year_vtg=info.y0,
+            year_act=info.y0,
+            mode="production",
+            time="year",
+            value=1.0,
+            unit="USD/case",
+        ),
+        fix_cost=pd.DataFrame(),  # Empty; not added
+    )
+
+
+def _data_b(scenario) -> dict:
+    """Generate data with a method that is not available from ScenarioSnapshot."""
+    scenario.has_solution()
+    return dict(
+        var_cost=make_df(
+            "var_cost",
+            node_loc="san-diego",
+            technology="canning_plant",
+            year_vtg=1963,
+            year_act=1963,
+            mode="production",
+            time="year",
+            value=2.0,
+            unit="USD/case",
+        )
+    )
+
+
+def _data_c(scenario) -> dict:
+    """Generate data from data added by :func:`_data_a` and from a Context setting."""
+    factor = 2.0 if Context.get_instance(-1).model.regions == "ZMB" else 1.0
+    df = scenario.par("inv_cost", filters=dict(technology="canning_plant"))
+    return dict(
+        fix_cost=make_df(
+            "fix_cost",
+            node_loc=df["node_loc"],
+            technology=df["technology"],
+            year_vtg=df["year_vtg"],
+            year_act=df["year_vtg"],
+            value=factor * df["value"],
+            unit=df["unit"],
+        )
+    )
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_add_data(caplog, monkeypatch, test_context, max_workers) -> None:
+    s = make_dantzig(test_context.get_platform())
+    monkeypatch.setattr(build, "DATA_FUNCTIONS", [_data_a, _data_b])
+
+    caplog.set_level(logging.INFO, logger=build.__name__)
+    with s.transact():
+        build.add_data(s, max_workers=max_workers)
+
+    # Data from both functions were added
+    assert {"seattle": 1.0, "san-diego": 2.0} == s.par(
+        "var_cost", filters=dict(technology="canning_plant", year_act=1963)
+    ).set_index("node_loc")["value"].to_dict()
+
+    # Time per function is logged
+    assert re.search(r"Time per function:\n .* s  _data_a\(\)", caplog.text)
+    if max_workers:
+        assert "_data_b() requires Scenario.has_solution; call in main" in caplog.text
+
+
+def test_add_data_parallel(monkeypatch, test_context) -> None:
+    """Data added with and without `max_workers` are identical."""
+    monkeypatch.setattr(build, "DATA_FUNCTIONS", [_data_a, _data_c, _data_b])
+    # A non-default setting
+    test_context.model.regions = "ZMB"
+
+    mp = test_context.get_platform()
+    result = []
+    for max_workers in (None, 2):
+        s = make_dantzig(mp)
+        with s.transact():
+            build.add_data(s, max_workers=max_workers)
+        result.append({name: s.par(name) for name in ("fix_cost", "var_cost")})
+
+    for name, df in result[0].items():
+        pdt.assert_frame_equal(df, result[1][name])
+
+    # _data_c() sees data added by _data_a() and the Context setting
+    assert [20.0] == result[1]["fix_cost"]["value"].tolist()
+
+
+def test_scenario_snapshot(test_context) -> None:
+    s = make_dantzig(test_context.get_platform())
+    snapshot = pickle.loads(pickle.dumps(build.ScenarioSnapshot(s)))
+
+    # ScenarioInfo can be created from the snapshot
+    info = ScenarioInfo(snapshot)
+    assert ScenarioInfo(s).N == info.N and ScenarioInfo(s).yv_ya.equals(info.yv_ya)
+
+    # Data stored in the snapshot can be retrieved, with filters
+    pdt.assert_frame_equal(
+        s.par("duration_period", filters=dict(year=[1963])),
+        snapshot.par("duration_period", year=[1963]),
+    )
+
+    # Data or methods not stored raise NotInSnapshot
+    with pytest.raises(build.NotInSnapshot):
+        snapshot.par("demand")
+    with pytest.raises(build.NotInSnapshot):
+        snapshot.par("bound_activity_up", filters=dict(technology=["GDP", "coal"]))
+    with pytest.raises(build.NotInSnapshot):
+        snapshot.init_par("foo", ["node"])
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from message_ix_models.model.material.material_demand import material_demand_calc
+from message_ix_models.model.material.material_demand.material_demand_calc import (
+    fit_demand_params,
+    fitting_dict,
+    project_demand,
+)
+
+
+@pytest.fixture
+def hist_data(monkeypatch) -> pd.DataFrame:
+    """Synthetic historical data, used in place of :func:`.read_hist_mat_demand`."""
+    rng = np.random.default_rng(seed=0)
+    gdp_pcap = rng.uniform(1e3, 5e4, size=200)
+    del_t = rng.integers(-40, 10, size=200)
+    df = pd.DataFrame(
+        dict(
+            gdp_pcap=gdp_pcap,
+            del_t=del_t,
+            cons_pcap=fitting_dict["steel"]["function"](
+                (gdp_pcap, del_t), 600, -10000, 0.01
+            )
+            * rng.normal(1, 0.01, size=200),
+        )
+    )
+    monkeypatch.setattr(material_demand_calc, "read_hist_mat_demand", lambda m: df)
+    monkeypatch.setattr(material_demand_calc, "_PARAMS", {})
+    return df
+
+
+def test_fit_demand_params(hist_data) -> None:
+    # Function runs for all materials at once
+    result = fit_demand_params(["steel", "cement", "aluminum"], "normal")
+    assert {"steel", "cement", "aluminum"} == set(result)
+    np.testing.assert_allclose([600, -10000, 0.01], result["steel"], rtol=0.05)
+
+    # Parameters are adjusted for the mode; fits are stored in memory
+    assert 3 == len(material_demand_calc._PARAMS)
+    high = fit_demand_params(["steel"], "high")["steel"]
+    np.testing.assert_allclose(result["steel"] * [1.3, 1, 1], high)
+    assert 4 == len(material_demand_calc._PARAMS)
+
+    # Stored parameters are not modified through the returned values
+    result["steel"] *= 0
+    assert 0 != fit_demand_params(["steel"], "normal")["steel"][0]
+    assert 4 == len(material_demand_calc._PARAMS)
+
+
+def test_project_demand() -> None:
+    # Regions in arbitrary order; the first row for R12_C has a missing value
+    df = pd.DataFrame(
+        dict(
+            region=["R12_B", "R12_A", "R12_C", "R12_B", "R12_A", "R12_C"],
+            year=[2020, 2020, 2020, 2050, 2050, 2050],
+            **{
+                "demand.tot.base": [20.0, 5.0, np.nan, 20.0, 5.0, 1.0],
+                "pop.mil": [100.0, 50.0, 10.0, 200.0, 40.0, 10.0],
+                "demand_pcap0": [150.0, 120.0, 100.0, 300.0, 80.0, 100.0],
+            },
+        )
+    )
+
+    # Per-capita demand converges from the base year value, e.g. 20e9 / 100e6 = 200
+    # for R12_B, to demand_pcap0 + (200 - 150) × gompertz(9, 0.1, year). Base values
+    # are from the first row of each region, so R12_C has no result. Rows are in the
+    # same order as `df`.
+    expected = df[["region", "year"]].assign(
+        demand_tot=[19.999383, 5.000123, np.nan, 63.611487, 2.911081, np.nan]
+    )
+    pdt.assert_frame_equal(expected, project_demand(df, 9, 0.1))
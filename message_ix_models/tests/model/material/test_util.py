@@ -0,0 +1,102 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from message_ix_models.model.material import util
+from message_ix_models.model.material.util import read_excel
+
+
+@pytest.fixture
+def xlsx_path(tmp_path):
+    """Synthetic workbook with two sheets."""
+    path = tmp_path.joinpath("data.xlsx")
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(
+            dict(node=["R12_AFR", "R12_CHN"], year=[2020, 2025], value=[1.5, None])
+        ).to_excel(writer, sheet_name="a", index=False)
+        # Mixed types in one column; duplicate column labels
+        pd.DataFrame([["x", 1, 2.0], [3, "y", 4.0]], columns=["c", "c", 2020]).to_excel(
+            writer, sheet_name="b", index=False
+        )
+    return path
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    (
+        dict(),
+        dict(sheet_name="b"),
+        dict(sheet_name="a", index_col=0),
+        dict(sheet_name=None),
+        dict(sheet_name=["b", 0]),
+    ),
+)
+def test_read_excel(monkeypatch, test_context, tmp_path, xlsx_path, kwargs) -> None:
+    test_context.core.cache_path = tmp_path.joinpath("cache")
+    monkeypatch.setattr(util, "_DIGEST", {})
+
+    expected = pd.read_excel(xlsx_path, **kwargs)
+
+    def assert_equal(result) -> None:
+        if isinstance(expected, dict):
+            assert expected.keys() == result.keys()
+            for k in expected:
+                pdt.assert_frame_equal(expected[k], result[k])
+        else:
+            pdt.assert_frame_equal(expected, result)
+
+    # First read parses the file and fills the cache
+    assert_equal(read_excel(xlsx_path, **kwargs))
+    cached = sorted(test_context.get_cache_path("material-excel").glob("data-*"))
+    assert len(cached)
+
+    # Second read uses the cache: the workbook is not parsed again
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_excel", None)
+        m.setattr(pd, "ExcelFile", None)
+        assert_equal(read_excel(xlsx_path, **kwargs))
+
+    # Modified files are parsed again
+    pd.DataFrame([[0]]).to_excel(xlsx_path, sheet_name="a")
+    read_excel(xlsx_path, sheet_name="a")
+    assert len(cached) < len(
+        list(test_context.get_cache_path("material-excel").glob("data-*"))
+    )
+
+
+def test_read_excel_unreadable(caplog, monkeypatch, test_context, tmp_path, xlsx_path):
+    """Cache files that cannot be read are discarded and written again."""
+    test_context.core.cache_path = tmp_path.joinpath("cache")
+    monkeypatch.setattr(util, "_DIGEST", {})
+
+    expected = read_excel(xlsx_path, sheet_name=None)
+
+    # Truncate all cache files, e.g. as if written partially
+    cached = sorted(test_context.get_cache_path("material-excel").glob("data-*"))
+    assert 3 == len(cached)  # sheets.json, and one file per sheet
+    for p in cached:
+        p.write_bytes(p.read_bytes()[:5])
+
+    result = read_excel(xlsx_path, sheet_name=None)
+    assert expected.keys() == result.keys()
+    for k in expected:
+        pdt.assert_frame_equal(expected[k], result[k])
+    assert 3 == caplog.text.count("Discard unreadable cache file")
+
+    # Files were written again and can be read
+    caplog.clear()
+    read_excel(xlsx_path, sheet_name=None)
+    assert "Discard" not in caplog.text
+
+
+def test_write_sheet_concurrent(tmp_path) -> None:
+    """Concurrent writes of the same cache entry do not interfere."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    df = pd.DataFrame(dict(a=range(10_000), b=1.0))
+    base = tmp_path.joinpath("data-0123-4567")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: util._write_sheet(df, base), range(32)))
+
+    # Only the complete file remains
+    assert [base.with_suffix(".arrow")] == list(tmp_path.iterdir())
@@ -1,7 +1,11 @@
 import logging
+import re
 import sys
 
+import pandas.testing as pdt
 import pytest
+from message_ix import Scenario
+from message_ix.testing import make_dantzig
 
 from message_ix_models.model import snapshot
 from message_ix_models.testing import GHA
@@ -16,3 +20,25 @@ log = logging.getLogger(__name__)
 @pytest.mark.snapshot
 def test_load(test_context, loaded_snapshot):
     assert loaded_snapshot.model == "MESSAGEix-GLOBIOM_1.1_R11_no-policy"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_read_excel(caplog, tmp_path, test_context, max_workers) -> None:
+    mp = test_context.get_platform()
+    s0 = make_dantzig(mp)
+    path = tmp_path.joinpath("dantzig.xlsx")
+    s0.to_excel(path)
+
+    caplog.set_level(logging.INFO, logger=snapshot.__name__)
+
+    for i in range(2):
+        s1 = Scenario(mp, "test_read_excel", f"{max_workers}-{i}", version="new")
+        snapshot.read_excel(s1, path, max_workers=max_workers, parquet=True)
+
+        # Parameter data are identical
+        for name in ("bound_activity_up", "demand", "input", "output", "var_cost"):
+            pdt.assert_frame_equal(s0.par(name), s1.par(name))
+
+    # Parquet files were written and used
+    assert tmp_path.joinpath("dantzig", "demand.parquet").exists()
+    assert re.search(r"demand: 3 rows; read .* s, add_par .* s", caplog.text)
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from message_ix_models.model.water.data.pre_processing.hydro_agg_raster import (
+    DIS_FACTOR,
+    FLUX_FACTOR,
+    Config,
+    aggregate,
+    basin_weights,
+)
+
+N_BASINS = 3
+
+
+@pytest.fixture
+def config(tmp_path) -> Config:
+    """Synthetic gridded data for 2 models, 1 scenario, and 2 variables."""
+    rng = np.random.default_rng(seed=0)
+    lat, lon = np.arange(4.0), np.arange(5.0)
+    coords = dict(lat=lat, lon=lon)
+
+    # Basin numbers; cells outside any basin are 0 or NaN
+    basins = np.array(rng.integers(0, N_BASINS + 1, (4, 5)), dtype=float)
+    basins[0, 0] = np.nan
+    basins[1, 1] = 1  # Values in this cell are missing; see below
+    xr.DataArray(basins, coords=coords, dims=("lat", "lon"), name="basin").to_netcdf(
+        tmp_path.joinpath("basins.nc"), engine="scipy"
+    )
+    xr.DataArray(
+        rng.uniform(1, 2, (4, 5)), coords=coords, dims=("lat", "lon"), name="area"
+    ).to_netcdf(tmp_path.joinpath("area.nc"), engine="scipy")
+
+    # Two files for each model and variable
+    for model in ("m1", "m2"):
+        d = tmp_path.joinpath("input", model, "future")
+        d.mkdir(parents=True)
+        for var in ("qtot", "dis"):
+            for start, periods in (("2015-01-31", 72), ("2021-01-31", 48)):
+                time = pd.date_range(start, periods=periods, freq="ME")
+                values = rng.uniform(0, 1, (periods, 4, 5))
+                values[:, 1, 1] = np.nan
+                xr.DataArray(
+                    values,
+                    coords=dict(time=time, **coords),
+                    dims=("time", "lat", "lon"),
+                    name=var,
+                ).to_dataset().to_netcdf(
+                    d.joinpath(f"cwatm_{model}_ssp126_{var}_monthly_{start[:4]}.nc"),
+                    engine="scipy",
+                )
+
+    return Config(
+        input_dir=tmp_path.joinpath("input"),
+        output_dir=tmp_path.joinpath("output"),
+        area=tmp_path.joinpath("area.nc"),
+        basins=tmp_path.joinpath("basins.nc"),
+        n_basins=N_BASINS,
+        models=["m1", "m2"],
+        scenarios=["ssp126"],
+        variables=["qtot", "dis"],
+        time_chunk=20,
+    )
+
+
+def test_basin_weights() -> None:
+    basins = xr.DataArray([[1, 0], [1, 2]], dims=("lat", "lon"))
+    w = basin_weights(basins, 3)
+    np.testing.assert_array_equal([[1, 0, 1, 0], [0, 0, 0, 1], [0] * 4], w.toarray())
+    w = basin_weights(basins, 3, mean=True)
+    np.testing.assert_array_equal([0.5, 0, 0.5, 0], w.toarray()[0])
+
+
+@pytest.mark.parametrize("monthly", (True, False))
+def test_aggregate(config, monthly) -> None:
+    config.monthly = monthly
+
+    paths = aggregate(config)
+    assert 4 == len(paths)
+    assert all(p.exists() for p in paths)
+
+    # Reference: aggregate with xarray for one model and each variable
+    basins = xr.open_dataarray(config.basins).fillna(0)
+    for variable in config.variables:
+        ds = xr.open_mfdataset(sorted(config.input_files("m2", "ssp126", variable)))
+        if variable == "dis":
+            # Mean of cells that are not NaN
+            values = ds[variable] * DIS_FACTOR
+            func, min_periods = "mean", None
+        else:
+            values = ds[variable] * xr.open_dataarray(config.area) * FLUX_FACTOR
+            func, min_periods = "sum", 1
+        expected = pd.DataFrame(
+            {
+                b: getattr(values.where(basins == b + 1), func)(["lat", "lon"])
+                for b in range(3)
+            },
+            index=values.indexes["time"],
+        )
+        if not monthly:
+            expected = (
+                expected.resample("YE")
+                .mean()
+                .rolling(20, min_periods=min_periods)
+                .mean()
+                .resample("5YE")
+                .mean()
+            )
+            expected.index += pd.offsets.YearEnd(4)
+
+        result = pd.read_csv(config.output_path("m2", "ssp126", variable), index_col=0)
+        assert (3, len(expected)) == result.shape
+        assert expected.index.strftime("%Y-%m-%d").tolist() == result.columns.tolist()
+        np.testing.assert_allclose(expected.T.values, result.values)
+
+    # Existing outputs are not computed again, also with several workers
+    config.n_workers = 2
+    config.output_path("m1", "ssp126", "dis").unlink()
+    assert [config.output_path("m1", "ssp126", "dis")] == aggregate(config)
+
+
+def test_aggregate_historical(config) -> None:
+    # Historical input files: same as the future ones, without scenario names
+    for path in config.input_dir.glob("*/future/*.nc"):
+        d = path.parent.parent.joinpath("historical")
+        d.mkdir(exist_ok=True)
+        d.joinpath(path.name.replace("ssp126_", "")).symlink_to(path)
+    config.data = "historical"
+    config.scenarios = ["ssp126", "ssp370"]
+
+    # Each model and variable is aggregated once, not once per scenario
+    paths = aggregate(config)
+    assert {
+        config.output_path(m, "ssp126", v)
+        for m in ("m1", "m2")
+        for v in ("qtot", "dis")
+    } == set(paths)
@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
 import pytest
 from message_ix import Scenario
 
@@ -7,7 +10,78 @@ from message_ix_models.model.water.data.demands import (
     add_irrigation_demand,
     add_sectoral_demands,
     add_water_availability,
+    get_basin_sizes,
+    target_rate,
+    target_rate_trt,
 )
+from message_ix_models.util import package_data_path
+
+
+@pytest.fixture(scope="module")
+def basin() -> pd.DataFrame:
+    """Basins "A", with mostly "DEV" countries, and "B", with mostly "IND"."""
+    return pd.DataFrame(
+        [("A", "DEV"), ("A", "DEV"), ("A", "IND"), ("B", "DEV"), ("B", "IND")]
+        + [("B", "IND")],
+        columns=["BCU_name", "STATUS"],
+    )
+
+
+def test_get_basin_sizes(basin) -> None:
+    assert (2, 1) == tuple(get_basin_sizes(basin, "A"))
+    assert (0, 0) == tuple(get_basin_sizes(basin, "not a basin"))
+
+    basin = pd.read_csv(
+        package_data_path("water", "delineation", "basins_country_R11.csv")
+    )
+    assert (6, 16) == tuple(get_basin_sizes(basin, "105|FSU"))
+
+
+def test_target_rate(basin) -> None:
+    df = pd.DataFrame(
+        [
+            ("A", 2030, 0.5),
+            ("A", 2035, 0.6),
+            ("A", 2040, 0.95),
+            ("A", 2040, np.nan),
+            ("B", 2030, 0.5),
+            ("B", 2030, 0.95),
+            ("B", 2035, 0.5),
+            # Not in `basin`: same as "A"
+            ("C", 2030, 0.1),
+            ("C", 2040, 0.1),
+        ],
+        columns=["node", "year", "value"],
+    )
+
+    result = target_rate(df.copy(), basin, 0.9)
+
+    # - "A" and "C", with at least as many "DEV" as "IND": 2030 target is `val`.
+    # - "B": 2035 target is the mean of the first 2030 value and `val`; 2040 target is
+    #   `val`.
+    # - Values greater than the target, and missing values, are unchanged.
+    expected = df.assign(value=[0.9, 0.6, 0.95, np.nan, 0.5, 0.95, 0.7, 0.9, 0.1])
+    pdt.assert_frame_equal(expected, result)
+
+
+def test_target_rate_trt(basin) -> None:
+    df = pd.DataFrame(
+        [
+            ("A", 2030, 0.5, "year"),
+            ("A", 2040, 0.6, "year"),
+            ("B", 2025, 0.2, "year"),
+            ("B", 2030, 0.2, "year"),
+            ("B", 2050, np.nan, "year"),
+        ],
+        columns=["node", "year", "value", "time"],
+    )
+
+    result = target_rate_trt(df, basin)
+
+    # Untreated fraction is halved from 2040 in developing "A", and from 2030 in
+    # developed "B"; the "value" column is last
+    expected = df[["node", "year", "time"]].assign(value=[0.5, 0.8, 0.2, 0.6, np.nan])
+    pdt.assert_frame_equal(expected, result)
 
 
 @add_sectoral_demands.minimum_version
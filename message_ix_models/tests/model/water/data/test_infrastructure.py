@@ -1,12 +1,52 @@
+import numpy as np
+import pandas as pd
 import pytest
 from message_ix import Scenario
 
 from message_ix_models import ScenarioInfo
 from message_ix_models.model.structure import get_codes
+from message_ix_models.model.water.data import infrastructure
 from message_ix_models.model.water.data.infrastructure import (
     add_desalination,
     add_infrastructure_techs,
 )
+from message_ix_models.model.water.utils import map_yv_ya_lt
+
+#: Synthetic contents of :file:`water_distribution.xlsx`.
+DISTRIBUTION = pd.DataFrame(
+    [
+        ["urban_t_d", "freshwater", "water_supply", 1.0, 1.1, 20, "urban_mw", "final"],
+        ["urban_t_d", "electr", "final", 0.5, 0.6, 20, np.nan, np.nan],
+        ["rural_t_d", "freshwater", "water_supply", 1.0, 1.1, 30, "rural_mw", "final"],
+        ["urban_sewerage", "urban_collected_wst", "final", 1, 1, 20, "x", "y"],
+        ["urban_sewerage", "electr", "final", 0.1, 0.1, 20, np.nan, np.nan],
+        ["urban_recycle", "urban_collected_wst", "final", 1, 1, 10, "x", "z"],
+    ],
+    columns=[
+        "tec",
+        "incmd",
+        "inlvl",
+        "value_mid",
+        "value_high",
+        "technical_lifetime_mid",
+        "outcmd",
+        "outlvl",
+    ],
+).assign(
+    out_value_mid=1.0,
+    capacity_factor_mid=1.0,
+    investment_mid=[100.0, np.nan, 200.0, 300.0, np.nan, 400.0],
+    fix_cost_mid=[1.0, np.nan, 2.0, 3.0, np.nan, 4.0],
+    var_cost_mid=[0.1, np.nan, 0.2, 0.3, np.nan, 0.4],
+    var_cost_high=[0.5, np.nan, 0.6, 0.7, np.nan, 0.8],
+)
+
+
+@pytest.fixture
+def distribution(monkeypatch) -> pd.DataFrame:
+    """Use :data:`DISTRIBUTION` in place of the data file."""
+    monkeypatch.setattr(infrastructure.pd, "read_excel", lambda path: DISTRIBUTION)
+    return DISTRIBUTION
 
 
 # NB: This also tests start_creating_input_dataframe() and prepare_input_dataframe()
@@ -85,6 +125,65 @@ def test_add_infrastructure_techs(test_context, SDG, request):
     )
 
 
+@pytest.mark.parametrize("SDG", ["baseline", "not_baseline"])
+def test_add_infrastructure_techs_data(test_context, distribution, SDG, request):
+    test_context.SDG = SDG
+    test_context.time = ["year"]
+    test_context.type_reg = "country"
+    test_context.regions = "ZMB"
+    test_context.map_ISO_c = {"ZMB": "ZMB"}
+
+    s = Scenario(
+        test_context.get_platform(),
+        model=f"{request.node.name}/test water model",
+        scenario=f"{request.node.name}/test water scenario",
+        version="new",
+    )
+    s.add_horizon(year=[2020, 2030, 2040])
+    s.add_set("technology", ["tech1"])
+    s.commit(comment="basic water add_infrastructure_techs test model")
+    test_context.set_scenario(s)
+    test_context["water build info"] = ScenarioInfo(s)
+
+    result = add_infrastructure_techs(context=test_context)
+
+    N_node = len(
+        pd.read_csv(
+            infrastructure.package_data_path(
+                "water", "delineation", "basins_by_region_simpl_ZMB.csv"
+            )
+        )
+    )
+    year_wat = (2010, 2015, 2020, 2030, 2040)
+
+    def size(lt):
+        return N_node * len(map_yv_ya_lt(year_wat, lt, 2020))
+
+    # Distribution technologies have input, output and var_cost in mode "Mf" and, in
+    # the baseline, also in "M1"
+    modes = {"M1", "Mf"} if SDG == "baseline" else {"Mf"}
+    for name in "input", "output", "var_cost":
+        df = result[name]
+        assert modes == set(df.query("technology == 'rural_t_d'")["mode"])
+        assert {"M1"} == set(df.query("technology == 'urban_recycle'")["mode"])
+
+    # Each technology has data for the (yv, ya) given its own lifetime, once per mode
+    df = result["input"].query("technology == 'rural_t_d' and mode == 'Mf'")
+    assert size(30) == len(df) and {1.1} == set(df["value"])
+    df = result["input"].query("technology == 'urban_t_d' and commodity == 'electr'")
+    assert len(modes) * size(1) == len(df)
+    df = result["output"].query("technology == 'urban_recycle'")
+    assert size(10) == len(df)
+    assert (df["node_loc"] == df["node_dest"]).all()
+
+    # fix_cost for non-distribution technologies only; one value per key
+    df = result["fix_cost"]
+    assert {"urban_sewerage", "urban_recycle"} == set(df["technology"])
+    assert size(20) + size(10) == len(df)
+    df = result["var_cost"].query("technology == 'urban_sewerage'")
+    assert size(20) == len(df) and {0.3} == set(df["value"])
+
+
 def test_add_desalination(test_context, request):
     # FIXME You probably want this to be part of a common setup rather than writing
     # something like this for every test
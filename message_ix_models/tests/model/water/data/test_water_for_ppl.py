@@ -1,6 +1,10 @@
+import logging
+from time import perf_counter
 from typing import Optional
 
+import numpy as np
 import pandas as pd
+import pandas.testing as pdt
 import pytest
 from message_ix import Scenario
 
@@ -8,12 +12,44 @@ from message_ix_models import ScenarioInfo, testing
 
 # from message_ix_models.model.structure import get_codes
 from message_ix_models.model.water.data.water_for_ppl import (
+    HIST_YEARS,
+    MISSING_TECH,
     apply_act_cap_multiplier,
     cool_tech,
+    cooling_fr,
     cooling_shares_SSP_from_yaml,
+    hist_input_cool,
+    missing_tech,
     non_cooling_tec,
+    shares,
 )
 
+NODES = [f"R11_{n}" for n in "AFR CPA EEU FSU LAM MEA NAM PAO PAS SAS WEU".split()]
+COOLING = ["ot_fresh", "cl_fresh", "air", "ot_saline"]
+
+log = logging.getLogger(__name__)
+
+
+def _input_cool(N: int) -> pd.DataFrame:
+    """Synthetic input data of cooling technologies, with `N` + 9 parents."""
+    rng = np.random.default_rng(seed=0)
+    parents = list(MISSING_TECH) + [f"tech{i}" for i in range(N)]
+    df = pd.DataFrame(
+        [
+            (f"{p}__{c}", p, n, y)
+            for p in parents
+            for c in COOLING
+            for n in NODES
+            for y in rng.choice(HIST_YEARS + [2015], 3, replace=False)
+        ],
+        columns=["technology_name", "parent_tech", "node_loc", "year_act"],
+    )
+    return df.assign(
+        year_vtg=df["year_act"].where(rng.random(len(df)) < 0.9, 2000),
+        value=rng.uniform(0.5, 3, len(df)),
+        level=rng.choice(["secondary", "cooling"], len(df)),
+    )
+
 
 @cool_tech.minimum_version
 @pytest.mark.parametrize("RCP", ["no_climate", "6p0"])
@@ -278,3 +314,123 @@ def test_cooling_shares_SSP_from_yaml(request, test_context, SSP, regions):
     assert isinstance(result, pd.DataFrame), "Result should be a DataFrame"
     assert not result.empty, "Resulting DataFrame should not be empty"
     assert result["year_act"].min() >= 2050  # Validate year constraint
+
+
+def test_missing_tech() -> None:
+    df = pd.DataFrame(
+        [
+            ("geo_hpl__ot_fresh", 2.0, "cooling"),
+            ("nuc_lc__air", 0.5, "secondary"),
+            ("coal_ppl__air", 2.0, "cooling"),
+            (np.nan, 1.5, "cooling"),
+        ],
+        columns=["technology", "value", "level"],
+    )
+
+    result = missing_tech(df)
+
+    # - Values for matching technologies replaced, unless below 1 and larger
+    # - Level "cooling" of matching technologies replaced
+    expected = pd.DataFrame(
+        dict(
+            value=[1 / 0.850, 1 / 0.326, 2.0, 1.5],
+            level=["dummy_supply", "secondary", "cooling", "cooling"],
+        )
+    )
+    pdt.assert_frame_equal(expected, result)
+
+
+def test_cooling_fr() -> None:
+    df = pd.DataFrame(dict(parent_tech=["bio_hpl", "coal_ppl"], value=[2.0, 3.0]))
+    assert [1.0, 1.7] == cooling_fr(df).round(6).tolist()
+    assert [0.8, 1.7] == cooling_fr(df[["value"]]).round(6).tolist()
+
+
+def test_shares(caplog, test_context) -> None:
+    test_context.type_reg = "global"
+    nodes = ["R11_A", "R11_B"]
+    cost = pd.DataFrame(
+        dict(
+            utype=["t1", "t1"],
+            technology=["t1__air", "t1__ot_fresh"],
+            R11_A=[1.0, 2.0],
+            R11_B=[3.0, 4.0],
+        )
+    )
+    hold_df = pd.DataFrame(
+        [
+            ("R11_A", "t1__air", 0.5),
+            # Only the first cooling fraction for each node and technology is used
+            ("R11_A", "t1__air", 0.9),
+            ("R11_B", "t1__ot_fresh", 0.25),
+        ],
+        columns=["node_loc", "technology_name", "cooling_fraction"],
+    )
+
+    with caplog.at_level(logging.INFO):
+        result = shares(cost, test_context, nodes, hold_df, list(cost.columns))
+
+    # Shares are multiplied by cooling fractions, or 0 where there are none
+    pdt.assert_frame_equal(cost.assign(R11_A=[0.5, 0.0], R11_B=[0.0, 1.0]), result)
+
+    # Only the missing combinations are logged
+    assert (
+        "No cooling_fraction found for 2 (technology, node_loc); use 0 for: "
+        "[('t1__air', 'R11_B'), ('t1__ot_fresh', 'R11_A')]"
+    ) in caplog.messages
+
+
+def test_hist_input_cool(caplog) -> None:
+    columns = ["parent_tech", "node_loc", "year_act", "year_vtg", "value"]
+    input_cool = pd.DataFrame(
+        [
+            ("p1", "N1", 2015, 2015, 1.0),
+            ("p1", "N1", 2020, 2020, 2.0),
+            # 2010 precedes 2030 in HIST_YEARS
+            ("p2", "N1", 2030, 2030, 4.0),
+            ("p2", "N1", 2010, 2010, 3.0),
+            ("p2", "N1", 2020, 2015, 5.0),
+            # No data for any of HIST_YEARS with year_act == year_vtg
+            ("p3", "N2", 2000, 2010, 6.0),
+        ],
+        columns=columns,
+    )
+
+    result = hist_input_cool(input_cool)
+
+    expected = pd.DataFrame(
+        [("p1", "N1", 2015, 2015, 1.0), ("p2", "N1", 2015, 2015, 3.0)],
+        columns=columns,
+    )
+    pdt.assert_frame_equal(expected, result)
+    assert "still missing even after trying all years: {('p3', 'N2')}" in caplog.text
+
+
+@pytest.mark.slow
+def test_cool_tech_helpers_benchmark(record_property, test_context) -> None:
+    """Track the run time of the data frame operations used by :func:`.cool_tech`."""
+    input_cool = _input_cool(500)
+    test_context.type_reg = "global"
+    techs = input_cool["technology_name"].unique()
+    cost = pd.DataFrame(
+        dict(
+            utype=[t.split("__")[0] for t in techs],
+            technology=techs,
+            **{n: np.random.default_rng(seed=0).random(len(techs)) for n in NODES},
+        )
+    )
+    hold_df = input_cool.iloc[::2].assign(cooling_fraction=lambda df: df["value"])
+
+    start = perf_counter()
+    missing_tech(input_cool.rename(columns={"parent_tech": "technology"}))
+    cooling_fr(input_cool)
+    shares(cost, test_context, NODES, hold_df, ["utype", "technology"] + NODES)
+    hist_input_cool(input_cool)
+    elapsed = perf_counter() - start
+
+    # Recorded in JUnit XML output with --junit-xml
+    record_property("seconds", elapsed)
+    log.info(f"{len(input_cool)} rows: {elapsed:.2f} s")
+
+    # Generous bound; the operations take about 0.3 s on a typical workstation
+    assert elapsed < 30
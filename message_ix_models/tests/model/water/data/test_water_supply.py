@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from message_ix import Scenario
 
@@ -35,6 +36,8 @@ def test_map_basin_region_wat(test_context):
         col in result.columns
         for col in ["region", "mode", "date", "MSGREG", "share", "year", "time"]
     )
+    # Shares of all basins in each region sum to 1
+    assert np.allclose(1.0, result.groupby(["MSGREG", "date"])["share"].sum())
 
 
 @map_basin_region_wat.minimum_version
@@ -1,9 +1,17 @@
+import numpy as np
 import pandas as pd
+import pytest
+from message_ix import make_df
 
+from message_ix_models.model.water import utils
 from message_ix_models.model.water.utils import (
+    broadcast_yv_ya,
     map_yv_ya_lt,
+    read_basin_delineation,
     read_config,
+    read_hydrology,
 )
+from message_ix_models.util import broadcast
 
 
 def test_read_config(test_context):
@@ -18,6 +26,30 @@ def test_read_config(test_context):
     ]
 
 
+@pytest.mark.parametrize("time", ["year", ["1", "2"]])
+def test_read_hydrology(monkeypatch, test_context, time) -> None:
+    test_context.regions = "ZMB"
+    test_context.RCP = "7p0"
+    test_context.REL = "low"
+    test_context.time = time
+    utils._read_csv.cache_clear()
+
+    basins = read_basin_delineation(test_context)
+    result = {v: read_hydrology(test_context, v) for v in ("qtot", "qr", "e-flow")}
+    for df in result.values():
+        # One row per basin; one float64 column per date
+        assert len(basins) == len(df)
+        assert {np.dtype("float64")} == set(df.dtypes)
+
+    # Files are not parsed again, and the returned data can be modified
+    with monkeypatch.context() as m:
+        m.setattr(utils.pd, "read_csv", None)
+        result["qtot"].iloc[0, 0] = -1.0
+        df = read_hydrology(test_context, "qtot")
+        assert -1.0 != df.iloc[0, 0]
+        read_basin_delineation(test_context)
+
+
 def test_map_yv_ya_lt():
     periods = (2010, 2020, 2030, 2040)
     lt = 20
@@ -45,3 +77,33 @@ def test_map_yv_ya_lt():
     result_no_ya = map_yv_ya_lt(periods, lt).reset_index(drop=True)
 
     pd.testing.assert_frame_equal(result_no_ya, expected_no_ya)
+
+
+def test_broadcast_yv_ya():
+    periods = (2010, 2015, 2020, 2030, 2040, 2050)
+    techs = pd.DataFrame(
+        dict(
+            tec=["a", "b", "c", "d"],
+            value=[1.0, 2.0, 3.0, 4.0],
+            lt=[10, 30, np.nan, 10],
+        )
+    ).set_index(pd.Index([3, 5, 7, 9]))
+    base = make_df("fix_cost", technology=techs["tec"], value=techs["value"])
+
+    # Same result as broadcasting each row separately
+    expected = pd.concat(
+        [
+            base.iloc[[i]].pipe(broadcast, map_yv_ya_lt(periods, lt, 2020))
+            for i, lt in enumerate(techs["lt"])
+        ],
+        ignore_index=True,
+    )
+    result = broadcast_yv_ya(base, techs["lt"], periods, 2020)
+    pd.testing.assert_frame_equal(expected, result, check_dtype=False)
+
+    # Scalar lifetime
+    result = broadcast_yv_ya(base, 20, periods, 2020)
+    assert 4 * len(map_yv_ya_lt(periods, 20, 2020)) == len(result)
+
+    # Empty data
+    assert 0 == len(broadcast_yv_ya(base.iloc[:0], techs["lt"].iloc[:0], periods))
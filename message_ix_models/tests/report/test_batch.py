@@ -0,0 +1,159 @@
+from copy import deepcopy
+
+import ixmp
+import pandas as pd
+import pytest
+from message_ix.testing import make_dantzig
+
+from message_ix_models.report.batch import (
+    SUMMARY_FILE,
+    Template,
+    report_many,
+    url_for,
+)
+from message_ix_models.report.config import Config
+
+#: Number of times :func:`callback` is called in this process.
+CALLS = [0]
+
+
+def iamc(qty, scenario) -> pd.DataFrame:
+    """Convert `qty` to IAMC-structured data."""
+    return (
+        qty.to_series()
+        .rename("value")
+        .reset_index()
+        .rename(columns={"nl": "region", "ya": "year"})
+        .assign(
+            model=scenario.model,
+            scenario=scenario.scenario,
+            variable="Cost",
+            unit="USD",
+        )
+    )
+
+
+def callback(rep, context) -> None:
+    CALLS[0] += 1
+    k = rep.add(
+        "cost", "sum", rep.full_key("var_cost"), dimensions=["t", "yv", "m", "h"]
+    )
+    rep.add("cost::iamc", iamc, k, "scenario")
+
+
+@pytest.fixture
+def scenarios(test_context, file_platform):
+    """3 scenarios; 2 with the same structure."""
+    mp = ixmp.Platform(name=file_platform)
+    base = make_dantzig(mp)
+
+    result = [base, base.clone(scenario="double"), base.clone(scenario="other")]
+    with result[1].transact():
+        df = base.par("var_cost")
+        result[1].add_par("var_cost", df.assign(value=df["value"] * 2))
+    with result[2].transact():
+        result[2].init_par("foo", ["node"])
+
+    urls = [
+        url_for(dict(name=file_platform), dict(model=s.model, scenario=s.scenario))
+        for s in result
+    ]
+
+    mp.close_db()
+    yield urls
+
+
+def _context(context, tmp_path):
+    context = deepcopy(context)
+    context.report = Config(from_file=None, key="cost::iamc", output_dir=tmp_path)
+    context.report.register(callback)
+    return context
+
+
+def test_template(test_context, tmp_path) -> None:
+    mp = test_context.get_platform()
+    base = make_dantzig(mp)
+    other = base.clone(scenario="other", keep_solution=False)
+    with other.transact():
+        other.add_set("technology", "foo")
+
+    template = Template(_context(test_context, tmp_path), base)
+
+    # Bound reporter computes the same as a reporter prepared for the scenario
+    rep = template.bind(other)
+    assert other is rep.graph["scenario"]
+    assert "foo" in rep.get("t")
+    assert "foo" not in template.rep.get("t")
+    assert rep.graph["config"]["output_dir"].name.endswith("other_v1")
+
+    # Structure differs
+    with other.transact():
+        other.init_par("foo", ["node"])
+    with pytest.raises(ValueError, match="differs from template"):
+        template.bind(other)
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_report_many(caplog, tmp_path, test_context, scenarios, max_workers) -> None:
+    context = _context(test_context, tmp_path)
+    store = tmp_path.joinpath("store")
+    calls = CALLS[0]
+
+    records = report_many(context, scenarios, store, max_workers=max_workers)
+
+    if max_workers is None:
+        # Reporting was prepared once for each structure
+        assert [True, False, True] == [0 < r.prepare for r in records]
+        assert 2 == CALLS[0] - calls
+    assert [2, 2, 2] == [r.rows for r in records]
+    assert "Reported 3 scenario(s)" in caplog.text
+
+    # All results can be read from the store
+    df = pd.read_parquet(store)
+    assert 6 == len(df)
+    cost = df.groupby("scenario", observed=True)["value"].sum()
+    assert cost["double"] == pytest.approx(2 * cost["standard"])
+
+    # Timing summary
+    summary = pd.read_csv(store.joinpath(SUMMARY_FILE))
+    assert scenarios == summary["url"].tolist()
+
+    # Running again replaces the data for each scenario
+    report_many(context, scenarios[:1], store)
+    assert 6 == len(pd.read_parquet(store))
+
+
+def test_report_many_versions(caplog, tmp_path, test_context, file_platform) -> None:
+    """Versions of one scenario are stored separately; reused keys are shown."""
+    mp = ixmp.Platform(name=file_platform)
+    base = make_dantzig(mp)
+    clone = base.clone()  # Same model and scenario names; new version
+    urls = [
+        url_for(
+            dict(name=file_platform),
+            dict(model=s.model, scenario=s.scenario, version=s.version),
+        )
+        for s in (base, clone)
+    ]
+    mp.close_db()
+
+    context = _context(test_context, tmp_path)
+    context.core.cache_path = tmp_path.joinpath("cache")
+    context.report.since_last = True
+    store = tmp_path.joinpath("store")
+
+    records = report_many(context, urls, store)
+    assert [0, 0] == [r.reused for r in records]
+
+    # Data for both versions are stored
+    df = pd.read_parquet(store)
+    assert 4 == len(df)
+    assert {file_platform} == set(df["platform"])
+    assert {base.version, clone.version} == set(df["version"].astype(int))
+
+    # Second run reuses results
+    caplog.clear()
+    records = report_many(context, urls, store)
+    assert all(0 < r.reused for r in records)
+    assert "Reused 1 key(s) since last run" in caplog.text
+    assert 4 == len(pd.read_parquet(store))
@@ -0,0 +1,131 @@
+from collections import Counter
+from functools import partial
+
+from genno import Key
+from genno.testing import assert_qty_equal
+from ixmp import Platform
+from message_ix import Reporter
+from message_ix.testing import make_dantzig
+
+from message_ix_models.report import report
+from message_ix_models.report.config import Config
+from message_ix_models.report.incremental import _encode, _Fingerprints, apply
+
+#: Number of times :func:`scaled` is called.
+CALLS: Counter = Counter()
+
+
+def scaled(qty, path):
+    CALLS[path.read_text()] += 1
+    return qty * float(path.read_text())
+
+
+def _reporter(scenario, path):
+    rep = Reporter.from_scenario(scenario)
+    k_cost = rep.full_key("var_cost").drop("m", "h")
+    rep.add("scaled", scaled, k_cost, path)
+    rep.add("total", "sum", "scaled", dimensions=["t"])
+    return rep
+
+
+def test_apply(caplog, tmp_path, test_context) -> None:
+    scenario = make_dantzig(test_context.get_platform())
+    cache_path = tmp_path.joinpath("cache")
+    path = tmp_path.joinpath("factor.txt")
+    path.write_text("2.0")
+
+    # First run stores results
+    rep = _reporter(scenario, path)
+    usage = apply(rep, "total", cache_path)
+    expected = rep.get("total")
+    assert [] == usage.reused
+    assert {"scaled", "total:"} <= set(map(str, usage.stored))
+    assert 1 == CALLS["2.0"]
+
+    # Fingerprints are the same for a new Reporter
+    rep = _reporter(scenario, path)
+    assert _Fingerprints(rep.graph)(Key("total")) is not None
+
+    # Second run reuses the result; dependencies are not computed
+    usage = apply(rep, "total", cache_path)
+    assert_qty_equal(expected, rep.get("total"))
+    assert ["total:"] == list(map(str, usage.reused)) and [] == usage.stored
+    assert 1 == CALLS["2.0"]
+
+    # Changed input file contents invalidate the dependent keys only
+    path.write_text("3.0")
+    rep = _reporter(scenario, path)
+    usage = apply(rep, "total", cache_path)
+    assert_qty_equal(1.5 * expected, rep.get("total"))
+    assert 1 == CALLS["3.0"]
+    assert {"scaled", "total:"} <= set(map(str, usage.stored))
+    assert any("var_cost" in str(k) for k in usage.reused)
+
+    # A new version of the scenario invalidates all keys
+    clone = scenario.clone()
+    rep = _reporter(clone, path)
+    usage = apply(rep, "total", cache_path)
+    rep.get("total")
+    assert [] == usage.reused
+
+    # Keys depending on objects that cannot be fingerprinted are always computed
+    rep = _reporter(scenario, path)
+    rep.add("other", lambda q, o: q, Key("total"), object())
+    assert _Fingerprints(rep.graph)(rep.check_keys("other")[0]) is None
+    usage = apply(rep, "other", cache_path)
+    rep.get("other")
+    assert ["total:"] == list(map(str, usage.reused))
+
+    # Only complete files are stored; no temporary files remain
+    assert [] == list(cache_path.glob(".*"))
+
+    # Stored results that cannot be read are discarded and computed again
+    for p in cache_path.glob("report-*.pickle"):
+        p.write_bytes(p.read_bytes()[:10])
+    N = CALLS["3.0"]
+    rep = _reporter(scenario, path)
+    usage = apply(rep, "total", cache_path)
+    assert ["total:"] == list(map(str, usage.reused))
+    assert_qty_equal(1.5 * expected, rep.get("total"))
+    assert "Discard unreadable stored result" in caplog.text
+    assert N + 1 == CALLS["3.0"]
+
+
+def test_encode(test_context, file_platform) -> None:
+    def closure(factor):
+        return lambda x: x * factor
+
+    def default(x, factor=1):
+        return x * factor  # pragma: no cover
+
+    # Functions with the same code, but different captured or default values, differ
+    assert _encode(closure(1)) == _encode(closure(1)) != _encode(closure(2))
+    assert _encode(default) != _encode(partial(default, factor=2))
+    default.__defaults__ = (2,)
+    assert _encode(default) == _encode(default) != _encode(closure(2))
+
+    # Scenarios with the same URL on different platforms differ
+    s1 = make_dantzig(test_context.get_platform())
+    mp = Platform(name=file_platform)  # Keep a reference; Scenario has a weak one
+    s2 = make_dantzig(mp)
+    s2.version = s1.version  # Other tests may have stored versions on the 1st platform
+    assert s1.url == s2.url and _encode(s1) != _encode(s2)
+    mp.close_db()
+
+
+def test_report(caplog, tmp_path, test_context) -> None:
+    scenario = make_dantzig(test_context.get_platform())
+    test_context.set_scenario(scenario)
+    test_context.core.cache_path = tmp_path.joinpath("cache")
+
+    def callback(rep, context):
+        rep.add("total", "sum", rep.full_key("var_cost"), dimensions=["t"])
+
+    for expected in ("Reused 0 key(s)", "Reused 1 key(s) since last run\n  total:"):
+        test_context.report = Config(
+            from_file=None, key="total", output_dir=tmp_path, since_last=True
+        )
+        test_context.report.register(callback)
+        caplog.clear()
+        report(test_context)
+        assert expected in caplog.text
@@ -1,10 +1,19 @@
 import logging
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
+import pandas as pd
+import pandas.testing as pdt
 import pytest
+from message_ix.testing import make_dantzig
 
 from message_ix_models.model import snapshot
 from message_ix_models.report import report
+from message_ix_models.report.legacy import default_tables, pp_utils
+from message_ix_models.report.legacy.iamc_report_hackathon import evaluate_tables
+from message_ix_models.report.legacy.prefetch import Prefetch
+from message_ix_models.report.legacy.state import State
 from message_ix_models.testing import GHA
 
 log = logging.getLogger(__name__)
@@ -35,3 +44,164 @@ def test_legacy_report(test_context, loaded_snapshot):
     )
 
     report(test_context)
+
+
+def test_prefetch(caplog, test_context) -> None:
+    s = make_dantzig(test_context.get_platform())
+    ds = Prefetch(s)
+
+    for method, name, filters in (
+        ("par", "input", {"technology": ["transport_from_seattle"]}),
+        ("par", "input", {"node_loc": "seattle", "commodity": ["cases", "foo"]}),
+        ("par", "input", {"technology": []}),
+        ("par", "var_cost", {"year_act": [1963]}),  # Not str
+        ("par", "var_cost", {"year_act": 1963, "node_loc": "seattle"}),
+        ("par", "var_cost", {"year_vtg": ["1963"]}),
+        ("par", "var_cost", {"year_vtg": [1964]}),  # Empty
+        ("par", "demand", None),
+        ("set", "cat_year", {"type_year": ["firstmodelyear"]}),
+        ("set", "cat_year", {"type_year": ["firstmodelyear"]}),
+        ("set", "technology", None),  # Index set; not stored
+        ("set", "technology", None),
+    ):
+        expected = getattr(s, method)(name, filters)
+        result = getattr(ds, method)(name, filters)
+        if isinstance(expected, pd.DataFrame):
+            pdt.assert_frame_equal(expected, result)
+        else:
+            pdt.assert_series_equal(expected, result)
+
+    # Other attributes are those of the scenario
+    assert s.firstmodelyear == ds.firstmodelyear
+
+    # Only the first query for each stored item used the backend
+    assert dict(queries=3, backend=2) == {
+        k: ds.stats["par", "input"][k] for k in ("queries", "backend")
+    }
+    assert 4 == ds.stats["par", "var_cost"]["queries"]
+    assert {
+        ("par", "input"),
+        ("par", "var_cost"),
+        ("par", "demand"),
+        ("set", "cat_year"),
+    } == set(ds.stats)
+
+    with caplog.at_level(logging.INFO):
+        ds.log_stats()
+    assert re.match(
+        r"Answered 10 queries for 4 items with 7 backend queries; estimated time saved",
+        caplog.messages[-1],
+    )
+
+    # Queries from several threads give the same results; each item is loaded once
+    ds = Prefetch(s)
+    techs = list(s.set("technology")) * 10
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda t: ds.par("input", {"technology": t}), techs))
+    for t, result in zip(techs, results):
+        # NB ixmp answers from its own cache of all data, without resetting the index
+        expected = s.par("input", {"technology": t}).reset_index(drop=True)
+        pdt.assert_frame_equal(expected, result)
+    assert dict(queries=30, backend=2) == {
+        k: ds.stats["par", "input"][k] for k in ("queries", "backend")
+    }
+
+
+def _table_years(offset=0):
+    return pd.DataFrame({"value": [y + offset for y in pp_utils.years]})
+
+
+def _table_pp():
+    return pd.DataFrame({"value": [default_tables.pp.value]})
+
+
+def test_evaluate_tables() -> None:
+    func_dict = dict(years=_table_years, pp=_table_pp)
+    run_tables = {
+        f"t{i}": dict(function="years", args=dict(offset=i)) for i in range(20)
+    } | dict(t_pp=dict(function="pp"))
+
+    pp = pd.Series({"value": 1.0})
+    state = State(pp=pp, mu={}, years=[2020, 2030])  # type: ignore [arg-type]
+
+    # Module-level variables are set while the state is installed, and restored
+    assert pp_utils.years is default_tables.pp is None
+    with state.install(default_tables):
+        assert [2020, 2030] == pp_utils.years
+        assert pp is default_tables.pp
+
+        expected = evaluate_tables(run_tables, func_dict)
+        result = evaluate_tables(run_tables, func_dict, max_workers=4)
+    assert pp_utils.years is default_tables.pp is None
+
+    # Results are the same, and in the same order, as the tables
+    assert list(run_tables) == list(result)
+    for key, df in expected.items():
+        pdt.assert_frame_equal(df, result[key])
+    assert [2039, 2049] == result["t19"]["value"].tolist()
+    assert [1.0] == result["t_pp"]["value"].tolist()
+
+
+def _add_missing_regions(df, units, regions, firstmodelyear):
+    """Former implementation of :func:`.pp_utils._add_missing_regions`."""
+    values = dict(Unit=units, Vintage=firstmodelyear, Mode="M1", Grade="a")
+    key = [c for c in ("Technology", "Commodity") if c in df.columns][:1]
+    if "Mode" in df.columns:
+        other = ["Unit"] + [c for c in ("Vintage", "Mode") if c in df.columns]
+    elif key == ["Technology"] and "Unit" not in df.columns:
+        other = []
+    else:
+        other = ["Unit"] + [c for c in ("Vintage", "Grade") if c in df.columns][:1]
+
+    for reg in regions:
+        if reg in df.Region.unique():
+            continue
+        for label in df[key[0]].unique() if key else [None]:
+            row = [reg] + ([label] if key else []) + [values[c] for c in other]
+            added = pd.DataFrame([row], columns=["Region"] + key + other)
+            df = pd.concat([added.astype(str), df], sort=True)
+    return df
+
+
+@pytest.mark.parametrize(
+    "columns",
+    (
+        ["Technology", "Unit"],
+        ["Technology", "Unit", "Vintage"],
+        ["Technology", "Unit", "Mode"],
+        ["Commodity", "Unit", "Grade"],
+        ["Commodity", "Unit", "Vintage", "Mode"],
+        ["Technology"],
+        ["Unit"],
+    ),
+)
+def test_clean_up_regions(columns) -> None:
+    regions = {f"R12_{n}": n for n in ("AFR", "CHN", "EEU", "FSU", "LAM", "MEA")}
+    data = dict(
+        Region=["R12_CHN", "World", "R12_CHN", "R12_LAM"],
+        Technology=["coal", "coal", "gas", "wind"],
+        Commodity=["coal", "coal", "gas", "wind"],
+        Unit="GWa",
+        Vintage=2020,
+        Mode="M1",
+        Grade="a",
+    )
+    df = pd.DataFrame({c: data[c] for c in ["Region"] + columns}).assign(
+        **{"2020": [1.0, 2.0, 3.0, 4.0], "2030": 5.0}
+    )
+
+    state = State(pp=None, mu={}, regions=regions, firstmodelyear=2020)  # type: ignore
+    with state.install():
+        result = pp_utils._clean_up_regions(df, units="GWa")
+
+    # Same as the former implementation
+    expected = _add_missing_regions(df[df.Region != "World"], "GWa", regions, 2020)
+    expected = expected.assign(Region=expected.Region.map(regions))
+    if "Vintage" in columns:
+        expected["Vintage"] = expected["Vintage"].apply(int).astype(object)
+    pdt.assert_frame_equal(expected.sort_index(), result)
+
+    # Each of 4 missing regions is added for each of 3 technologies or commodities
+    assert set(regions.values()) == set(result.Region)
+    n = 3 if {"Technology", "Commodity"} & set(columns) else 1
+    assert 3 + 4 * n == len(result)
@@ -19,9 +19,11 @@ from message_ix_models import ScenarioInfo
 from message_ix_models.util import (
     MESSAGE_DATA_PATH,
     MESSAGE_MODELS_PATH,
+    add_par_data,
     as_codes,
     broadcast,
     check_support,
+    coalesce_par_data,
     convert_units,
     copy_column,
     ffill,
@@ -43,6 +45,31 @@ from message_ix_models.util import (
 _actual_package_data = Path(__file__).parents[1].joinpath("data")
 
 
+def test_add_par_data(caplog, test_context):
+    s = make_dantzig(test_context.get_platform())
+
+    # Two fragments of data for the same parameter, with one overlapping key
+    common = dict(technology="canning_plant", mode="production", time="year", unit="")
+    common.update(year_act=1963, year_vtg=1963)
+    nodes = ["seattle", "san-diego"]
+    data = dict(
+        var_cost=[
+            make_df("var_cost", **common, node_loc="seattle", value=1.0),
+            make_df("var_cost", **common, node_loc=nodes, value=[2.0, 3.0]),
+        ]
+    )
+
+    with s.transact():
+        assert 2 == add_par_data(s, data)
+
+    # Duplicated key written once, with the last value
+    result = s.par("var_cost", filters=dict(technology="canning_plant"))
+    assert [2.0] == result.query("node_loc == 'seattle'")["value"].tolist()
+    # Empty unit was replaced; the input was not modified
+    assert "" == data["var_cost"][0]["unit"].iloc[0]
+    assert re.search("rows/s", caplog.text)
+
+
 def test_as_codes():
     """Forward reference to a child is silently dropped."""
     data = dict(
@@ -111,6 +138,36 @@ def test_broadcast(caplog):
         base.pipe(broadcast, labels, d=["d0"])
 
 
+def test_broadcast_order():
+    base = make_df("input", technology="t", value=[1.1, 2.2])
+
+    # Order of rows and columns: the last keyword argument varies slowest, and its
+    # column is placed first
+    result = base.pipe(broadcast, node_loc=["A", "B"], mode=["m0", "m1"])
+    assert ["mode", "node_loc"] == result.columns[:2].tolist()
+    assert list("AABBAABB") == result["node_loc"].tolist()
+    assert [1.1, 2.2] * 4 == result["value"].tolist()
+
+    # Same result with categorical=True, but with categorical dtype
+    result_cat = base.pipe(
+        broadcast, node_loc=["A", "B"], mode=["m0", "m1"], categorical=True
+    )
+    assert isinstance(result_cat["node_loc"].dtype, pd.CategoricalDtype)
+    assert ["A", "B"] == result_cat["node_loc"].cat.categories.tolist()
+    assert result["node_loc"].tolist() == result_cat["node_loc"].tolist()
+
+    # A single str or other scalar label is treated as a list of 1 label
+    result = base.pipe(broadcast, mode="m0", year_act=2020)
+    assert ["m0", "m0"] == result["mode"].tolist()
+    assert [2020, 2020] == result["year_act"].tolist()
+
+    # Same with labels
+    labels = pd.DataFrame(dict(node_loc=["A", "B", "C"], mode=["m0", "m1", "m0"]))
+    result = base.pipe(broadcast, labels, categorical=True)
+    assert list("AABBCC") == result["node_loc"].tolist()
+    assert isinstance(result["mode"].dtype, pd.CategoricalDtype)
+
+
 @pytest.mark.parametrize(
     "data",
     (
@@ -146,6 +203,27 @@ def test_check_support(test_context):
         check_support(*args)
 
 
+def test_coalesce_par_data():
+    df0 = pd.DataFrame(dict(node=["a", "b"], value=[1, 2], unit=["", "kg"]))
+    df1 = pd.DataFrame(dict(node=["b", "c"], value=[3, 4], unit=["kg", "kg"]))
+
+    result = coalesce_par_data([df0, df1])
+
+    # Duplicate keys are dropped, keeping the last; dtypes and units normalized
+    assert ["a", "b", "c"] == result["node"].tolist()
+    assert [1.0, 3.0, 4.0] == result["value"].tolist()
+    assert float == result["value"].dtype
+    assert ["-", "kg", "kg"] == result["unit"].tolist()
+
+    # A single data frame is handled and not modified
+    assert ["-", "kg"] == coalesce_par_data(df0)["unit"].tolist()
+    assert "" == df0["unit"].iloc[0]
+
+    # Other values are returned unchanged
+    for value in (pd.Series([1.0, 2.0]), "foo", []):
+        assert value is coalesce_par_data(value)
+
+
 def test_convert_units(recwarn):
     """:func:`.convert_units` works."""
     # Common arguments
@@ -434,3 +512,25 @@ def test_strip_par_data(caplog, test_context):
     )
     # Nothing was actually removed
     assert N == len(s.par("output"))
+
+
+def test_strip_par_data_batch(caplog, test_context):
+    """:func:`.strip_par_data` with multiple elements removes them in a batch."""
+    s = make_dantzig(test_context.get_platform())
+
+    elements = ["canning_plant", "transport_from_seattle", "not_a_technology"]
+    N = len(s.par("output"))
+    N_strip = len(s.par("output", filters=dict(technology=elements)))
+    dump: dict[str, pd.DataFrame] = dict()
+
+    with s.transact():
+        total = strip_par_data(s, "technology", elements, dump=dump)
+
+    # Data for both existing elements were removed and dumped
+    assert 0 < N_strip == len(dump["output"])
+    assert N - N_strip == len(s.par("output"))
+    assert total == sum(map(len, dump.values()))
+    assert not {"canning_plant", "transport_from_seattle"} & set(s.set("technology"))
+
+    # The number of backend calls saved was logged
+    assert re.search("saved by batching", caplog.text)
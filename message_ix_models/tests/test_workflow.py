@@ -1,13 +1,15 @@
 import platform
 import re
+from copy import deepcopy
 from typing import Optional
 
 import ixmp
 import pytest
-from message_ix import make_df
+from message_ix import Scenario, make_df
 
 from message_ix_models import Workflow, testing
 from message_ix_models.testing import GHA
+from message_ix_models.util.slurm import FakeSbatch, load_records
 from message_ix_models.workflow import WorkflowStep, make_click_command, solve
 
 MARK = {
@@ -25,6 +27,12 @@ MARK = {
 # Functions for WorkflowSteps
 
 
+def changes_c(c, s) -> None:
+    """Change a scenario according to a setting of the Context `c`."""
+    with s.transact():
+        s.add_set("technology", f"tech_{c.model.regions}")
+
+
 def changes_a(c, s) -> None:
     """Change a scenario by modifying structure data, but not data."""
     with s.transact():
@@ -206,3 +214,108 @@ def test_workflow(caplog, request, test_context, wf) -> None:
   - None""",
         wf.describe("B"),
     )
+
+
+def test_workflow_parallel(caplog, test_context, file_platform) -> None:
+    # Base scenario on the file platform
+    mp = ixmp.Platform(name=file_platform)
+    base = Scenario(mp, "m", "base", version="new")
+    base.add_horizon([2020, 2030])
+    base.add_set("technology", "t")
+    base.commit("")
+    url = f"ixmp://{file_platform}/{base.url}"
+    mp.close_db()
+
+    context = deepcopy(test_context)
+    context.platform_info.update(name=file_platform)
+    # A non-default setting
+    context.model.regions = "ZMB"
+    wf = Workflow(context)
+    wf.add_step("base", None, target=url)
+    wf.add_step("A", "base", changes_a)
+    # Three independent branches
+    wf.add_step("B1", "A", changes_b, target="m/B1", clone=True, value=1.0)
+    wf.add_step("B2", "A", changes_b, target="m/B2", clone=True, value=2.0)
+    wf.add_step("C", "A", changes_c, target="m/C", clone=True)
+    wf.add("all", ["B1", "B2", "C"])
+
+    # Steps run in worker processes; scenarios are loaded in this process
+    s1, s2, s3 = wf.run("all", max_workers=2)
+
+    assert ("m", "B1") == (s1.model, s1.scenario)
+    for s, value in ((s1, 1.0), (s2, 2.0)):
+        assert "test_tech" in set(s.set("technology"))
+        assert [value] == s.par("technical_lifetime")["value"].tolist()
+
+    # Settings of the Context reach the worker processes
+    assert "tech_ZMB" in set(s3.set("technology"))
+
+    # Resources of each step are recorded
+    assert {"base", "A", "B1", "B2", "C"} == set(wf.records)
+    for r in wf.records.values():
+        assert 0 < r.time
+        assert r.max_rss is not None and 0 < r.max_rss
+    assert re.search(r"Step 'B\d' -> ixmp://.*/m/B\d#1: [\d.]+ s, peak", caplog.text)
+
+    # Independent steps B1 and B2 both started before either was complete
+    messages = [m.split(" ->")[0] for m in caplog.messages if "'B" in m]
+    assert {"Submit step 'B1'", "Submit step 'B2'"} == set(messages[:2])
+
+    context.close_db()
+
+
+def test_workflow_submit(tmp_path, test_context, file_platform) -> None:
+    # Base scenario on the file platform
+    mp = ixmp.Platform(name=file_platform)
+    base = Scenario(mp, "m", "base", version="new")
+    base.add_horizon([2020, 2030])
+    base.add_set("technology", "t")
+    base.commit("")
+    url = f"ixmp://{file_platform}/{base.url}"
+    mp.close_db()
+
+    context = deepcopy(test_context)
+    context.platform_info.update(name=file_platform)
+    # A non-default setting
+    context.model.regions = "ZMB"
+    wf = Workflow(context)
+    wf.add_step("base", None, target=url)
+    wf.add_step("A", "base", changes_a)
+    wf.add_step("B1", "A", changes_b, target="m/B1", clone=True, value=1.0)
+    wf.add_step("B2", "A", changes_b, target="m/B2", clone=True, value=2.0)
+    wf.add_step("C", "A", changes_c, target="m/C", clone=True)
+    # A step with its own resource request
+    wf.add_step(
+        "B3",
+        "A",
+        changes_b,
+        target="m/B3",
+        clone=True,
+        value=3.0,
+        sbatch=dict(mem="1G"),
+    )
+    wf.add("all", ["B1", "B2", "B3", "C"])
+
+    sbatch = FakeSbatch()
+    job_dir = tmp_path.joinpath("jobs")
+    task_ids = wf.submit("all", job_dir, submit=sbatch)
+
+    # 3 job arrays: base and A; B1, B2 and C; B3 with different resources
+    assert dict(base="1_0", A="1_0", B1="2_0", B2="2_1", C="2_2", B3="3_0") == task_ids
+    assert [0, 0, 0, 0, 0] == list(sbatch.status.values())
+    assert ["--array=0-2", "--dependency=afterok:1_0"] == sbatch.jobs[1][0][:2]
+    assert "\n#SBATCH --mem=1G\n" in sbatch.jobs[2][1]
+
+    # Each step recorded its result
+    records = load_records(job_dir)
+    assert {"base", "A", "B1", "B2", "B3", "C"} == set(records)
+    assert records["B2"].url.endswith("m/B2#1")
+
+    mp = ixmp.Platform(name=file_platform)
+    s = Scenario(mp, "m", "B2")
+    assert "test_tech" in set(s.set("technology"))
+    assert [2.0] == s.par("technical_lifetime")["value"].tolist()
+
+    # Settings of the Context reach the tasks
+    assert "tech_ZMB" in set(Scenario(mp, "m", "C").set("technology"))
+    mp.close_db()
@@ -1,11 +1,20 @@
+import logging
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
 import pytest
 from message_ix import make_df
+from numpy.polynomial import Polynomial
 
 from message_ix_models import testing
 from message_ix_models.model.structure import get_codelist
 from message_ix_models.tools.costs import Config, create_cost_projections
+from message_ix_models.tools.costs.projections import _fit_linear
 from message_ix_models.util import add_par_data
 
+log = logging.getLogger(__name__)
+
 
 @pytest.mark.parametrize(
     "config, exp_fix, exp_inv",
@@ -147,3 +156,49 @@ def test_ccs_costs(module):
 
     # Assert that costs for CCS technologies are greater than for non-CCS technologies
     assert ccs.sub(non_ccs).dropna().ge(0).all().all()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("method", ("constant", "convergence", "gdp"))
+def test_create_cost_projections_benchmark(record_property, method) -> None:
+    """Track the run time of :func:`.create_cost_projections` for all modules."""
+    for module in ("energy", "materials", "cooling"):
+        config = Config(module=module, method=method, scenario="all")
+
+        start = perf_counter()
+        create_cost_projections(config)
+        elapsed = perf_counter() - start
+
+        # Recorded in JUnit XML output with --junit-xml
+        record_property(f"{module} seconds", elapsed)
+        log.info(f"{method=} {module=}: {elapsed:.2f} s")
+
+
+def test_fit_linear() -> None:
+    # 2 points per group, plus 1 group with 3 points and 1 group with a single point
+    rng = np.random.default_rng(seed=0)
+    N = 100
+    df = pd.DataFrame(
+        dict(
+            g=np.repeat(np.arange(N), 2).tolist() + [N, N, N, N + 1],
+            year=[2020, 2050] * N + [2020, 2030, 2050, 2020],
+            value=rng.uniform(size=2 * N + 4),
+        )
+    )
+    years = np.arange(2020, 2101, 5)
+
+    # Function runs
+    fit = _fit_linear(df, ["g"], "year", "value").set_index("g")
+    result = fit.y_mean.to_numpy()[:, None] + fit.slope.to_numpy()[:, None] * (
+        years - fit.x_mean.to_numpy()[:, None]
+    )
+
+    # Same as Polynomial.fit() for each group, as used in earlier versions
+    expected = np.array(
+        [Polynomial.fit(d.year, d.value, deg=1)(years) for _, d in df.groupby("g")]
+    )
+    np.testing.assert_allclose(expected[:-1], result[:-1])
+
+    # Single point: value is constant
+    assert 0 == fit.slope.iloc[-1]
+    np.testing.assert_allclose(df.value.iloc[-1], result[-1])
@@ -1,20 +1,26 @@
 """Tests of :mod:`.tools`."""
 
 import logging
+from itertools import product
 
 import pandas as pd
+import pandas.testing as pdt
 import pytest
 from genno import Computer
 
+import message_ix_models.util.cache
 from message_ix_models.testing import GHA
 from message_ix_models.tools.exo_data import prepare_computer
 from message_ix_models.tools.iea.web import (
     DIMS,
     IEA_EWEB,
     TRANSFORM,
+    fwf_to_parquet,
     generate_code_lists,
     get_mapping,
+    iea_web_data_for_query,
     load_data,
+    query_to_filter,
 )
 from message_ix_models.util import HAS_MESSAGE_DATA
 
@@ -165,6 +171,100 @@ def test_load_data(test_context, tmp_path, provider, edition):
     assert (set(DIMS) & {"Value"}) < set(result.columns)
 
 
+@pytest.fixture
+def skip_cache(monkeypatch) -> None:
+    """Call functions decorated with :func:`.cached` without using cached data."""
+    monkeypatch.setattr(message_ix_models.util.cache, "SKIP_CACHE", True)
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+@pytest.mark.usefixtures("skip_cache")
+def test_fwf_to_parquet(tmp_path, max_workers) -> None:
+    # Synthetic data in the IEA fixed-width format
+    rows = [
+        ("AUSTRIA", "COAL", 2000, "TOTTRANS", "TJ", "1.5"),
+        ("AUSTRIA", "COAL", 2001, "TOTTRANS", "KTOE", ".."),
+        ("WORLD", "TOTAL", 2000, "ROAD", "TJ", "x"),
+        ("WORLD", "TOTAL", 2001, "ROAD", "TJ", "-3"),
+    ] * 50
+    path = tmp_path.joinpath("TEST.TXT")
+    path.write_text("".join(f"{'  '.join(map(str, r)):<70}\n" for r in rows))
+
+    # Function runs; small chunks are used to exercise parallel processing
+    result = fwf_to_parquet(path, chunk_size=1000, max_workers=max_workers)
+    assert tmp_path.joinpath("TEST.parquet") == result
+    assert result.joinpath("_SUCCESS").exists()
+    assert {"MEASURE=KTOE", "MEASURE=TJ"} <= {p.name for p in result.iterdir()}
+
+    # Conversion is skipped on a second call
+    mtime = result.joinpath("_SUCCESS").stat().st_mtime
+    fwf_to_parquet(path, max_workers=max_workers)
+    assert mtime == result.joinpath("_SUCCESS").stat().st_mtime
+
+    # Data can be read
+    df = iea_web_data_for_query(tmp_path, "TEST.TXT", query_expr="TIME >= 2000")
+    assert set(DIMS) | {"Value"} == set(df.columns)
+    # Only MEASURE == "TJ" and non-NaN values
+    assert 100 == len(df)
+    assert {1.5, -3.0} == set(df["Value"])
+    assert {"AUSTRIA", "WORLD"} == set(df["COUNTRY"])
+
+
+@pytest.fixture
+def fwf_path(tmp_path):
+    """Synthetic data in the IEA fixed-width format."""
+    rows = [
+        (c, p, y, f, m, v)
+        for c, p, f in product(("AUSTRIA", "WORLD"), ("COAL", "TOTAL"), _FLOW[:3])
+        for y, m, v in ((2000, "TJ", "1.5"), (2001, "TJ", ".."), (2001, "KTOE", "-3"))
+    ]
+    path = tmp_path.joinpath("TEST.TXT")
+    path.write_text("".join(f"{'  '.join(map(str, r)):<70}\n" for r in rows))
+    yield path
+
+
+@pytest.mark.usefixtures("skip_cache")
+@pytest.mark.parametrize(
+    "expr",
+    (
+        "TIME > 0",
+        "COUNTRY == 'WORLD' and TIME >= 2000",
+        "COUNTRY in ['AUSTRIA'] & ~(FLOW == 'DOMESAIR')",
+        "2000 <= TIME < 2001 or PRODUCT not in ('COAL',)",
+        "Value != 1.5",
+        # Not supported by query_to_filter()
+        "COUNTRY.str.startswith('W')",
+        "FLOW == PRODUCT",
+    ),
+)
+def test_iea_web_data_for_query(fwf_path, expr) -> None:
+    # Same data in CSV format
+    df = pd.read_csv(fwf_path, sep=r"\s{2,}", names=DIMS + ["Value"], na_values=[".."])
+    df.to_csv(fwf_path.with_suffix(".csv"), index=False)
+
+    # Expected result: all data, then query() as in earlier versions
+    expected = (
+        df.query("MEASURE == 'TJ'").query(expr).dropna(subset=["Value"])
+    ).reset_index(drop=True)
+
+    for filename in ("TEST.TXT", "TEST.csv"):
+        result = iea_web_data_for_query(fwf_path.parent, filename, query_expr=expr)
+        # Result is identical, whether or not filters are applied while reading
+        pdt.assert_frame_equal(expected, result, check_dtype=False)
+
+
+def test_query_to_filter() -> None:
+    import pyarrow.dataset as ds
+
+    f = query_to_filter("1980 <= TIME < 2000 and COUNTRY in ['WORLD']", ds.field)
+    assert isinstance(f, ds.Expression)
+    assert "TIME" in str(f) and "is_in" in str(f)
+
+    # Unsupported expressions
+    for expr in ("FOO == 1", "TIME + 1 > 1980", "TIME is None", "TIME > @y", "("):
+        assert query_to_filter(expr, ds.field) is None
+
+
 @pytest.mark.parametrize("provider, edition", PROVIDER_EDITION)
 def test_generate_code_lists(tmp_path, provider, edition):
     # generate_code_lists() runs
@@ -1,15 +1,33 @@
+import hashlib
 import logging
+import os
+import time
 from copy import deepcopy
+from pathlib import Path
 
+import genno
+import numpy as np
+import pandas as pd
 import pytest
 import sdmx.model.v21 as sdmx_model
 import xarray as xr
 from genno.caching import hash_args
+from genno.testing import assert_qty_equal
 from ixmp.testing import assert_logs
 
 import message_ix_models.util.cache
 from message_ix_models import ScenarioInfo
 from message_ix_models.util import cached
+from message_ix_models.util.cache import (
+    _MEMORY,
+    STATS,
+    _read,
+    _write,
+    iter_files,
+    prune,
+    read_stats,
+    write_stats,
+)
 
 log = logging.getLogger(__name__)
 
@@ -24,6 +42,85 @@ class TestEncoder:
         expected = "40a0735385448dcbe745904ebfec7255995ca451"
         assert expected == hash_args(codes0, bar="baz") == hash_args(codes1, bar="baz")
 
+    @staticmethod
+    def _quantity(N: int, value=1.0, units="kg") -> "genno.Quantity":
+        idx = pd.MultiIndex.from_product(
+            [[f"n{i}" for i in range(N // 100)], range(100)], names=["n", "y"]
+        )
+        return genno.Quantity(pd.Series(value, index=idx), units=units)
+
+    def test_quantity(self):
+        q0 = self._quantity(1000)
+
+        # Equal quantities hash equal; hash is reused for the same object
+        assert hash_args(q0) == hash_args(self._quantity(1000)) == hash_args(q0)
+
+        # Different values, units, or dimensions hash different
+        assert hash_args(q0) != hash_args(self._quantity(1000, value=2.0))
+        assert hash_args(q0) != hash_args(self._quantity(1000, units="t"))
+        assert hash_args(q0) != hash_args(q0.rename({"n": "node"}))
+
+        # Stored hash is discarded with the object
+        N = len(message_ix_models.util.cache._QUANTITY_HASH)
+        del q0
+        assert N - 1 == len(message_ix_models.util.cache._QUANTITY_HASH)
+
+    def test_quantity_reuse(self, monkeypatch) -> None:
+        """The hash of a large Quantity is computed once and then reused."""
+        calls = []
+
+        def blake2b(*args, **kwargs):
+            calls.append(args)
+            return hashlib.blake2b(*args, **kwargs)
+
+        monkeypatch.setattr(message_ix_models.util.cache, "blake2b", blake2b)
+
+        q = self._quantity(100_000, value=np.arange(100_000.0))
+        expected = hash_args(q)
+        assert 1 == len(calls)
+
+        # Subsequent computation for the same object reuses the stored hash
+        assert expected == hash_args(q)
+        hash_args([q], foo=q)
+        assert 1 == len(calls)
+
+        # An equal, distinct object is hashed again, with the same result
+        assert expected == hash_args(self._quantity(100_000, np.arange(100_000.0)))
+        assert 2 == len(calls)
+
+    @pytest.mark.slow
+    def test_hash_args_benchmark(self, record_property, test_context) -> None:
+        """Track the time to compute cache keys for a large Quantity and a Context."""
+        from message_ix_models.util.cache import _CONTEXT_KEYS
+
+        q = self._quantity(100_000, value=np.arange(100_000.0))
+
+        def _quantity_old(o):
+            # Former implementation of .util.cache._quantity
+            return tuple(o.to_series().to_dict())
+
+        def _context_keys(*args):
+            token = _CONTEXT_KEYS.set(["model.regions"])
+            try:
+                return hash_args(*args)
+            finally:
+                _CONTEXT_KEYS.reset(token)
+
+        for name, func, arg in (
+            ("quantity before", lambda q: hash_args(_quantity_old(q)), q),
+            ("quantity first", hash_args, q),
+            ("quantity repeat", hash_args, q),
+            ("context all", hash_args, test_context),
+            ("context keys", _context_keys, test_context),
+        ):
+            start = time.perf_counter()
+            func(arg)
+            elapsed = time.perf_counter() - start
+
+            # Recorded in JUnit XML output with --junit-xml
+            record_property(f"{name} seconds", elapsed)
+            log.info(f"Key computation, {name}: {elapsed:.6f} s")
+
 
 def test_cached(caplog, test_context, tmp_path):
     """:func:`.cached` works as expected.
@@ -107,3 +204,239 @@ def test_cached(caplog, test_context, tmp_path):
         TypeError, match="Object of type slice is not JSON serializable"
     ):
         func1(arg=slice(None))
+
+
+def test_cached_context_keys(caplog, test_context, tmp_path) -> None:
+    """:func:`.cached` with the `context_keys` argument."""
+    message_ix_models.util.cache.PATHS_SEEN.clear()
+    test_context.cache_path = tmp_path
+
+    @cached(context_keys=["model.regions", "foo"])
+    def func4(context):
+        log.info("func4 runs")
+        return context.model.regions
+
+    test_context.model.regions = "R12"
+    with assert_logs(caplog, "func4 runs"):
+        assert "R12" == func4(test_context)
+
+    # Changing other keys does not affect the cache key
+    caplog.clear()
+    test_context["bar"] = "baz"
+    assert "R12" == func4(test_context)
+    assert "func4 runs" not in caplog.messages
+
+    # Changing the declared keys does
+    for key, value in ("foo", 1), ("regions", "R14"):
+        test_context[key] = value
+        with assert_logs(caplog, "func4 runs"):
+            func4(test_context)
+
+
+def test_cached_memory(caplog, monkeypatch, test_context, tmp_path) -> None:
+    """:func:`.cached` with :data:`.MEMORY_SIZE` set."""
+    message_ix_models.util.cache.PATHS_SEEN.clear()
+    test_context.cache_path = tmp_path
+    monkeypatch.setattr(message_ix_models.util.cache, "MEMORY_SIZE", 10_000)
+    monkeypatch.setattr(message_ix_models.util.cache, "_MEMORY", type(_MEMORY)())
+
+    @cached
+    def func3(n):
+        log.info("func3 runs")
+        return pd.DataFrame(dict(value=range(n)))
+
+    STATS.clear()
+
+    # First call runs the function; second returns from memory
+    with assert_logs(caplog, "func3 runs"):
+        df0 = func3(10)
+    caplog.clear()
+    df1 = func3(10)
+    assert "func3 runs" not in caplog.messages
+    assert caplog.messages[0].startswith("Cache hit (memory) for func3")
+    assert 1 == STATS["func3"]["memory hit"]
+
+    # Modifying a returned value does not affect the value returned next time
+    df1.loc[0, "value"] = -1
+    df0.loc[1, "value"] = -1
+    assert [0, 1] == func3(10)["value"].tolist()[:2]
+
+    # Time saved compared to calling the function is not negative
+    assert 0 <= STATS["func3"]["seconds saved"]
+
+    @cached
+    def func5(n):
+        return dict(a=pd.DataFrame(dict(value=range(n))), b=[0, 1])
+
+    # Same for values in containers, such as a dict of DataFrame
+    for _ in range(2):
+        result = func5(3)
+        result["a"].loc[0, "value"] = -999
+        result["b"].append(2)
+    assert 1 == STATS["func5"]["memory hit"]
+    result = func5(3)
+    assert [0, 1, 2] == result["a"]["value"].tolist() and [0, 1] == result["b"]
+
+    # Value larger than MEMORY_SIZE is not kept in memory
+    func3(10_000), func3(10_000)
+    assert 1 == STATS["func3"]["hit"]
+
+    # Least recently used value is evicted
+    func3(600), func3(601)
+    caplog.clear()
+    func3(10)
+    assert caplog.messages[0].startswith("Cache hit for func3")
+
+
+@pytest.mark.parametrize(
+    "data, suffix",
+    (
+        (pd.DataFrame(dict(value=[1.0, 2.0])), ".parquet"),
+        (TestEncoder._quantity(200), ".parquet"),
+        (dict(a=pd.DataFrame(dict(value=[1.0]))), ".pickle"),
+        ("foo", ".pickle"),
+    ),
+)
+def test_read_write(tmp_path, data, suffix) -> None:
+    """Cache files are written and read without :mod:`genno` internals."""
+    path = _write(tmp_path.joinpath("func-" + "0" * 40), data)
+    assert suffix == path.suffix
+    assert [path] == [p for p, _ in iter_files(tmp_path)]
+
+    result = _read(path)
+    if isinstance(data, genno.Quantity):
+        assert_qty_equal(data, result)
+    elif isinstance(data, dict):
+        pd.testing.assert_frame_equal(data["a"], result["a"])
+    elif isinstance(data, pd.DataFrame):
+        pd.testing.assert_frame_equal(data, result)
+    else:
+        assert data == result
+
+
+@pytest.fixture
+def cache_files(tmp_path):
+    """Create 4 cache files of 1000 bytes each, last used 0, 1, 2, and 3 days ago."""
+    now = time.time()
+    for i in range(4):
+        p = tmp_path.joinpath(f"func{i}-{str(i) * 40}.pickle")
+        p.write_bytes(b"0" * 1000)
+        os.utime(p, (now - i * 86400, now - i * 86400))
+
+    # Other files are ignored
+    tmp_path.joinpath("foo.txt").write_text("bar")
+    tmp_path.joinpath("subdir").mkdir()
+
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    (
+        (dict(), []),
+        (dict(max_size=2500), ["func2", "func3"]),
+        (dict(max_age=1.5 * 86400), ["func2", "func3"]),
+        (dict(max_size=3500, max_age=2.5 * 86400), ["func3"]),
+        (dict(max_size=0), ["func0", "func1", "func2", "func3"]),
+    ),
+)
+def test_prune(cache_files, kwargs, expected) -> None:
+    # Dry run returns the files but does not delete
+    result = prune(cache_files, dry_run=True, **kwargs)
+    assert expected == sorted(p.name.split("-")[0] for p in result)
+    assert 4 == len(list(iter_files(cache_files)))
+
+    # Files are deleted
+    prune(cache_files, **kwargs)
+    assert 4 - len(expected) == len(list(iter_files(cache_files)))
+    assert cache_files.joinpath("foo.txt").exists()
+
+
+def test_stats(caplog, test_context, tmp_path) -> None:
+    message_ix_models.util.cache.PATHS_SEEN.clear()
+    test_context.cache_path = tmp_path
+
+    @cached
+    def func2(x):
+        return x
+
+    STATS.clear()
+    func2(1), func2(1), func2(2)
+
+    # Hits, misses, and bytes are counted
+    assert dict(hit=1, miss=2) == {k: STATS["func2"][k] for k in ("hit", "miss")}
+    assert 0 < STATS["func2"]["bytes read"] < STATS["func2"]["bytes written"]
+
+    # Statistics are accumulated in a file, and in-process values are cleared
+    write_stats(tmp_path)
+    write_stats(tmp_path)
+    assert 0 == STATS["func2"]["hit"]
+    assert 2 == read_stats(tmp_path)["func2"]["miss"]
+
+    func2(1)
+    write_stats(tmp_path)
+    assert 2 == read_stats(tmp_path)["func2"]["hit"]
+
+    # Existing files are merged into 1
+    assert 1 == len(list(tmp_path.glob("cache-stats*.json")))
+
+    # A file that cannot be read is kept, and not treated as empty
+    bad = tmp_path.joinpath("cache-stats.json")
+    bad.write_text('{"func2": {"hit"')
+    STATS["func2"].update(hit=1)
+    with assert_logs(caplog, f"Could not read cache statistics from {bad}"):
+        write_stats(tmp_path)
+    assert bad.exists()
+    assert 3 == read_stats(tmp_path)["func2"]["hit"]
+
+
+def _write_stats(path: Path, n: int) -> None:
+    STATS.clear()
+    STATS["func8"].update(hit=n)
+    write_stats(path)
+
+
+def test_stats_concurrent(tmp_path) -> None:
+    """Statistics written by concurrent processes are not lost."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    N = 16
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_write_stats, [tmp_path] * N, range(N)))
+
+    assert sum(range(N)) == read_stats(tmp_path)["func8"]["hit"]
+    # No temporary or claimed files remain
+    assert [] == list(tmp_path.glob(".*"))
+
+
+def test_cli(test_context, tmp_path) -> None:
+    from click.testing import CliRunner
+
+    from message_ix_models.util.cache import cli
+
+    test_context.core.cache_path = tmp_path
+    runner = CliRunner()
+
+    def invoke(*args) -> list[str]:
+        result = runner.invoke(cli, args, obj=test_context)
+        assert 0 == result.exit_code, result.output
+        return result.output.splitlines()
+
+    lines = invoke("stats")
+    assert f"Cache in {tmp_path}" in lines
+
+    # Totals include negative values, for instance from earlier versions
+    STATS.clear()
+    STATS["func6"].update({"hit": 1, "seconds saved": 0.5})
+    STATS["func7"].update({"hit": 2, "seconds saved": -1.5})
+    write_stats(tmp_path)
+    lines = invoke("stats")
+    rows = [line.split() for line in lines[lines.index(f"Cache in {tmp_path}") + 2 :]]
+    assert ["func6", "func7", "TOTAL"] == [r[0] for r in rows]
+    assert 3 == int(rows[-1][3])  # "hit"
+    assert -1.0 == pytest.approx(float(rows[-1][-1]), abs=0.01)  # "seconds saved"
+
+    assert any("Would delete" in line for line in invoke("prune", "--dry-run"))
+
+    result = runner.invoke(cli, ["prune", "--max-size=10X"], obj=test_context)
+    assert 0 != result.exit_code
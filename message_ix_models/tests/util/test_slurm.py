@@ -1,5 +1,12 @@
 import pytest
 
+from message_ix_models import Workflow
+from message_ix_models.util.slurm import FakeSbatch, Segment, partition
+
+
+def _action(context, scenario):
+    pass  # pragma: no cover
+
 
 @pytest.mark.parametrize(
     "sbatch_opts, env",
@@ -34,3 +41,53 @@ def test_cli(monkeypatch, tmp_path, mix_models_cli, sbatch_opts, env) -> None:
         "mix-models --opt0=0 foo --opt1=1 bar --opt2=2 baz",
     ):
         assert f"\n{line}\n" in result.output
+
+
+def test_partition(test_context) -> None:
+    wf = Workflow(test_context)
+    wf.add_step("base", None, target="ixmp://p/m/base")
+    wf.add_step("A", "base", _action, sbatch=dict(mem="8G"))
+    wf.add_step("B1", "A", _action)
+    wf.add_step("C1", "B1", _action)
+    wf.add_step("B2", "A", _action)
+    wf.add_step("B3", "A", _action, sbatch=dict(time="4:00:00"))
+    wf.add_step("C3", "B3", _action, sbatch=dict(mem="8G"))
+    wf.add_step("D3", "C3", _action, sbatch=dict(mem="16G"))
+    wf.add("all", ["C1", "B2", "D3"])
+
+    result = partition(wf, "all")
+
+    m8 = dict(mem="8G")
+    t4 = dict(time="4:00:00")
+    assert [
+        Segment(["base"]),
+        Segment(["A"], "base", m8),
+        Segment(["B1", "C1"], "A", m8),
+        Segment(["B2"], "A", m8),
+        # C3 has the same options as B3, which are partly inherited from A
+        Segment(["B3", "C3"], "A", m8 | t4),
+        Segment(["D3"], "C3", dict(mem="16G") | t4),
+    ] == result
+
+    # Only the steps needed for the target
+    assert [Segment(["base"]), Segment(["A", "B2"], "base", m8)] == partition(wf, "B2")
+
+
+def test_fake_sbatch(tmp_path) -> None:
+    sbatch = FakeSbatch()
+    script = f"""#!/bin/bash
+echo "$SLURM_ARRAY_JOB_ID $SLURM_ARRAY_TASK_ID" >> {tmp_path}/out
+test "$SLURM_ARRAY_TASK_ID" != 1
+"""
+
+    assert "1" == sbatch(["--array=0-2"], script)
+    assert "2" == sbatch(["--array=0-1", "--dependency=afterok:1_0"], script)
+    assert "3" == sbatch(["--dependency=afterok:1_1"], script)
+
+    # Tasks ran in order; task 1 of each job failed; job 3 was not run
+    assert ["1 0", "1 1", "1 2", "2 0", "2 1"] == (
+        tmp_path.joinpath("out").read_text().splitlines()
+    )
+    assert {"1_0": 0, "1_2": 0, "2_0": 0, "3_0": None} == {
+        k: v for k, v in sbatch.status.items() if v in (0, None)
+    }
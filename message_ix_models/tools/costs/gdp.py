@@ -190,23 +190,6 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
         log.warning(f"Use year={new_base_year} GDP data as proxy for {base_year}")
         base_year = new_base_year
 
-    def _constrain_cost_ratio(df: pd.DataFrame, base_year):
-        """Constrain "reg_cost_ratio_adj".
-
-        In cases where gdp_ratio_reg_to_reference is < 1 and reg_cost_ratio_adj > 1 in
-        the base period, ensure reg_cost_ratio_adj(y) <= reg_cost_ratio_adj(base_year)
-        for all future periods y.
-        """
-        ref = df.query("year == @base_year").iloc[0]
-        if ref.gdp_ratio_reg_to_reference < 1 and ref.reg_cost_ratio_adj > 1:
-            return df.assign(
-                reg_cost_ratio_adj=df.reg_cost_ratio_adj.clip(
-                    upper=ref.reg_cost_ratio_adj
-                )
-            )
-        else:
-            return df
-
     #  1. Select base-year GDP data for "gdp_ratio_reg_to_reference".
     #  2. Drop "year".
     #  3. Merge `df_region_diff` for "reg_cost_ratio".
@@ -218,8 +201,7 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
     #     distinct values for each period.
     #  8. Compute ref_cost_ratio_adj
     #  9. Fill 1.0 where NaNs occur in (8), i.e. for the reference region.
-    # 10. Group by (sv, s, r, t) and apply _constrain_cost_ratio(), above, to each
-    #     group.
+    # 10. Constrain "reg_cost_ratio_adj" with _constrain_cost_ratio(), below.
     # 11. Select the desired columns.
     return (
         df_gdp.query("year == @base_year")
@@ -231,11 +213,7 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
         .merge(df_gdp, on=["scenario_version", "scenario", "region"], how="right")
         .eval("reg_cost_ratio_adj = slope * gdp_ratio_reg_to_reference + intercept")
         .fillna({"reg_cost_ratio_adj": 1.0})
-        .groupby(
-            ["scenario_version", "scenario", "region", "message_technology"],
-            group_keys=False,
-        )
-        .apply(_constrain_cost_ratio, base_year)[
+        .pipe(_constrain_cost_ratio, base_year)[
             [
                 "scenario_version",
                 "scenario",
@@ -247,3 +225,30 @@ def adjust_cost_ratios_with_gdp(region_diff_df, config: Config):
             ]
         ]
     )
+
+
+def _constrain_cost_ratio(df: pd.DataFrame, base_year: int) -> pd.DataFrame:
+    """Constrain "reg_cost_ratio_adj".
+
+    In cases where gdp_ratio_reg_to_reference is < 1 and reg_cost_ratio_adj > 1 in the
+    base period, ensure reg_cost_ratio_adj(y) <= reg_cost_ratio_adj(base_year) for all
+    future periods y.
+
+    This is computed for all groups of (scenario_version, scenario, region,
+    message_technology) at once. Like :meth:`pandas.DataFrame.groupby`, rows with
+    missing values for any of these are dropped.
+    """
+    cols = ["scenario_version", "scenario", "region", "message_technology"]
+
+    df = df.dropna(subset=cols)
+
+    # Upper bound for each group: base-period value, only where the condition applies
+    upper = (
+        df.query("year == @base_year")
+        .drop_duplicates(subset=cols)
+        .query("gdp_ratio_reg_to_reference < 1 and reg_cost_ratio_adj > 1")
+        .set_index(cols)["reg_cost_ratio_adj"]
+    )
+    upper = pd.MultiIndex.from_frame(df[cols]).map(upper).to_numpy()
+
+    return df.assign(reg_cost_ratio_adj=df.reg_cost_ratio_adj.clip(upper=upper))
@@ -4,7 +4,6 @@ from itertools import product
 
 import numpy as np
 import pandas as pd
-from numpy.polynomial import Polynomial
 
 from .config import Config
 from .decay import project_ref_region_inv_costs_using_reduction_rates
@@ -257,39 +256,26 @@ def create_projections_converge(config: "Config"):
         .drop_duplicates()
     )
 
-    y_predict = np.array(config.seq_years)
-    y_index = pd.Index(config.seq_years, name="year")
-
-    def _predict(df: pd.DataFrame) -> pd.Series:
-        """Fit a degree-3 polynomial to `df` and predict for :attr:`.seq_years`."""
-        # Fit
-        p = Polynomial.fit(df.year, df.inv_cost_tmp, deg=1)
-
-        # - Predict using config.seq_years.
-        # - Assemble a single-column data frame with "year" as the index name.
-        return pd.DataFrame({"inv_pre_converge_decay": p(y_predict)}, index=y_index)
-
     # Columns for grouping and merging
     cols = ["scenario", "message_technology", "region"]
 
-    # Apply polynomial regression to costs at base year and convergence year
-    # (interpolating)
-    df_pre_converge_costs = (
+    # Fit a line to costs at base year and convergence year (interpolating), for all
+    # groups at once
+    df_fit = _fit_linear(
         df_tmp_costs.query(
             "year == @config.base_year or year == @config.convergence_year"
-        )
-        .groupby(cols[:3], group_keys=True)
-        .apply(_predict)
-        .reset_index()
+        ),
+        cols,
+        "year",
+        "inv_cost_tmp",
     )
 
     # Get final investment costs
     df_inv_costs_final = (
-        df_tmp_costs.merge(
-            df_pre_converge_costs,
-            on=["scenario", "message_technology", "region", "year"],
-        )
+        df_tmp_costs.merge(df_fit, on=cols)
+        .query("year in @config.seq_years")
         .assign(
+            inv_pre_converge_decay=lambda x: x.y_mean + x.slope * (x.year - x.x_mean),
             inv_cost_converge=lambda x: np.where(
                 x.year <= config.base_year,
                 x.reg_cost_base_year,
@@ -304,7 +290,6 @@ def create_projections_converge(config: "Config"):
                 ),
             ),
         )
-        .drop_duplicates()
     )
 
     # Get fixed O&M costs
@@ -333,6 +318,35 @@ def create_projections_converge(config: "Config"):
     return df_costs
 
 
+def _fit_linear(df: pd.DataFrame, by: list[str], x: str, y: str) -> pd.DataFrame:
+    """Fit a line to `y` versus `x` in each group of `df`.
+
+    The result is the same as :meth:`numpy.polynomial.Polynomial.fit` with
+    :py:`deg=1`, applied to each group, but is computed for all groups at once. For two
+    points per group, this is linear interpolation between them.
+
+    Returns
+    -------
+    pandas.DataFrame
+        with columns `by`, "x_mean", "y_mean", and "slope", one row per group. The
+        fitted value at `x` is :py:`y_mean + slope * (x - x_mean)`. "slope" is 0 for
+        groups with a single distinct value of `x`.
+    """
+    g = df.groupby(by)
+    # Center on the group mean of `x` for numerical precision
+    dx = df[x] - g[x].transform("mean")
+    sums = (
+        df[by]
+        .assign(dxy=dx * df[y], dxx=dx**2)
+        .groupby(by)
+        .sum()
+        .assign(x_mean=g[x].mean(), y_mean=g[y].mean())
+    )
+    return sums.assign(slope=(sums.dxy / sums.dxx).where(sums.dxx > 0, 0.0))[
+        ["x_mean", "y_mean", "slope"]
+    ].reset_index()
+
+
 def create_message_outputs(
     df_projections: pd.DataFrame, config: "Config"
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -578,10 +592,12 @@ def create_iamc_outputs(
     iamc_fix = (
         (
             msg_fix.assign(
-                Variable=lambda x: "OM Cost|Electricity|"
-                + x.technology
-                + "|Vintage="
-                + x.year_vtg.astype(str),
+                Variable=lambda x: (
+                    "OM Cost|Electricity|"
+                    + x.technology
+                    + "|Vintage="
+                    + x.year_vtg.astype(str)
+                ),
             )
             .rename(
                 columns={
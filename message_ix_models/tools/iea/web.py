@@ -1,10 +1,13 @@
 """Tools for IEA (Extended) World Energy Balance (WEB) data."""
 
 import logging
+import operator
+import os
 import zipfile
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
 from copy import copy
 from enum import Flag
+from functools import reduce
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 
@@ -26,6 +29,7 @@ from message_ix_models.util._logging import silence_log
 
 if TYPE_CHECKING:
     import os
+    from concurrent.futures import Future
 
     import genno
     from genno.types import TQuantity
@@ -299,6 +303,10 @@ def fwf_to_csv(path: Path, progress: bool = False) -> Path:  # pragma: no cover
     This appears to operate at about 900k lines / second, about 1 minute for the IEA
     2023 .TXT files. This is faster than doing full pandas I/O, which takes 5–10 minutes
     depending on formats.
+
+    See also
+    --------
+    fwf_to_parquet
     """
     import io
     import re
@@ -333,6 +341,133 @@ def fwf_to_csv(path: Path, progress: bool = False) -> Path:  # pragma: no cover
     return path_out
 
 
+def fwf_to_parquet(
+    path: Path,
+    *,
+    chunk_size: int = 2**26,
+    max_workers: Optional[int] = None,
+    progress: bool = False,
+) -> Path:
+    """Convert the IEA fixed-width file format to a Parquet data set.
+
+    The file at `path` is read in chunks of about `chunk_size` bytes, each containing
+    complete lines. The chunks are parsed in parallel by up to `max_workers` processes,
+    and each is written to separate Parquet files. At most 2 × `max_workers` chunks are
+    held in memory at once, regardless of the size of the file.
+
+    The resulting data set is in a directory with the same name as `path` and the
+    suffix ".parquet". It is partitioned by "MEASURE" (`Hive-style
+    <https://arrow.apache.org/docs/python/dataset.html#partitioning-performance-considerations>`_);
+    within each file, rows are in the same order as in `path`, which is grouped by
+    "COUNTRY", so that filters on this column can skip row groups using their
+    statistics. The "TIME" and "Value" columns are numeric; missing values like ".."
+    are converted to NaN.
+
+    If `max_workers` is 0 or the file is smaller than `chunk_size`, all chunks are
+    parsed in the current process.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    path_out = path.with_suffix(".parquet")
+    # Written after all chunks; its presence indicates complete conversion
+    done = path_out.joinpath("_SUCCESS")
+    if done.exists() and done.stat().st_mtime > path.stat().st_mtime:
+        log.info(
+            f"Skip conversion; data set exists and is newer than source: {path_out}"
+        )
+        return path_out
+
+    # Remove any partial output from a previous conversion
+    for p in sorted(path_out.rglob("*"), reverse=True) if path_out.exists() else []:
+        p.rmdir() if p.is_dir() else p.unlink()
+
+    log.info(f"Convert {path} → {path_out}")
+
+    from tqdm import tqdm
+
+    chunks = _iter_chunks(path, chunk_size)
+    pbar = tqdm(
+        total=path.stat().st_size, unit="B", unit_scale=True, disable=not progress
+    )
+
+    if max_workers == 0 or path.stat().st_size <= chunk_size:
+        for i, data in enumerate(chunks):
+            _fwf_chunk_to_parquet(data, path_out, i)
+            pbar.update(len(data))
+    else:
+        # Same default as ProcessPoolExecutor
+        n = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            n, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures: list["Future"] = []
+            for i, data in enumerate(chunks):
+                futures.append(
+                    executor.submit(_fwf_chunk_to_parquet, data, path_out, i)
+                )
+                pbar.update(len(data))
+                # Limit the number of chunks in memory; raise any exceptions
+                while len(futures) >= 2 * n:
+                    futures.pop(0).result()
+
+            for future in futures:
+                future.result()
+
+    pbar.close()
+    done.touch()
+
+    return path_out
+
+
+def _iter_chunks(path: Path, chunk_size: int) -> Iterator[bytes]:
+    """Iterate over chunks of about `chunk_size` bytes of complete lines in `path`."""
+    with open(path, "rb") as f:
+        while data := f.read(chunk_size) + f.readline():
+            yield data
+
+
+def _fwf_chunk_to_parquet(data: bytes, path_out: Path, index: int) -> None:
+    """Parse one chunk of fixed-width `data` and write to Parquet files.
+
+    Used by :func:`fwf_to_parquet`.
+    """
+    import re
+
+    import pyarrow as pa
+    import pyarrow.csv
+    import pyarrow.parquet
+
+    # - Strip trailing spaces from each line.
+    # - Convert sequences of 2 or more spaces to commas; same as :func:`fwf_to_csv`.
+    data = re.sub(b" {2,}", b",", re.sub(b" +(?=\r?\n|$)", b"", data))
+
+    table = pa.csv.read_csv(
+        pa.py_buffer(data),
+        read_options=pa.csv.ReadOptions(column_names=DIMS + ["Value"]),
+        convert_options=pa.csv.ConvertOptions(
+            column_types={
+                "COUNTRY": pa.string(),
+                "PRODUCT": pa.string(),
+                "TIME": pa.int64(),
+                "FLOW": pa.string(),
+                "MEASURE": pa.string(),
+                "Value": pa.float64(),
+            },
+            null_values=["..", "c", "x"],
+            strings_can_be_null=False,
+        ),
+    )
+
+    pa.parquet.write_to_dataset(
+        table,
+        path_out,
+        partition_cols=["MEASURE"],
+        basename_template=f"part-{index:05d}-{{i}}.parquet",
+        row_group_size=2**16,
+    )
+
+
 def unpack_zip(path: Path) -> Path:
     """Unpack a ZIP archive."""
     cache_dir = user_cache_path("message-ix-models", ensure_exists=True).joinpath("iea")
@@ -356,16 +491,28 @@ def unpack_zip(path: Path) -> Path:
 def iea_web_data_for_query(
     base_path: Path, *filenames: str, query_expr: str
 ) -> pd.DataFrame:
-    """Load data from `base_path` / `filenames` in IEA WEB formats."""
+    """Load data from `base_path` / `filenames` in IEA WEB formats.
+
+    Files in the IEA fixed-width format (".TXT") are converted using
+    :func:`fwf_to_parquet`, and the resulting data set is read with :mod:`pyarrow`.
+    Other files are read as CSV using :mod:`dask.dataframe`.
+
+    Where possible, `query_expr` is converted by :func:`query_to_filter` and applied
+    while reading, so that memory use depends on the size of the selection, rather
+    than the size of the files.
+    """
     import dask.dataframe as dd
 
     names_to_read = []  # Filenames to pass to dask.dataframe
+    parquet_to_read = []  # Parquet data sets to pass to pyarrow
     # Keyword arguments for read_csv()
     # - Certain values appearing in (IEA, 2024) are mapped to NaN.
     # - The Value column is numeric.
     args: dict[str, Any] = dict(
         dtype={"Value": float},
         na_values=[".. ", "c ", "x "],
+        header=0,
+        usecols=DIMS + ["Value"],
     )
 
     # Iterate over origin filenames
@@ -375,25 +522,168 @@ def iea_web_data_for_query(
         if path.suffix == ".zip":
             path = unpack_zip(path)
 
-        if path.suffix == ".TXT":  # pragma: no cover
-            names_to_read.append(fwf_to_csv(path, progress=True))
-            args.update(header=None, names=DIMS + ["Value"])
+        if path.suffix == ".TXT":
+            parquet_to_read.append(fwf_to_parquet(path, progress=True))
         else:
             names_to_read.append(path)
-            args.update(header=0, usecols=DIMS + ["Value"])
 
-    with silence_log("fsspec.local"):
-        ddf = dd.read_csv(names_to_read, engine="pyarrow", **args)
-        ddf = ddf[ddf["MEASURE"] == "TJ"]
-        # NB compute() must precede query(), else "ValueError: The columns in the
-        # computed data do not match the columns in the provided metadata" occurs with
-        # the CSV-formatted data.
-        result = ddf.compute().query(query_expr).dropna(subset=["Value"])
+    dfs = [_read_parquet(parquet_to_read, query_expr)] if parquet_to_read else []
+
+    if names_to_read:
+        with silence_log("fsspec.local"):
+            ddf = dd.read_csv(names_to_read, engine="pyarrow", **args)
+            # Select columns in a fixed order, then filter each partition before
+            # compute()
+            ddf = ddf[DIMS + ["Value"]]
+            ddf = ddf[ddf["MEASURE"] == "TJ"]
+            if (mask := query_to_filter(query_expr, ddf.__getitem__)) is not None:
+                ddf = ddf[mask]
+            dfs.append(ddf.compute())
+
+    # Apply the full `query_expr` in case it could not be converted, in whole or part
+    result = (
+        pd.concat(dfs, ignore_index=True)
+        .query(query_expr)
+        .dropna(subset=["Value"])
+        .reset_index(drop=True)
+    )
 
     log.info(f"{len(result)} observations")
     return result
 
 
+def query_to_filter(expr: str, field: Callable[[str], Any]) -> Any:
+    """Convert a :meth:`pandas.DataFrame.query` expression to a filter.
+
+    Comparisons (:py:`==`, :py:`!=`, :py:`<`, :py:`<=`, :py:`>`, :py:`>=`,
+    :py:`in`, :py:`not in`) between one of :data:`DIMS` or "Value" and literal values,
+    combined with :py:`and`/:py:`&`, :py:`or`/:py:`|` and :py:`not`/:py:`~`, are
+    supported. The filter selects the same rows as `expr`, except that rows with
+    missing values may be excluded by :py:`!=` or :py:`not in`.
+
+    Parameters
+    ----------
+    expr : str
+        Query expression, for instance :py:`"MEASURE == 'TJ' and TIME >= 1980"`.
+    field : callable
+        Called with a column name; returns an object that supports the comparison and
+        logical operators, for instance :func:`pyarrow.dataset.field` or
+        :meth:`dask.dataframe.DataFrame.__getitem__`.
+
+    Returns
+    -------
+    object
+        Combination of the return values of `field`.
+    None
+        if any part of `expr` is not supported.
+    """
+    import ast
+
+    try:
+        return _to_filter(ast.parse(expr.strip(), mode="eval").body, field)
+    except (SyntaxError, _Unsupported):
+        return None
+
+
+class _Unsupported(Exception):
+    """Part of a query expression that :func:`query_to_filter` cannot convert."""
+
+
+#: Operators supported by :func:`query_to_filter`.
+_OP: dict[str, Callable[..., Any]] = {
+    "Eq": operator.eq,
+    "NotEq": operator.ne,
+    "Lt": operator.lt,
+    "LtE": operator.le,
+    "Gt": operator.gt,
+    "GtE": operator.ge,
+    "In": lambda a, b: a.isin(b),
+    "NotIn": lambda a, b: ~a.isin(b),
+    "And": operator.and_,
+    "BitAnd": operator.and_,
+    "Or": operator.or_,
+    "BitOr": operator.or_,
+    "Not": operator.invert,
+    "Invert": operator.invert,
+}
+
+#: Reversed comparison operators, for expressions like :py:`1980 <= TIME`.
+_REVERSE = {"Lt": "Gt", "LtE": "GtE", "Gt": "Lt", "GtE": "LtE"}
+
+
+def _to_filter(node, field):
+    """Recursive helper for :func:`query_to_filter`."""
+    import ast
+
+    def op(node) -> Callable:
+        try:
+            return _OP[type(node).__name__]
+        except KeyError:
+            raise _Unsupported(node)
+
+    if isinstance(node, ast.BoolOp):
+        return reduce(op(node.op), (_to_filter(v, field) for v in node.values))
+    elif isinstance(node, ast.BinOp):
+        return op(node.op)(_to_filter(node.left, field), _to_filter(node.right, field))
+    elif isinstance(node, ast.UnaryOp):
+        return op(node.op)(_to_filter(node.operand, field))
+    elif not isinstance(node, ast.Compare):
+        raise _Unsupported(node)
+
+    # Comparison, possibly chained like `1980 <= TIME < 2000`
+    operands = [node.left] + node.comparators
+    return reduce(
+        operator.and_,
+        (_compare(*args, field) for args in zip(operands[:-1], node.ops, operands[1:])),
+    )
+
+
+def _compare(left, cmp_op, right, field):
+    """Convert a single comparison for :func:`_to_filter`."""
+    import ast
+
+    name = type(cmp_op).__name__
+    if isinstance(left, ast.Name):
+        column, value = left.id, right
+    elif isinstance(right, ast.Name) and name in _REVERSE:
+        column, value, name = right.id, left, _REVERSE[name]
+    else:
+        raise _Unsupported(cmp_op)
+
+    if column not in DIMS + ["Value"] or name not in _OP:
+        raise _Unsupported(cmp_op)
+
+    try:
+        value = ast.literal_eval(value)
+    except (TypeError, ValueError):
+        raise _Unsupported(cmp_op)
+
+    if name in ("In", "NotIn"):
+        value = list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+    return _OP[name](field(column), value)
+
+
+def _read_parquet(paths: list[Path], query_expr: str) -> pd.DataFrame:
+    """Read data with MEASURE "TJ" from Parquet data sets written by
+    :func:`fwf_to_parquet`.
+
+    Where possible, `query_expr` is converted to a filter expression. Only row groups
+    and partitions that may contain matching data are read.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        [ds.dataset(p, format="parquet", partitioning="hive") for p in paths]
+    )
+
+    filter_ = ds.field("MEASURE") == "TJ"
+    if (f := query_to_filter(query_expr, ds.field)) is not None:
+        filter_ &= f
+
+    return dataset.to_table(columns=DIMS + ["Value"], filter=filter_).to_pandas()
+
+
 def load_data(
     provider: str,
     edition: str,
@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Optional, Protocol, Union
 
 import message_ix
+import numpy as np
 import pandas as pd
 import pint
 from platformdirs import user_cache_path
@@ -58,6 +59,7 @@ __all__ = [
     "broadcast",
     "cached",
     "check_support",
+    "coalesce_par_data",
     "convert_units",
     "copy_column",
     "datetime_now_with_tz",
@@ -91,50 +93,113 @@ log = logging.getLogger(__name__)
 
 
 def add_par_data(
-    scenario: message_ix.Scenario, data: "ParameterData", dry_run: bool = False
+    scenario: message_ix.Scenario,
+    data: Mapping[str, Any],
+    dry_run: bool = False,
 ) -> int:
     """Add `data` to `scenario`.
 
+    Each parameter is written with a single call to :meth:`~ixmp.Scenario.add_par`.
+    While the data for one parameter are being written, the data for the others are
+    prepared (see :func:`coalesce_par_data`) in a separate thread.
+
     Parameters
     ----------
     data
         Any mapping with keys that are valid :mod:`message_ix` parameter names, and
-        values that are pd.DataFrame or other arguments valid for
-        :meth:`message_ix.Scenario.add_par`.
+        values that are :class:`pandas.DataFrame`—or sequences of data frame fragments
+        with the same columns—with the structure returned by :func:`.make_df`. Other
+        values, for instance :class:`pandas.Series` or other arguments valid for
+        :meth:`message_ix.Scenario.add_par`, are passed unchanged.
     dry_run : optional
         Only show what would be done.
 
+    Returns
+    -------
+    int
+        Total number of rows added across all parameters.
+
     See also
     --------
     strip_par_data
     """
+    from concurrent.futures import ThreadPoolExecutor
+    from time import perf_counter
+
     # TODO optionally add units automatically
     # TODO allow units column entries to be pint.Unit objects
 
     total = 0
 
-    for par_name, values in data.items():
-        N = values.shape[0]
-        log.info(f"{N} rows in {repr(par_name)}")
-        log.debug("\n" + values.to_string(max_rows=5))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Prepare data for parameters in order, ahead of the writes below
+        prepared = executor.map(coalesce_par_data, data.values())
 
-        total += N
+        for par_name, values in zip(data.keys(), prepared):
+            N = len(values)
+            log.info(f"{N} rows in {repr(par_name)}")
+            if isinstance(values, (pd.DataFrame, pd.Series)):
+                log.debug("\n" + values.to_string(max_rows=5))
 
-        if dry_run:
-            continue
+            total += N
 
-        # Work around iiasa/ixmp#425
-        values["unit"] = values["unit"].str.replace("^$", "-", regex=True)
+            if dry_run or N == 0:
+                continue
 
-        try:
-            scenario.add_par(par_name, values)
-        except Exception:  # pragma: no cover
-            print(values.head())
-            raise
+            start = perf_counter()
+            try:
+                scenario.add_par(par_name, values)
+            except Exception:  # pragma: no cover
+                print(values.head())
+                raise
+            log.info(f"  {N / max(perf_counter() - start, 1e-9):.0f} rows/s")
 
     return total
 
 
+def coalesce_par_data(values: Any) -> Any:
+    """Combine fragments of data for one parameter into a single data frame.
+
+    The fragments are concatenated; rows with the same key (all columns except "value"
+    and "unit") are de-duplicated, keeping the *last*. This gives the same result as
+    calling :meth:`~ixmp.Scenario.add_par` with each fragment in turn. The "value"
+    column is converted to :class:`float`, and empty units are replaced with "-" (work
+    around iiasa/ixmp#425). The argument(s) are not modified.
+
+    Any `values` that are neither a data frame nor a non-empty sequence of data frames
+    are returned unchanged.
+    """
+    if isinstance(values, pd.DataFrame):
+        fragments = [values]
+    elif (
+        isinstance(values, Sequence)
+        and len(values)
+        and all(isinstance(v, pd.DataFrame) for v in values)
+    ):
+        fragments = list(values)
+    else:
+        return values
+
+    if len(fragments) == 1:
+        result = fragments[0].copy()
+    else:
+        result = pd.concat(fragments, ignore_index=True)
+
+    if result.empty:
+        return result
+
+    key = [c for c in result.columns if c not in ("value", "unit")]
+    if len(fragments) > 1 and key:
+        result = result.drop_duplicates(subset=key, keep="last", ignore_index=True)
+
+    if "value" in result.columns:
+        result["value"] = result["value"].astype(float)
+    if "unit" in result.columns:
+        result["unit"] = result["unit"].where(result["unit"] != "", "-")
+
+    return result
+
+
 def aggregate_codes(df: pd.DataFrame, dim: str, codes):  # pragma: no cover
     """Aggregate `df` along dimension `dim` according to `codes`."""
     raise NotImplementedError
@@ -149,7 +214,11 @@ def aggregate_codes(df: pd.DataFrame, dim: str, codes):  # pragma: no cover
 
 
 def broadcast(
-    df: pd.DataFrame, labels: Optional[pd.DataFrame] = None, **kwargs
+    df: pd.DataFrame,
+    labels: Optional[pd.DataFrame] = None,
+    *,
+    categorical: bool = False,
+    **kwargs,
 ) -> pd.DataFrame:
     """Fill missing data in `df` by broadcasting.
 
@@ -160,15 +229,20 @@ def broadcast(
     `labels` (if any) are handled first: one copy or duplicate of `df` is produced for
     each row (set of labels) in this argument. Then, `kwargs` are handled;
     :func:`broadcast` returns one copy for each element in the cartesian product of the
-    dimension labels given by `kwargs`.
+    dimension labels given by `kwargs`. The result is constructed in a single step by
+    repeating the row indices of `df`, rather than by concatenating copies.
 
     Parameters
     ----------
     labels : pandas.DataFrame
         Each column (dimension) corresponds to one in `df`. Each row represents one
         matched set of labels for those dimensions.
+    categorical : bool, optional
+        If :any:`True`, the filled columns have :class:`pandas.CategoricalDtype`. This
+        reduces memory use for large results.
     kwargs
-        Keys are dimensions. Values are labels along that dimension to fill.
+        Keys are dimensions. Values are labels along that dimension to fill. A single
+        label (:class:`str` or other scalar) is treated as a list of 1 label.
 
     Returns
     -------
@@ -214,33 +288,59 @@ def broadcast(
         # Check the dimensions
         for dim in labels.columns:
             _check_dim(dim)
-        # Concatenate 1 copy of `df` for each row in `labels`
-        df = pd.concat(
-            [df.assign(**row) for _, row in labels.iterrows()],
-            ignore_index=True,
-            sort=False,
-        )
+        # 1 copy of `df` for each row in `labels`
+        N = len(df)
+        codes = np.repeat(np.arange(len(labels)), N)
+        df = df.iloc[np.tile(np.arange(N), len(labels))].reset_index(drop=True)
+        for dim in labels.columns:
+            df[dim] = _fill(pd.Index(labels[dim]), codes, categorical)
 
     # Next, broadcast other dimensions given as keyword arguments
+    dims = {}
     for dim, levels in kwargs.items():
         _check_dim(dim)
-        if len(levels) == 0:
+        index = _as_index(levels)
+        if len(index) == 0:
             log.debug(
                 f"Don't broadcast over {repr(dim)}; labels {levels} have length 0"
             )
             continue
+        dims[dim] = index
 
-        # - Duplicate the data
-        # - Drop the existing column named 'dim'
-        # - Re-add the column from the constructed MultiIndex
-        # - Reindex for sequential row numbers
-        df = (
-            pd.concat([df] * len(levels), keys=levels, names=[dim], sort=False)
-            .drop(dim, axis=1)
-            .reset_index(dim)
-            .reset_index(drop=True)
-        )
-    return df
+    if not dims:
+        return df
+
+    # The first dimension in `kwargs` varies fastest and the last slowest, i.e. the
+    # result contains one contiguous block for each label of the last dimension
+    N, sizes = len(df), [len(v) for v in dims.values()]
+
+    # Duplicate the data
+    result = df.drop(list(dims), axis=1)
+    result = result.iloc[np.tile(np.arange(N), int(np.prod(sizes)))]
+    result = result.reset_index(drop=True)
+
+    # Fill each dimension, placing the column first
+    for i, (dim, values) in enumerate(dims.items()):
+        inner, outer = N * int(np.prod(sizes[:i])), int(np.prod(sizes[i + 1 :]))
+        codes = np.tile(np.repeat(np.arange(sizes[i]), inner), outer)
+        result.insert(0, dim, _fill(values, codes, categorical))
+
+    return result
+
+
+def _as_index(levels) -> pd.Index:
+    """Return `levels` as an index; a :class:`str` or scalar gives 1 label."""
+    if isinstance(levels, str) or not isinstance(levels, Iterable):
+        levels = [levels]
+    return pd.Index(levels)
+
+
+def _fill(values: pd.Index, codes: np.ndarray, categorical: bool):
+    """Return labels from `values` selected by `codes`; used by :func:`broadcast`."""
+    if categorical and values.is_unique:
+        return pd.Categorical.from_codes(codes, categories=values)
+    result = values.take(codes)
+    return pd.Categorical(result) if categorical else result.array
 
 
 def check_support(context, settings=dict(), desc: str = "") -> None:
@@ -829,7 +929,7 @@ def show_versions() -> str:
 def strip_par_data(  # noqa: C901
     scenario: message_ix.Scenario,
     set_name: str,
-    element: str,
+    element: Union[str, Collection[str]],
     dry_run: bool = False,
     dump: Optional["MutableParameterData"] = None,
 ) -> int:
@@ -837,6 +937,11 @@ def strip_par_data(  # noqa: C901
 
     Parameters
     ----------
+    element : str or collection of str
+        Element(s) to remove. If a collection is given, the elements are removed as a
+        batch: each parameter indexed by `set_name` is read once with a list filter and
+        data for all the elements are removed in a single call, instead of once per
+        element. The number of backend calls avoided in this way is logged.
     dry_run : bool, optional
         If :data:`True`, only show what would be done.
     dump : dict, optional
@@ -852,15 +957,26 @@ def strip_par_data(  # noqa: C901
     --------
     add_par_data
     """
+    elements = (
+        list(element)
+        if isinstance(element, Collection) and not isinstance(element, str)
+        else [element]
+    )
+    if not elements:
+        return 0
+
     par_list = scenario.par_list()
     no_data = set()  # Names of parameters with no data being stripped
     total = 0  # Total observations stripped
+    # Backend calls made; and that would be made by removing one element at a time
+    calls = dict(batch=0, single=0)
 
     if dump is None:
         pars = []  # Don't iterate over parameters unless dumping
     else:
         log.info(
-            f"Remove data with {set_name}={element!r}"
+            f"Remove data with {set_name}="
+            + (repr(elements[0]) if len(elements) == 1 else f"{elements!r}")
             + (" (DRY RUN)" if dry_run else "")
         )
         # Iterate over parameters with ≥1 dimensions indexed by `set_name`
@@ -878,10 +994,12 @@ def strip_par_data(  # noqa: C901
             lambda item: item[1] == set_name,
             zip(scenario.idx_names(par_name), scenario.idx_sets(par_name)),
         ):
-            # Check for contents of par_name that include `element`
-            par_data = scenario.par(par_name, filters={dim: element})
+            # Check for contents of par_name that include any of `elements`
+            par_data = scenario.par(par_name, filters={dim: elements})
             N = len(par_data)
             total += N
+            calls["batch"] += 1
+            calls["single"] += len(elements)
 
             if N == 0:
                 # No data; no need to do anything further
@@ -906,6 +1024,8 @@ def strip_par_data(  # noqa: C901
 
             # Actually remove the data
             scenario.remove_par(par_name, key=par_data)
+            calls["batch"] += 1
+            calls["single"] += par_data[dim].nunique()
 
             # NB would prefer to do the following, but raises an exception:
             # scenario.remove_par(par_name, key={set_name: [value]})
@@ -916,13 +1036,47 @@ def strip_par_data(  # noqa: C901
         log.debug(f"No data removed from {len(no_data)} other parameters")
 
     if not dry_run:
-        log.info(f"Remove {element!r} from set {set_name!r}")
-        try:
-            scenario.remove_set(set_name, element)
-        except Exception as e:
-            if "does not have an element" in str(e):
-                log.info("  …not found")
-            else:  # pragma: no cover
-                raise
+        calls["batch"] += _remove_set_elements(scenario, set_name, elements)
+        calls["single"] += len(elements)
+
+    if len(elements) > 1:
+        log.info(
+            f"  {calls['batch']} backend calls for {len(elements)} elements; "
+            f"{calls['single'] - calls['batch']} saved by batching"
+        )
 
     return total
+
+
+def _remove_set_elements(
+    scenario: message_ix.Scenario, set_name: str, elements: list
+) -> int:
+    """Remove `elements` from `set_name`, skipping elements that are not present.
+
+    Used by :func:`strip_par_data`. Returns the number of backend calls made.
+    """
+    if len(elements) == 1:
+        log.info(f"Remove {elements[0]!r} from set {set_name!r}")
+    else:
+        log.info(f"Remove {len(elements)} elements from set {set_name!r}")
+
+    # Skip absent elements: a single one would cause the entire call to fail
+    existing = scenario.set(set_name)
+    if isinstance(existing, pd.Series):
+        present = set(existing)
+        for e in filter(lambda e: str(e) not in present, elements):
+            log.info(f"  …{e!r} not found")
+        elements = [e for e in elements if str(e) in present]
+
+    if not elements:
+        return 1
+
+    try:
+        scenario.remove_set(set_name, elements)
+    except Exception as e:  # pragma: no cover
+        if "does not have an element" in str(e):
+            log.info("  …not found")
+        else:
+            raise
+
+    return 2
@@ -8,20 +8,49 @@ included in the computed cache key:
   string representation / ID.
 - :class:`ixmp.Platform`, :class:`xarray.Dataset`: ignored, with a warning logged.
 - :class:`.ScenarioInfo`: only the :attr:`~ScenarioInfo.set` entries are hashed.
+- :class:`genno.Quantity`: a hash of the dimensions, units, index, and values. This is
+  computed once per object; quantities **should not** be modified in-place after they
+  are used as arguments to cached functions.
+- :class:`.Context`: all values; or only some keys, if the `context_keys` argument is
+  given to :func:`cached`.
+
+It also provides :func:`prune` to limit the size of the cache directory, and counts
+cache hits, misses, and bytes read or written (:data:`STATS`). These are accessible
+through the :program:`mix-models cache` CLI command.
+
+Optionally (see :data:`MEMORY_SIZE`), cached values are also kept in memory, so that
+repeated calls with the same arguments in one process do not read from disk.
 """
 
+import atexit
 import json
 import logging
-from collections.abc import Callable
+import os
+import pickle
+import re
+import time
+import weakref
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Callable, Iterator, Sequence
+from contextvars import ContextVar
+from copy import deepcopy
 from dataclasses import is_dataclass
 from enum import Enum
+from functools import partial, update_wrapper
+from hashlib import blake2b
+from pathlib import Path
 from types import FunctionType
-from typing import TYPE_CHECKING, Union
+from typing import Any, Optional, Union
+from uuid import uuid4
 
+import click
 import genno.caching
 import ixmp
+import numpy as np
+import pandas as pd
 import sdmx.model
 import xarray as xr
+from genno.caching import hash_args, hash_code
 
 from message_ix_models.types import AnyQuantity
 
@@ -29,10 +58,6 @@ from ._dataclasses import asdict
 from .context import Context
 from .scenarioinfo import ScenarioInfo
 
-if TYPE_CHECKING:
-    from pathlib import Path
-
-
 log = logging.getLogger(__name__)
 
 
@@ -40,15 +65,85 @@ log = logging.getLogger(__name__)
 #: :func:`.cached`. Set to :obj:`True` to force reload.
 SKIP_CACHE = False
 
+#: Maximum total size, in bytes, of cache files. If not :obj:`None`, then each time
+#: :func:`.cached` writes a new file, the least recently used files are deleted using
+#: :func:`prune` until the total is at most this size.
+MAX_SIZE: Optional[int] = None
+
+#: Maximum total size, in bytes, of cached values kept in memory. If 0 (the default),
+#: values are not kept in memory. Otherwise, :func:`.cached` first looks up values in
+#: memory, then on disk; and keeps up to this many bytes of the most recently used
+#: values. Copies of these values are returned, so callers cannot modify the cache.
+MEMORY_SIZE: int = 0
+
+#: Counts of cache "hit" and "miss" events, and of "bytes read" and "bytes written",
+#: for each function decorated with :func:`.cached` that has been called in the
+#: current process. Keys are function names. With :data:`MEMORY_SIZE`, "memory hit"
+#: events are also counted, and "seconds saved" compared to reading from disk—or, for
+#: values computed in the same process, to calling the function again. These are added
+#: to the totals in the cache directory when the process exits; see
+#: :func:`write_stats`.
+STATS: dict[str, Counter] = defaultdict(Counter)
+
+#: Name of a file in the cache directory containing accumulated :data:`STATS`. Each
+#: process writes its totals to a separate file with a name like
+#: :file:`cache-stats-{pid}-{token}.json`; :func:`read_stats` adds all of these.
+STATS_FILE = "cache-stats.json"
+
 # Paths already logged, to decrease verbosity
 PATHS_SEEN: set["Path"] = set()
 
+# Values kept in memory: (value, size in bytes, seconds to read from disk or compute),
+# keyed by cache file name, with the most recently used last
+_MEMORY: "OrderedDict[str, tuple[Any, int, float]]" = OrderedDict()
+
+# Always enabled in pandas ≥ 3.0; optional in earlier versions
+_COPY_ON_WRITE = (
+    int(pd.__version__.split(".")[0]) >= 3
+    or pd.get_option("mode.copy_on_write") is True
+)
+
+# pandas ≥ 2.1 stores DataFrame.attrs in Parquet files
+_PARQUET_ATTRS = tuple(map(int, pd.__version__.split(".")[:2])) >= (2, 1)
+
+# Names of cache files written by cached()/genno.caching.decorate(): the function name
+# and a hash of its arguments and code
+_FILE_NAME = re.compile(r"^(?P<name>.+)-[0-9a-f]{40}\.(parquet|pickle|pkl)$")
+
+
+# Hashes of AnyQuantity objects, keyed by id()
+_QUANTITY_HASH: dict[int, str] = {}
+
+# Keys of Context to be hashed by _context(), set by cached() while computing a key
+_CONTEXT_KEYS: ContextVar[Optional[Sequence[str]]] = ContextVar(
+    "_CONTEXT_KEYS", default=None
+)
+
 
 # Show genno how to hash function arguments seen in message_ix_models
 
 
 def _quantity(o: "AnyQuantity"):
-    return tuple(o.to_series().to_dict())
+    try:
+        return _QUANTITY_HASH[id(o)]
+    except KeyError:
+        pass
+
+    # Hash the data buffers directly, instead of converting to Python objects
+    s = o.to_series()
+    h = blake2b(json.dumps([list(map(str, s.index.names)), str(o.units)]).encode())
+    h.update(pd.util.hash_pandas_object(s, index=True).to_numpy().tobytes())
+    result = h.hexdigest()
+
+    try:
+        # Remove the entry when `o` is garbage collected
+        weakref.finalize(o, _QUANTITY_HASH.pop, id(o), None)
+    except TypeError:  # pragma: no cover
+        pass  # `o` does not support weak references; do not store
+    else:
+        _QUANTITY_HASH[id(o)] = result
+
+    return result
 
 
 try:
@@ -80,7 +175,22 @@ def _sdmx_internationalstring(o: sdmx.model.InternationalString):
 # First-party
 @genno.caching.Encoder.register
 def _context(o: Context):
-    return o.asdict()
+    keys = _CONTEXT_KEYS.get()
+    if keys is None:
+        return o.asdict()
+
+    # Only the given keys; "a.b" refers to attribute "b" of the value for key "a"
+    result = dict()
+    for key in keys:
+        first, *rest = key.split(".")
+        try:
+            value = o.get(first)
+        except KeyError:
+            value = None
+        for attr in rest:
+            value = getattr(value, attr, None)
+        result[key] = value
+    return result
 
 
 @genno.caching.Encoder.register
@@ -105,19 +215,35 @@ def _si(o: ScenarioInfo):
 genno.caching.Encoder.ignore(xr.DataArray, xr.Dataset, ixmp.Platform)
 
 
-def cached(func: Callable) -> Callable:
+def cached(
+    func: Optional[Callable] = None, *, context_keys: Optional[Sequence[str]] = None
+) -> Callable:
     """Decorator to cache the return value of a function `func`.
 
     On a first call, the data requested is returned and also cached under
     :meth:`.Context.get_cache_path`. On subsequent calls, if the cache exists, it is
-    used instead of calling the (possibly slow) `func`.
+    used instead of calling the (possibly slow) `func`. Data frames and
+    :class:`genno.Quantity` are stored as Parquet files; other data are pickled.
+
+    When :data:`.SKIP_CACHE` is true, `func` is always called. Usage is recorded in
+    :data:`.STATS`, and the cache size is limited according to :data:`.MAX_SIZE`. If
+    :data:`.MEMORY_SIZE` is set, values are also kept in memory.
 
-    When :data:`.SKIP_CACHE` is true, `func` is always called.
+    Parameters
+    ----------
+    context_keys : sequence of str, optional
+        Keys of any :class:`.Context` argument(s) that affect the return value of
+        `func`. Only these are hashed to identify cached values, instead of the entire
+        Context. Attributes of configuration objects can be given like "model.regions".
+        Use like :py:`@cached(context_keys=["model.regions", "transport.ssp"])`.
 
     See also
     --------
     :doc:`genno:cache` in the :mod:`genno` documentation
     """
+    if func is None:
+        return partial(cached, context_keys=context_keys)
+
     # Determine and create the cache path
     cache_path = Context.get_instance(-1).core.cache_path
     assert cache_path
@@ -126,11 +252,74 @@ def cached(func: Callable) -> Callable:
         log.debug(f"{func.__name__}() will cache in {cache_path}")
         PATHS_SEEN.add(cache_path)
         cache_path.mkdir(parents=True, exist_ok=True)
-
-    # Use the genno internals to wrap the function.
-    cached_load = genno.caching.decorate(
-        func, cache_path=cache_path, cache_skip=SKIP_CACHE
-    )
+        atexit.register(write_stats, cache_path)
+
+    # Hash of the function code; only computed once
+    code_hash = hash_code(func)
+
+    # Same as genno.caching.decorate(), plus bookkeeping
+    def cached_load(*args, **kwargs):
+        # Parts of the file name: function name, hash of arguments and code
+        token = _CONTEXT_KEYS.set(context_keys)
+        try:
+            name_parts = [func.__name__, hash_args(*args, code_hash, **kwargs)]
+        finally:
+            _CONTEXT_KEYS.reset(token)
+        # Path to the cache file, without suffix
+        path = cache_path.joinpath("-".join(name_parts))
+        # Shorter name for logging
+        short_name = f"{name_parts[0]}(<{name_parts[1][:8]}…>)"
+        stats = STATS[func.__name__]
+
+        if not SKIP_CACHE and path.name in _MEMORY:
+            log.info(f"Cache hit (memory) for {short_name}")
+            start = time.perf_counter()
+            data, _, seconds = _MEMORY[path.name]
+            _MEMORY.move_to_end(path.name)
+            data = _copy(data)
+            elapsed = time.perf_counter() - start
+            stats.update(
+                {"memory hit": 1, "seconds saved": max(seconds - elapsed, 0.0)}
+            )
+            return data
+
+        # Identify existing cache files
+        files = [] if SKIP_CACHE else list(cache_path.glob(f"{path.name}.*"))
+
+        if len(files) == 1:
+            log.info(f"Cache hit for {short_name}")
+            start = time.perf_counter()
+            data = _read(files[0])
+            seconds = time.perf_counter() - start
+
+            # Mark the file as recently used
+            os.utime(files[0])
+            size = files[0].stat().st_size
+            stats.update({"hit": 1, "bytes read": size})
+        else:
+            # Also occurs if len(files) >= 2
+            log.info(f"{'Skip cache' if SKIP_CACHE else 'Cache miss'} for {short_name}")
+
+            # Call the wrapped function, store, and return
+            start = time.perf_counter()
+            data = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+
+            size = _write(path, data).stat().st_size
+            stats.update({"miss": 1, "bytes written": size})
+
+            if MAX_SIZE is not None:
+                prune(cache_path, max_size=MAX_SIZE)
+
+        if MEMORY_SIZE > 0:
+            # Store the original; return a copy
+            _memory_store(path.name, data, _nbytes(data, size), seconds)
+            data = _copy(data)
+
+        return data
+
+    # Update the wrapped function with the docstring etc. of the original
+    update_wrapper(cached_load, func)
 
     if cached_load.__doc__ is not None:
         # Determine the indent
@@ -144,3 +333,300 @@ def cached(func: Callable) -> Callable:
         )
 
     return cached_load
+
+
+def _read(path: Path) -> Any:
+    """Read cached data from `path`, as written by :func:`_write`."""
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+        if df.attrs.pop("_is_genno_quantity", False):
+            return genno.Quantity(df["value"], units=df.attrs["_unit"])
+        return df
+    elif path.suffix in (".pickle", ".pkl"):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    else:  # pragma: no cover
+        raise RuntimeError(f"Unknown suffix {path.suffix!r} for cache file")
+
+
+def _write(path: Path, data: Any) -> Path:
+    """Write `data` to `path` with a suffix according to its type; return the path.
+
+    The file formats are the same as used by :func:`genno.caching.decorate` in recent
+    versions of :mod:`genno`, so that cache files can be shared.
+    """
+    if isinstance(data, pd.DataFrame) or (
+        isinstance(data, genno.Quantity) and _PARQUET_ATTRS
+    ):
+        if isinstance(data, genno.Quantity):
+            # Single-column data frame, marked to be converted back to Quantity
+            df = data.to_dataframe()
+            df.attrs.update(_unit=str(data.units), _is_genno_quantity=True)
+        else:
+            df = data
+
+        if df.empty and isinstance(df.index, pd.MultiIndex):
+            # Empty MultiIndex cannot be written; see dask/fastparquet#730
+            df = df.reset_index(drop=True)
+
+        result = path.with_suffix(".parquet")
+        df.to_parquet(result)
+    else:
+        result = path.with_suffix(".pickle")
+        with open(result, "wb") as f:
+            pickle.dump(data, f)
+
+    return result
+
+
+def _copy(data: Any) -> Any:
+    """Return a copy of `data` that can be modified without affecting `data`."""
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        # With copy-on-write, a shallow copy is enough
+        return data.copy(deep=not _COPY_ON_WRITE)
+    elif isinstance(data, (genno.Quantity, np.ndarray, xr.DataArray, xr.Dataset)):
+        return data.copy()
+    elif isinstance(data, (str, bytes, int, float, type(None))):
+        return data
+    else:
+        # Containers, such as dict of DataFrame: also copy the contents
+        return deepcopy(data)
+
+
+def _nbytes(data: Any, default: int) -> int:
+    """Return the size in memory of `data`, or `default` if this is not known."""
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return int(data.memory_usage(deep=True, index=True).sum())
+    return int(getattr(data, "nbytes", default))
+
+
+def _memory_store(key: str, data: Any, size: int, seconds: float) -> None:
+    """Keep `data` in memory, evicting least recently used values as needed."""
+    if size > MEMORY_SIZE:
+        return  # Too large to keep
+
+    _MEMORY[key] = (data, size, seconds)
+    _MEMORY.move_to_end(key)
+
+    total = sum(v[1] for v in _MEMORY.values())
+    while total > MEMORY_SIZE:
+        _, (_, evicted, _) = _MEMORY.popitem(last=False)
+        total -= evicted
+
+
+def iter_files(path: "os.PathLike") -> Iterator[tuple[Path, "os.stat_result"]]:
+    """Iterate over cache files written by :func:`.cached` in `path`.
+
+    Yields tuples of (path, :func:`os.stat` result). Other files and subdirectories,
+    for instance those used by :mod:`.util.pooch`, are ignored.
+    """
+    for p in Path(path).iterdir():
+        if _FILE_NAME.match(p.name) and p.is_file():
+            yield p, p.stat()
+
+
+def prune(
+    path: "os.PathLike",
+    *,
+    max_size: Optional[int] = None,
+    max_age: Optional[float] = None,
+    dry_run: bool = False,
+) -> list[Path]:
+    """Delete cache files from `path`.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Delete the least recently used files until the total size of the remaining
+        files is at most `max_size` bytes.
+    max_age : float, optional
+        Delete files that have not been used for more than `max_age` seconds.
+    dry_run : bool, optional
+        If :any:`True`, only return the files that would be deleted.
+
+    Returns
+    -------
+    list of Path
+        The deleted files.
+    """
+    # Most recently used first. cached() updates the modification time on each use;
+    # st_atime is not used as it is not updated on some file systems.
+    files = sorted(iter_files(path), key=lambda f: f[1].st_mtime, reverse=True)
+
+    now, total, result = time.time(), 0, []
+    for p, stat in files:
+        total += stat.st_size
+        if (max_age is not None and now - stat.st_mtime > max_age) or (
+            max_size is not None and total > max_size
+        ):
+            result.append(p)
+            total -= stat.st_size
+
+    if result:
+        log.info(
+            f"{'Would delete' if dry_run else 'Delete'} {len(result)} cache files; "
+            f"{total} bytes remain"
+        )
+    if not dry_run:
+        for p in result:
+            p.unlink(missing_ok=True)
+
+    return result
+
+
+def _stats_files(path: "os.PathLike") -> list[Path]:
+    """Return files in `path` containing accumulated :data:`STATS`."""
+    stem = Path(STATS_FILE).stem
+    return sorted(Path(path).glob(f"{stem}*.json"))
+
+
+def _read_stats_file(
+    path: Path, data: dict[str, Counter], name: Optional[Path] = None
+) -> bool:
+    """Add the statistics in the file `path` to `data`.
+
+    Returns :any:`False` if the file does not exist or cannot be read; in the latter
+    case, a warning is logged that refers to the file as `name`, if given.
+    """
+    try:
+        with open(path) as f:
+            contents = json.load(f)
+    except FileNotFoundError:
+        return False  # Removed by a concurrent call to write_stats()
+    except (OSError, ValueError) as e:
+        log.warning(f"Could not read cache statistics from {name or path}: {e}")
+        return False
+
+    for func_name, counts in contents.items():
+        data.setdefault(func_name, Counter()).update(counts)
+    return True
+
+
+def read_stats(path: "os.PathLike") -> dict[str, Counter]:
+    """Read accumulated :data:`STATS` from the files in `path`.
+
+    This is the sum of the contents of :data:`STATS_FILE` and of any files written by
+    other processes; see :func:`write_stats`.
+    """
+    data: dict[str, Counter] = dict()
+    for p in _stats_files(path):
+        _read_stats_file(p, data)
+    return data
+
+
+def write_stats(path: "os.PathLike") -> None:
+    """Add :data:`STATS` to the totals in `path`, then clear.
+
+    The totals are written to a new file with a unique name. Existing files with totals
+    from earlier or concurrent processes are merged into this file, then removed. Each
+    existing file is first renamed, so that it is merged by at most one process, and
+    files that cannot be read are kept as-is. No file is modified in place, and no
+    lock is needed.
+    """
+    if not any(STATS.values()):
+        return
+
+    data: dict[str, Counter] = dict()
+    for name, counts in STATS.items():
+        data.setdefault(name, Counter()).update(counts)
+        counts.clear()
+
+    token = f"{os.getpid()}-{uuid4().hex[:8]}"
+    stem = Path(STATS_FILE).stem
+
+    # Claim and read existing files; skip those claimed by another process
+    merged: list[tuple[Path, Path]] = []
+    for p in _stats_files(path):
+        claimed = p.with_name(f".{p.name}.{token}")
+        try:
+            p.rename(claimed)
+        except OSError:
+            continue
+        if _read_stats_file(claimed, data, p):
+            merged.append((claimed, p))
+        else:
+            claimed.rename(p)  # Keep for inspection
+
+    try:
+        # Write to a temporary file, then rename, so readers never see a partial file
+        tmp = Path(path, f".{stem}-{token}.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, Path(path, f"{stem}-{token}.json"))
+    except OSError as e:  # pragma: no cover
+        log.warning(f"Could not write cache statistics: {e}")
+        for claimed, p in merged:
+            claimed.rename(p)
+        return
+
+    for claimed, _ in merged:
+        claimed.unlink(missing_ok=True)
+
+
+def _parse_size(value: str) -> int:
+    """Parse a size like "100", "10K", "1.5G" to a number of bytes."""
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?)i?B?\s*", value, flags=re.I)
+    if not match:
+        raise click.BadParameter(f"{value!r} is not a size like 500M or 10G")
+    exponent = " KMGT".index(match.group(2).upper() or " ")
+    return int(float(match.group(1)) * 1024**exponent)
+
+
+@click.group("cache")
+def cli():
+    """Manage the cache of data from functions decorated with @cached."""
+
+
+@cli.command("stats")
+@click.pass_obj
+def stats_cmd(context):
+    """Show cache usage by function."""
+    cache_path = context.core.cache_path
+    data = read_stats(cache_path)
+
+    # Count files and sizes by function name
+    for p, stat in iter_files(cache_path):
+        counts = data.setdefault(_FILE_NAME.match(p.name)["name"], Counter())
+        counts.update({"files": 1, "bytes": stat.st_size})
+
+    print(f"Cache in {cache_path}")
+    columns = (
+        "files",
+        "bytes",
+        "hit",
+        "miss",
+        "memory hit",
+        "bytes read",
+        "bytes written",
+        "seconds saved",
+    )
+    print(f"{'function':<40}" + "".join(f"{c:>15}" for c in columns))
+    # Not sum(…, Counter()), which discards zero and negative counts
+    total: Counter = Counter()
+    for counts in data.values():
+        for key, value in counts.items():
+            total[key] += value
+    for name, counts in sorted(data.items()) + [("TOTAL", total)]:
+        values = [counts[c] for c in columns]
+        print(
+            f"{name:<40}"
+            + "".join(
+                f"{v:>15.3f}" if isinstance(v, float) else f"{v:>15}" for v in values
+            )
+        )
+
+
+@cli.command("prune")
+@click.option("--max-size", help="Maximum total size, e.g. 10G.")
+@click.option("--max-age", type=float, help="Maximum age since last use, in days.")
+@click.option("--dry-run", is_flag=True, help="Only show what would be done.")
+@click.pass_obj
+def prune_cmd(context, max_size, max_age, dry_run):
+    """Delete least recently used or old cache files."""
+    result = prune(
+        context.core.cache_path,
+        max_size=None if max_size is None else _parse_size(max_size),
+        max_age=None if max_age is None else max_age * 86400,
+        dry_run=dry_run,
+    )
+    print(f"{'Would delete' if dry_run else 'Deleted'} {len(result)} files")
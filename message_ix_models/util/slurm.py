@@ -31,6 +31,12 @@ In particular:
 - Without the option :program:`--go`, the batch script is only printed out.
   Add this option to actually call sbatch.
 
+To run the steps of a :class:`.Workflow` as SLURM jobs, use :meth:`.Workflow.submit`
+or the :program:`--sbatch` option of commands created by :func:`.make_click_command`.
+:func:`partition` divides the steps into chains; each chain runs in one task of a job
+array (see :data:`WORKFLOW_TEMPLATE`), and starts once the task running its base step
+has completed successfully.
+
 See also:
 
 - `sbatch <https://slurm.schedmd.com/sbatch.html>`_ manual page.
@@ -38,16 +44,28 @@ See also:
 - :doc:`/distrib/`.
 """
 
+import json
+import logging
 import os
-from collections.abc import Sequence
+import pickle
+import sys
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 from subprocess import PIPE, STDOUT, run
-from typing import TYPE_CHECKING
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Optional, Union
+from urllib.parse import quote, unquote
 
 import click
 
 if TYPE_CHECKING:
     import subprocess
 
+    from message_ix_models.workflow import StepRecord, Workflow
+
+log = logging.getLogger(__name__)
+
 #: Template for an sbatch script. Currently, the same as suggested by
 #: :doc:`/distrib/unicc`.
 #:
@@ -101,6 +119,262 @@ def invoke_sbatch(
     return run(cmd, input=stdin, stdout=PIPE, stderr=STDOUT)
 
 
+#: Template for the batch script of one job array submitted by :func:`submit_workflow`.
+#: Each task of the array runs one :class:`Segment` of workflow steps.
+WORKFLOW_TEMPLATE = """#!/bin/bash
+{options}
+
+{preamble}
+
+{python} -m message_ix_models.util.slurm {job_dir} {array} "$SLURM_ARRAY_TASK_ID"
+"""
+
+#: Function that submits a batch script. It receives a list of command-line options
+#: for :program:`sbatch` and the script, and returns the ID of the job.
+SubmitFunction = Callable[[list[str], str], str]
+
+
+@dataclass
+class Segment:
+    """Chain of workflow steps that run one after another in a single job."""
+
+    #: Names of the steps, in order.
+    steps: list[str]
+
+    #: Name of the step that produces the base scenario for the first step, or
+    #: :any:`None`.
+    base: Optional[str] = None
+
+    #: Options for :program:`sbatch`.
+    options: dict = field(default_factory=dict)
+
+
+def partition(wf: "Workflow", name_or_names: Union[str, list[str]]) -> list[Segment]:
+    """Partition the steps needed for `name_or_names` into :class:`Segments <Segment>`.
+
+    The :attr:`.WorkflowStep.sbatch` options of each step are combined with those of its
+    base step, and so on. A step is in the same segment as its base step if it is the
+    only step based on that step, and its options are the same. Each segment comes
+    after the one containing its base step; otherwise, segments are in the order their
+    steps were added to `wf`.
+    """
+    steps, children = wf._steps_for(name_or_names)
+    order = {name: i for i, name in enumerate(wf.graph)}
+    children = {k: sorted(v, key=order.__getitem__) for k, v in children.items()}
+
+    options: dict[Optional[str], dict] = {None: {}}
+    result = []
+    to_visit: list[tuple[str, Optional[str]]] = [(n, None) for n in children[None]]
+    while to_visit:
+        name, base = to_visit.pop(0)
+        segment = Segment([], base, {**options[base], **steps[name].sbatch})
+        result.append(segment)
+        while True:
+            segment.steps.append(name)
+            options[name] = segment.options
+            based = children.get(name, [])
+            if len(based) == 1 and segment.options == {
+                **segment.options,
+                **steps[based[0]].sbatch,
+            }:
+                name = based[0]  # Continue the chain
+            else:
+                to_visit.extend((n, name) for n in based)
+                break
+
+    return result
+
+
+def _option_lines(options: Mapping) -> str:
+    """Format `options` as ``#SBATCH`` lines; underscores in keys become hyphens."""
+    return "\n".join(
+        f"#SBATCH --{k.replace('_', '-')}={v}" for k, v in sorted(options.items())
+    )
+
+
+def submit_sbatch(args: list[str], script: str) -> str:  # pragma: no cover
+    """Submit `script` using :program:`sbatch` with `args`; return the job ID."""
+    result = run(
+        ["sbatch", "--parsable"] + args, input=script.encode(), stdout=PIPE, check=True
+    )
+    # Output is "job_id" or "job_id;cluster_name"
+    return result.stdout.decode().strip().split(";")[0]
+
+
+class FakeSbatch:
+    """Stand-in for :program:`sbatch` that runs jobs immediately on the local system.
+
+    Each task of a job array runs to completion, in order, in a :program:`bash`
+    subprocess before the call returns. Tasks that depend on a task that failed are not
+    run. Use an instance as the `submit` argument to :func:`submit_workflow` to run or
+    test workflows without a SLURM cluster.
+    """
+
+    def __init__(self) -> None:
+        #: Options and script of each submitted job.
+        self.jobs: list[tuple[list[str], str]] = []
+
+        #: Return code of each array task, keyed by ``"{job ID}_{task ID}"``; or
+        #: :any:`None` for tasks that were not run.
+        self.status: dict[str, Optional[int]] = {}
+
+    def __call__(self, args: list[str], script: str) -> str:
+        self.jobs.append((list(args), script))
+        job_id = str(len(self.jobs))
+
+        opts = dict(a.lstrip("-").partition("=")[::2] for a in args)
+        first, _, last = opts.get("array", "0").partition("-")
+        dependencies = opts.get("dependency", "afterok").split(":")[1:]
+
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp, "script.sh")
+            path.write_text(script)
+            for task_id in range(int(first), int(last or first) + 1):
+                key = f"{job_id}_{task_id}"
+                if any(self.status.get(d) != 0 for d in dependencies):
+                    log.info(f"Job {key}: dependency not satisfied; not run")
+                    self.status[key] = None
+                    continue
+                env = os.environ | dict(
+                    SLURM_JOB_ID=job_id,
+                    SLURM_ARRAY_JOB_ID=job_id,
+                    SLURM_ARRAY_TASK_ID=str(task_id),
+                )
+                self.status[key] = run(["bash", str(path)], env=env).returncode
+
+        return job_id
+
+
+def _records_dir(job_dir: Path) -> Path:
+    return job_dir.joinpath("records")
+
+
+def submit_workflow(
+    wf: "Workflow",
+    name_or_names: Union[str, list[str]],
+    job_dir: Path,
+    *,
+    submit: SubmitFunction = submit_sbatch,
+    preamble: str = "",
+    python: str = sys.executable,
+) -> dict[str, str]:
+    """Submit the steps needed for `name_or_names` as SLURM job arrays.
+
+    The steps are divided using :func:`partition`. Segments with the same base segment
+    and the same options are submitted together as one job array, which depends on
+    (``--dependency=afterok:…``) the array task that runs the base segment.
+
+    The steps and the values of the workflow :class:`.Context` are stored in `job_dir`,
+    which must be accessible from the nodes that run the jobs. The same requirements
+    apply as for :meth:`.Workflow.run` with `max_workers`. Each task records the result
+    of each step in `job_dir`; use :func:`load_records` to read these.
+
+    Parameters
+    ----------
+    submit :
+        Function that submits each job array, for instance :class:`FakeSbatch`.
+    preamble :
+        Shell commands to run before the steps, for instance to load modules or activate
+        a virtual environment.
+    python :
+        Python executable on the nodes that run the jobs.
+
+    Returns
+    -------
+    dict
+        Mapping from step names to the IDs of the array tasks that run them, like
+        ``"1234_0"``.
+    """
+    from message_ix_models.workflow import _context_values
+
+    steps, _ = wf._steps_for(name_or_names)
+    segments = partition(wf, name_or_names)
+
+    # Group segments with the same base segment and options into arrays
+    arrays: dict[tuple, list[Segment]] = {}
+    segment_of = {name: seg for seg in segments for name in seg.steps}
+    for seg in segments:
+        base = None if seg.base is None else id(segment_of[seg.base])
+        arrays.setdefault((base, tuple(sorted(seg.options.items()))), []).append(seg)
+
+    # Store data for the tasks; release the database so that the tasks can open it
+    job_dir.mkdir(parents=True, exist_ok=True)
+    _records_dir(job_dir).mkdir(exist_ok=True)
+    context = wf.graph["context"]
+    context.close_db()
+    with open(job_dir.joinpath("workflow.pkl"), "wb") as f:
+        pickle.dump(
+            dict(
+                context=_context_values(context),
+                steps=steps,
+                arrays=list(arrays.values()),
+            ),
+            f,
+        )
+
+    task_ids: dict[str, str] = {}
+    for i, array in enumerate(arrays.values()):
+        options = {"output": job_dir.joinpath("%A_%a.out")} | array[0].options
+        script = WORKFLOW_TEMPLATE.format(
+            options=_option_lines(options),
+            preamble=preamble,
+            python=python,
+            job_dir=job_dir,
+            array=i,
+        )
+        args = [f"--array=0-{len(array) - 1}"]
+        if array[0].base is not None:
+            args.extend(
+                [
+                    f"--dependency=afterok:{task_ids[array[0].base]}",
+                    "--kill-on-invalid-dep=yes",
+                ]
+            )
+
+        job_id = submit(args, script)
+
+        for task_id, seg in enumerate(array):
+            log.info(f"Submitted job {job_id}_{task_id}: {' → '.join(seg.steps)}")
+            task_ids.update({name: f"{job_id}_{task_id}" for name in seg.steps})
+
+    return task_ids
+
+
+def load_records(job_dir: Path) -> dict[str, "StepRecord"]:
+    """Return records of the steps completed by jobs of :func:`submit_workflow`."""
+    from message_ix_models.workflow import StepRecord
+
+    return {
+        unquote(p.stem): StepRecord(**json.loads(p.read_text()))
+        for p in sorted(_records_dir(job_dir).glob("*.json"))
+    }
+
+
+def run_task(job_dir: Path, array: int, task_id: int) -> None:
+    """Run the segment of workflow steps for one task of a job array.
+
+    This is invoked by the script from :data:`WORKFLOW_TEMPLATE`.
+    """
+    from message_ix_models.workflow import _run_step
+
+    with open(job_dir.joinpath("workflow.pkl"), "rb") as f:
+        data = pickle.load(f)
+    segment: Segment = data["arrays"][array][task_id]
+
+    base_url = None
+    if segment.base is not None:
+        base_url = load_records(job_dir)[segment.base].url
+
+    for name in segment.steps:
+        log.info(f"Run step {name!r}")
+        record = _run_step(data["steps"][name], data["context"], base_url)
+        log.info(f"Step {name!r} -> {record.url}: {record}")
+        _records_dir(job_dir).joinpath(f"{quote(name, safe='')}.json").write_text(
+            json.dumps(asdict(record))
+        )
+        base_url = record.url
+
+
 @click.command("sbatch")
 @click.option("--username", "-u", envvar="USER", help="User name.")
 @click.option("--venv", "-e", envvar="VIRTUAL_ENV", help="Path to virtual environment.")
@@ -112,3 +386,10 @@ def cli(context, username, venv, go, args):
     result = invoke_sbatch(username, venv, args, dry_run=not go)
 
     assert result.returncode == 0, result
+
+
+if __name__ == "__main__":
+    from ._logging import setup
+
+    setup(level="INFO")
+    run_task(Path(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]))
@@ -1,10 +1,17 @@
 """Tools for modeling workflows."""
 
 import logging
+import pickle
 import re
+import sys
 from collections.abc import Callable, Mapping
-from typing import TYPE_CHECKING, Literal, Optional, Union
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 
+import ixmp
 from genno import Computer
 from message_ix import Scenario
 
@@ -37,6 +44,8 @@ class WorkflowStep:
     target : str, optional
         URL for the scenario produced by the workflow step. Parsed to
         :attr:`scenario_info` and :attr:`platform_info`.
+    sbatch : dict, optional
+        Options for :program:`sbatch`; see :attr:`sbatch`.
     kwargs
         Keyword arguments for `action`.
     """
@@ -58,8 +67,18 @@ class WorkflowStep:
     #: Target model name, scenario name, and optional version.
     scenario_info: dict
 
+    #: Options for :program:`sbatch` when the step is run by :meth:`Workflow.submit`,
+    #: for instance :py:`dict(time="4:00:00", mem="64G", cpus_per_task=4)`. These
+    #: extend or override the options of the base step.
+    sbatch: dict
+
     def __init__(
-        self, action: Optional[CallbackType], target=None, clone=False, **kwargs
+        self,
+        action: Optional[CallbackType],
+        target=None,
+        clone=False,
+        sbatch: Optional[dict] = None,
+        **kwargs,
     ):
         try:
             # Store platform and scenario info by parsing the `target` URL
@@ -73,6 +92,7 @@ class WorkflowStep:
         # Store the callback and options
         self.action = action
         self.clone = clone
+        self.sbatch = sbatch or dict()
         self.kwargs = kwargs
 
     def __call__(
@@ -141,6 +161,29 @@ class WorkflowStep:
         return f"<Step {action}{dest}>"
 
 
+@dataclass
+class StepRecord:
+    """Resources used by one :class:`WorkflowStep` run in parallel."""
+
+    #: URL of the scenario produced by the step.
+    url: str
+
+    #: Wall time, in seconds, including loading the base scenario.
+    time: float
+
+    #: Peak memory (resident set size) of the worker process, in bytes, or :any:`None`
+    #: if this is not available on the current platform.
+    max_rss: Optional[int] = None
+
+    def __str__(self) -> str:
+        mem = (
+            ""
+            if self.max_rss is None
+            else f", peak memory {self.max_rss / 2**20:.0f} MiB"
+        )
+        return f"{self.time:.1f} s{mem}"
+
+
 class Workflow(Computer):
     """Workflow for operations on multiple :class:`Scenarios <message_ix.Scenario>`.
 
@@ -150,9 +193,14 @@ class Workflow(Computer):
         Context object with settings common to the entire workflow.
     """
 
+    #: Records for the steps executed by the latest parallel :meth:`run`.
+    records: dict[str, StepRecord]
+
     def __init__(self, context: Context):
         super().__init__()
         self.add_single("context", context)
+        self.records = dict()
+        self._platforms: dict[str, ixmp.Platform] = dict()
 
     def add_step(
         self,
@@ -199,15 +247,139 @@ class Workflow(Computer):
         # Add to the Computer; return the name of the added step
         return str(self.add_single(name, step, "context", base, strict=True))
 
-    def run(self, name_or_names: Union[str, list[str]]):
+    def run(
+        self, name_or_names: Union[str, list[str]], *, max_workers: Optional[int] = None
+    ):
         """Run all workflow steps necessary to produce `name_or_names`.
 
         Parameters
         ----------
         name_or_names: str or list of str
             Identifier(s) of steps to run.
+        max_workers : int, optional
+            If given and greater than 1, run steps in a pool of up to this many worker
+            processes. Each step is started as soon as its base step is complete, so
+            independent branches of the workflow run concurrently.
+
+            Each worker uses its own copy of the workflow :class:`.Context` and its own
+            :class:`~ixmp.Platform`. Only the URLs of scenarios are passed between
+            processes, so every step must store its scenario on a platform that is
+            configured by name (see :obj:`ixmp.config`) and that other processes can
+            access; step actions must be importable by name; and changes to the
+            Context made by one step are not seen by others. Resources used by each
+            step are stored in :attr:`records`.
+        """
+        if max_workers is None or max_workers <= 1:
+            return self.get(name_or_names)
+        return self._run_parallel(name_or_names, max_workers)
+
+    def _run_parallel(self, name_or_names: Union[str, list[str]], max_workers: int):
+        """Run steps for `name_or_names` in a process pool; see :meth:`run`."""
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        steps, children = self._steps_for(name_or_names)
+
+        # Release any database connection so that worker processes can open it
+        context = self.graph["context"]
+        context.close_db()
+        values = _context_values(context)
+
+        kw: dict[str, Any] = dict(mp_context=multiprocessing.get_context("spawn"))
+        if sys.version_info >= (3, 11):
+            # A new process for each step, so max_rss is the peak of that step alone
+            kw.update(max_tasks_per_child=1)
+
+        self.records.clear()
+        with ProcessPoolExecutor(min(max_workers, len(steps)), **kw) as pool:
+            pending = {}
+
+            def submit(name: str, base_url: Optional[str]) -> None:
+                log.info(f"Submit step {name!r}")
+                future = pool.submit(_run_step, steps[name], values, base_url)
+                pending[future] = name
+
+            for name in children.get(None, []):
+                submit(name, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception:
+                        log.error(f"Step {name!r} failed; cancel remaining steps")
+                        pool.shutdown(cancel_futures=True)
+                        raise
+                    log.info(f"Step {name!r} -> {record.url}: {record}")
+                    self.records[name] = record
+                    for child in children.get(name, []):
+                        submit(child, record.url)
+
+        # Load the target scenario(s) in this process
+        return self._load(name_or_names)
+
+    def submit(
+        self, name_or_names: Union[str, list[str]], job_dir: Path, **kwargs
+    ) -> dict[str, str]:
+        """Submit the workflow steps necessary to produce `name_or_names` to SLURM.
+
+        Independent chains of steps are submitted as tasks of job arrays, with
+        dependencies on the tasks that produce their base scenarios. Resources for each
+        step are given by :attr:`WorkflowStep.sbatch`. See
+        :func:`.util.slurm.submit_workflow`, which receives `kwargs`.
+
+        Returns
+        -------
+        dict
+            Mapping from step names to the IDs of the array tasks that run them.
         """
-        return self.get(name_or_names)
+        from message_ix_models.util.slurm import submit_workflow
+
+        return submit_workflow(self, name_or_names, job_dir, **kwargs)
+
+    def _steps_for(
+        self, name_or_names: Union[str, list[str]]
+    ) -> tuple[dict[str, WorkflowStep], dict[Optional[str], list[str]]]:
+        """Return the steps required for `name_or_names`, and the steps based on each.
+
+        In the second return value, the key :any:`None` gives steps with no base.
+        """
+        steps: dict[str, WorkflowStep] = {}
+        children: dict[Optional[str], list[str]] = {}
+        to_visit = [name_or_names] if isinstance(name_or_names, str) else name_or_names
+        to_visit = list(to_visit)
+        while to_visit:
+            name = to_visit.pop()
+            task = self.graph[name]
+            if isinstance(task, list):
+                to_visit.extend(task)  # Collection of other steps, e.g. "cli-targets"
+            elif name not in steps:
+                steps[name], _, base = task
+                children.setdefault(base, []).append(name)
+                if base is not None:
+                    to_visit.append(base)
+        return steps, children
+
+    def _load(self, name_or_names: Union[str, list[str]]):
+        """Load the scenario(s) recorded in :attr:`records` for `name_or_names`."""
+        if isinstance(name_or_names, list):
+            return [self._load(n) for n in name_or_names]
+        elif isinstance(self.graph[name_or_names], list):
+            return self._load(self.graph[name_or_names])
+
+        platform_info, scenario_info = parse_url(self.records[name_or_names].url)
+        context = self.graph["context"]
+        name = platform_info["name"]
+        if name == context.platform_info.get("name"):
+            mp = context.get_platform()
+        elif name in self._platforms:
+            mp = self._platforms[name]
+        else:
+            # Keep a reference; Scenario only holds a weak reference to its Platform
+            mp = self._platforms[name] = ixmp.Platform(**platform_info)
+        return Scenario(mp, **scenario_info)
 
     def truncate(self, name: str):
         """Truncate the workflow at the step `name`.
@@ -261,6 +433,55 @@ class Workflow(Computer):
         return (i.copy(), step_name) if len(i) else self.guess_target(task[2], kind)
 
 
+def _context_values(context: Context) -> dict[str, Any]:
+    """Return values of `context` that can be passed to worker processes."""
+    values = {}
+    for k, v in context._values.items():
+        try:
+            values[k] = pickle.loads(pickle.dumps(deepcopy(v)))
+        except Exception:
+            log.debug(f"Context key {k!r} not passed to worker processes")
+    return values
+
+
+def _max_rss() -> Optional[int]:
+    """Return the peak resident set size of the current process, in bytes."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover  Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS; KiB elsewhere
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _run_step(
+    step: WorkflowStep, context_values: dict[str, Any], base_url: Optional[str]
+) -> StepRecord:
+    """Run `step` in a worker process for :meth:`.Workflow.run`."""
+    start = perf_counter()
+    # NB Context(values) would replace the "core", "model", etc. values with defaults
+    context = Context(**deepcopy(context_values))
+
+    scenario = mp = None
+    if base_url is not None:
+        platform_info, scenario_info = parse_url(base_url)
+        # Keep a reference to `mp`; Scenario only holds a weak reference
+        mp = ixmp.Platform(**platform_info)
+        scenario = Scenario(mp, **scenario_info)
+
+    result = step(context, scenario)
+    url = f"ixmp://{result.platform.name}/{result.url}"
+
+    # Release database connections for other processes
+    result.platform.close_db()
+    if mp is not None:
+        mp.close_db()
+    context.close_db()
+
+    return StepRecord(url=url, time=perf_counter() - start, max_rss=_max_rss())
+
+
 def make_click_command(wf_callback: str, name: str, slug: str, **kwargs) -> "Command":
     """Generate a click CLI command to run a :class:`.Workflow`.
 
@@ -276,6 +497,11 @@ def make_click_command(wf_callback: str, name: str, slug: str, **kwargs) -> "Com
         displayed.
       - :program:`--from`: Truncate the workflow at any step(s) whose names are a full
         match for this regular expression.
+      - :program:`--workers`: Run independent steps in parallel; see
+        :meth:`.Workflow.run`.
+      - :program:`--sbatch`: Submit the steps as SLURM jobs; see
+        :meth:`.Workflow.submit`. Shell commands to run on each node before the steps
+        can be given in a file with :program:`--sbatch-preamble`.
 
     - uses the :attr:`~.Computer.default_key` (if any) of the :class:`.Workflow`
       returned by `wf_callback`, if the user does not provide :program:`TARGET` on the
@@ -305,12 +531,33 @@ def make_click_command(wf_callback: str, name: str, slug: str, **kwargs) -> "Com
 
     @click.command(name="run", help=help_arg, **kwargs)
     @click.option("--go", is_flag=True, help="Actually run the workflow.")
+    @click.option(
+        "--workers",
+        type=int,
+        help="Run independent steps in parallel, in up to N processes.",
+        metavar="N",
+    )
+    @click.option("--sbatch", is_flag=True, help="Submit steps as SLURM jobs.")
+    @click.option(
+        "--sbatch-preamble",
+        type=click.File(),
+        help="Commands to run before the steps in SLURM jobs.",
+    )
     @click.option(
         "--from", "truncate_step", help="Truncate workflow at matching step(s)."
     )
     @click.argument("target_step", metavar="TARGET", required=False)
     @click.pass_obj
-    def _func(context, go, truncate_step, target_step, **kwargs):
+    def _func(
+        context,
+        go,
+        workers,
+        sbatch,
+        sbatch_preamble,
+        truncate_step,
+        target_step,
+        **kwargs,
+    ):
         from importlib import import_module
 
         from message_ix_models.util import show_versions
@@ -369,7 +616,18 @@ def make_click_command(wf_callback: str, name: str, slug: str, **kwargs) -> "Com
             log.info(f"Workflow diagram written to {path}")
             return
 
-        wf.run(target_step)
+        if sbatch:
+            from datetime import datetime
+
+            job_dir = context.get_local_path(
+                "slurm", f"{slug}-{datetime.now():%Y%m%dT%H%M%S}"
+            )
+            preamble = sbatch_preamble.read() if sbatch_preamble else ""
+            wf.submit(target_step, job_dir, preamble=preamble)
+            log.info(f"Job output and step records in {job_dir}")
+            return
+
+        wf.run(target_step, max_workers=workers)
 
     return _func
 